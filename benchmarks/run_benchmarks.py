@@ -0,0 +1,168 @@
+import argparse
+import datetime
+import gc
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from synthetic import VALUATION_DATE, synthetic_quotes, synthetic_curve, synthetic_dates, synthetic_cashflows, synthetic_portfolio, synthetic_bonds, synthetic_fras, synthetic_swaps
+from derivative_valuations.curve_bootstrapping.bootstrapping import bootstrap_discount_curve, bootstrap_many
+from derivative_valuations.valuation.present_value import pv, DV01, convexity, pv_many
+from derivative_valuations.valuation.bond import price_bond
+from derivative_valuations.valuation.FRA import FRA_price
+from derivative_valuations.valuation.repricing import IncrementalRepricer
+from derivative_valuations.valuation.swap import swap_price, price_swaps
+from derivative_valuations.payment_schedule.accrual_period_payment_schedule import generate_schedules, clear_schedule_cache
+from derivative_valuations.payment_schedule.calendars import resolve_calendar
+
+#benchmark suite timing curve lookups, bootstrapping, PV and risk at increasing sizes
+#usage: python benchmarks/run_benchmarks.py [--quick] [--output results.json] [--baseline baseline.json --tolerance 0.25]
+#results are written as JSON, with a compare mode flagging benchmarks slower than a saved baseline
+
+FULL_SIZES = {
+    "cashflows": [10, 1000, 100000, 1000000],
+    "pillars": [5, 20, 50, 100, 200],
+    "instruments": [10, 1000, 10000],
+}
+QUICK_SIZES = {
+    "cashflows": [10, 1000, 10000],
+    "pillars": [5, 20, 50],
+    "instruments": [10, 100],
+}
+DEFAULT_PILLARS = 50
+CURVE_BUILD_COUNT = 24
+
+def measure(function, repeats: int):
+    #helper timing a function, returning the best wall time over the repeats and the peak traced memory of one run
+    best = float("inf")
+    for _ in range(repeats):
+        gc.collect()
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    gc.collect()
+    tracemalloc.start()
+    function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak
+
+def benchmark_cases(sizes: dict):
+    #generator of (name, size, pillars, function) benchmark cases, each function is timed as one unit of work of size items
+    for pillars in sizes["pillars"]:
+        deposit_quotes, swap_quotes = synthetic_quotes(pillars)
+        yield "bootstrap_discount_curve", pillars, pillars, lambda d=deposit_quotes, s=swap_quotes: bootstrap_discount_curve(VALUATION_DATE, list(d), list(s), "ACT/365")
+        curve = synthetic_curve(pillars)
+        dates = synthetic_dates(10000, curve.interpolation_dates[-1])
+        yield "DiscountCurve.df", 10000, pillars, lambda c=curve, d=dates: [c.df(t) for t in d]
+        yield "DiscountCurve.dfs", 10000, pillars, lambda c=curve, d=dates: c.dfs(d)
+        for interpolation in ("monotone_convex", "natural_cubic"):
+            smooth_curve = curve.with_interpolation(interpolation)
+            yield f"df {interpolation}", 10000, pillars, lambda c=smooth_curve, d=dates: [c.df(t) for t in d]
+            yield f"dfs {interpolation}", 10000, pillars, lambda c=smooth_curve, d=dates: c.dfs(d)
+
+    #a morning curve build, one curve per valuation date of the last month, in a single process and on a pool of every core
+    curve_quotes = {}
+    for days in range(CURVE_BUILD_COUNT):
+        valuation_date = VALUATION_DATE - datetime.timedelta(days=days)
+        curve_quotes[valuation_date.isoformat()] = (valuation_date, *synthetic_quotes(DEFAULT_PILLARS, valuation_date), "ACT/365")
+    yield "bootstrap_many 1 process", CURVE_BUILD_COUNT, DEFAULT_PILLARS, lambda q=curve_quotes: bootstrap_many(q, processes=1)
+    yield "bootstrap_many", CURVE_BUILD_COUNT, DEFAULT_PILLARS, lambda q=curve_quotes: bootstrap_many(q)
+
+    curve = synthetic_curve(DEFAULT_PILLARS)
+    curve_end = curve.interpolation_dates[-1]
+    for count in sizes["cashflows"]:
+        cashflows = synthetic_cashflows(count, curve_end)
+        portfolio = synthetic_portfolio(count, curve_end)
+        yield "pv", count, DEFAULT_PILLARS, lambda c=cashflows: pv(c, curve)
+        yield "DV01", count, DEFAULT_PILLARS, lambda c=cashflows: DV01(c, curve, 1)
+        yield "convexity", count, DEFAULT_PILLARS, lambda c=cashflows: convexity(c, curve, 1)
+        yield "pv_many", count, DEFAULT_PILLARS, lambda p=portfolio: pv_many(*p, curve)
+        #one known date moving, alternating between two discount factors
+        repricer = IncrementalRepricer(*portfolio, curve)
+        pillar = len(curve.interpolation_dfs)//2
+        dfs = [curve.interpolation_dfs[pillar]*0.999, curve.interpolation_dfs[pillar]]
+        yield "repricer.update_pillar", count, DEFAULT_PILLARS, lambda r=repricer, k=pillar, d=dfs: [r.update_pillar(k, df) for df in d]
+
+    for count in sizes["instruments"]:
+        bonds = synthetic_bonds(count)
+        fras = synthetic_fras(count)
+        yield "price_bond", count, DEFAULT_PILLARS, lambda b=bonds: [price_bond(bond, curve, VALUATION_DATE) for bond in b]
+        yield "FRA_price", count, DEFAULT_PILLARS, lambda f=fras: [FRA_price(fra, curve, VALUATION_DATE) for fra in f]
+        swaps = synthetic_swaps(count)
+        #schedules built from an empty cache, without and with payment date adjustment
+        schedule_inputs = ([bond.issue_date for bond in bonds], [bond.maturity_date for bond in bonds], [bond.frequency for bond in bonds])
+        yield "generate_schedules", count, DEFAULT_PILLARS, lambda i=schedule_inputs: (clear_schedule_cache(), generate_schedules(*i))
+        yield "generate_schedules London", count, DEFAULT_PILLARS, lambda i=schedule_inputs: (clear_schedule_cache(), generate_schedules(*i, resolve_calendar("London")))
+        yield "swap_price", count, DEFAULT_PILLARS, lambda s=swaps: [swap_price(swap, curve, VALUATION_DATE) for swap in s]
+        yield "price_swaps", count, DEFAULT_PILLARS, lambda s=swaps: price_swaps(s, curve, VALUATION_DATE)
+
+def run(sizes: dict, repeats: int):
+    #function running every benchmark case, returning a list of result dictionaries
+    results = []
+    for name, size, pillars, function in benchmark_cases(sizes):
+        seconds, peak_memory = measure(function, repeats)
+        results.append({
+            "name": name,
+            "size": size,
+            "pillars": pillars,
+            "seconds": seconds,
+            "throughput_per_second": size/seconds if seconds > 0 else float("inf"),
+            "peak_memory_bytes": peak_memory,
+        })
+        print(f"{name:<26}{size:>10}{pillars:>6} pillars{seconds:>12.6f}s{size/seconds if seconds > 0 else float('inf'):>16.0f}/s{peak_memory/1e6:>10.2f}MB")
+    return results
+
+def compare(results: list[dict], baseline: list[dict], tolerance: float):
+    #function comparing results against a baseline, returning the benchmarks whose time exceeds the baseline time by more than the tolerance
+    baseline_by_key = {(r["name"], r["size"], r["pillars"]): r for r in baseline}
+    regressions = []
+    for result in results:
+        key = (result["name"], result["size"], result["pillars"])
+        if key not in baseline_by_key:
+            continue
+        ratio = result["seconds"]/baseline_by_key[key]["seconds"] if baseline_by_key[key]["seconds"] > 0 else float("inf")
+        if ratio > 1 + tolerance:
+            regressions.append({"name": result["name"], "size": result["size"], "pillars": result["pillars"], "baseline_seconds": baseline_by_key[key]["seconds"], "seconds": result["seconds"], "ratio": ratio})
+    return regressions
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description="Benchmark suite for derivative_valuations.")
+    parser.add_argument("--quick", action="store_true", help="run smaller sizes only")
+    parser.add_argument("--repeats", type=int, default=3, help="number of timed repeats per benchmark, the best is kept")
+    parser.add_argument("--output", default="benchmark_results.json", help="path of the JSON results file")
+    parser.add_argument("--baseline", help="path of a saved results file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown against the baseline before flagging a regression, as a fraction")
+    args = parser.parse_args(argv)
+
+    results = run(QUICK_SIZES if args.quick else FULL_SIZES, args.repeats)
+    output = {
+        "metadata": {
+            "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "quick": args.quick,
+        },
+        "results": results,
+    }
+    Path(args.output).write_text(json.dumps(output, indent=2))
+    print(f"Results written to {args.output}")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())["results"]
+        regressions = compare(results, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression['name']} size {regression['size']} ({regression['pillars']} pillars): {regression['baseline_seconds']:.6f}s -> {regression['seconds']:.6f}s ({regression['ratio']:.2f}x)")
+        if regressions:
+            return 1
+        print(f"No regressions against {args.baseline} (tolerance {args.tolerance:.0%})")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
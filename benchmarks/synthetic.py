@@ -0,0 +1,88 @@
+import math
+import random
+from datetime import date, timedelta
+import numpy as np
+from derivative_valuations.curve_bootstrapping.financial_instruments import DepositQuote, FixedForFloatingSwapQuote
+from derivative_valuations.curve_bootstrapping.bootstrapping import bootstrap_discount_curve
+from derivative_valuations.payment_schedule.accrual_period_payment_schedule import add_months
+from derivative_valuations.valuation.bond import Bond
+from derivative_valuations.valuation.FRA import FRA
+from derivative_valuations.valuation.swap import Swap
+
+#synthetic market and portfolio generator for the benchmark suite
+#everything is generated from a seed so runs are comparable between releases
+
+VALUATION_DATE = date(2026,1,15)
+CONVENTION = "ACT/365"
+
+def par_rate(years: float):
+    #smooth upward sloping par rate curve, flattening out at the long end
+    return 0.03 + 0.012*(1 - math.exp(-years/8))
+
+def synthetic_quotes(pillars: int, valuation_date: date = VALUATION_DATE):
+    #function generating deposit quotes and quarterly fixed-for-floating swap quotes giving a curve with the given number of known dates
+    #three deposits (1m, 3m, 6m) are followed by swaps every 3 months from 9 months
+    if pillars < 4:
+        raise ValueError("At least 4 pillars are required!")
+    deposit_quotes = [DepositQuote(valuation_date, add_months(valuation_date, months), par_rate(months/12), "ACT/360") for months in (1, 3, 6)]
+    swap_quotes = []
+    for i in range(pillars - len(deposit_quotes)):
+        months = 9 + 3*i
+        swap_quotes.append(FixedForFloatingSwapQuote(valuation_date, add_months(valuation_date, months), par_rate(months/12), 3, "30E/360", 3, "ACT/360"))
+    return deposit_quotes, swap_quotes
+
+def synthetic_curve(pillars: int, valuation_date: date = VALUATION_DATE):
+    #function bootstrapping a synthetic curve with the given number of known dates, plus the valuation date itself (df 1) so any future date can be discounted
+    deposit_quotes, swap_quotes = synthetic_quotes(pillars, valuation_date)
+    curve = bootstrap_discount_curve(valuation_date, deposit_quotes, swap_quotes, CONVENTION)
+    curve.add_known_dates([valuation_date], [1.0])
+    return curve
+
+def synthetic_dates(count: int, curve_end: date, seed: int = 0, valuation_date: date = VALUATION_DATE):
+    #function generating random dates between the first month after the valuation date and the end of the curve
+    rng = random.Random(seed)
+    first = valuation_date + timedelta(days=31)
+    span = (curve_end - first).days
+    return [first + timedelta(days=rng.randrange(span)) for _ in range(count)]
+
+def synthetic_cashflows(count: int, curve_end: date, seed: int = 0):
+    #function generating a list of (date, amount) cashflows
+    rng = random.Random(seed)
+    return [(payment_date, rng.uniform(-1000, 1000)) for payment_date in synthetic_dates(count, curve_end, seed)]
+
+def synthetic_portfolio(count: int, curve_end: date, cashflows_per_trade: int = 20, seed: int = 0):
+    #function generating a columnar portfolio (payment date ordinals, amounts and trade ids) with count cashflows in total
+    cashflows = synthetic_cashflows(count, curve_end, seed)
+    payment_dates = np.array([payment_date.toordinal() for payment_date, _ in cashflows], dtype=np.int64)
+    amounts = np.array([amount for _, amount in cashflows], dtype=float)
+    trade_ids = np.arange(count, dtype=np.int64)//cashflows_per_trade
+    return payment_dates, amounts, trade_ids
+
+def synthetic_bonds(count: int, seed: int = 0, valuation_date: date = VALUATION_DATE):
+    #function generating semi-annual bonds issued in the last 5 years with maturities of up to 30 years
+    rng = random.Random(seed)
+    bonds = []
+    for _ in range(count):
+        issue_date = valuation_date - timedelta(days=rng.randrange(5*365))
+        maturity_date = add_months(issue_date, 6*rng.randint(12, 60))
+        bonds.append(Bond(issue_date, maturity_date, rng.uniform(0.01, 0.06), 6, 100, "30E/360"))
+    return bonds
+
+def synthetic_fras(count: int, seed: int = 0, valuation_date: date = VALUATION_DATE):
+    #function generating FRAs starting in 1 to 24 months with 3 or 6 month tenors
+    rng = random.Random(seed)
+    fras = []
+    for _ in range(count):
+        start_date = add_months(valuation_date, rng.randint(1, 24))
+        fras.append(FRA(start_date, add_months(start_date, rng.choice((3, 6))), rng.uniform(0.02, 0.05), 1000000, "ACT/360", rng.random() < 0.5))
+    return fras
+
+def synthetic_swaps(count: int, seed: int = 0, valuation_date: date = VALUATION_DATE):
+    #function generating spot and forward starting swaps (starting in up to 2 years) with tenors of 1 to 30 years, annual fixed against quarterly floating
+    rng = random.Random(seed)
+    swaps = []
+    for _ in range(count):
+        effective_date = valuation_date + timedelta(days=rng.choice((0, rng.randrange(730))))
+        maturity_date = add_months(effective_date, 12*rng.randint(1, 30))
+        swaps.append(Swap(effective_date, maturity_date, rng.uniform(0.02, 0.05), 12, "30E/360", 3, "ACT/360", 1000000, rng.random() < 0.5))
+    return swaps
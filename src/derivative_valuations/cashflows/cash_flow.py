@@ -1,5 +1,7 @@
 from datetime import date
+from collections.abc import Mapping
 from derivative_valuations.daycount_conventions.daycount import year_fraction_computation
+from derivative_valuations.df_curve.discount_factor import DiscountCurve, ShiftedCurve
 
 def build_fixed_leg_cashflows(schedule: list[tuple[date, date, date]], notional: float, fixed_rate: float, convention: str):
     #function for building cash flows of a fixed rate coupon as a list
@@ -37,13 +39,28 @@ def build_bond_cashflows(schedule: list[tuple[date, date, date]], notional: floa
         cashflows.append((schedule[-1][-1], notional))
     return cashflows
 
-"""
-def build_float_leg_cashflows(schedule: list[tuple[date, date, date]], notional: float, convention: str):
+def build_float_leg_cashflows(schedule: list[tuple[date, date, date]], notional: float, convention: str, curve: DiscountCurve | ShiftedCurve, spread: float = 0.0, fixings: Mapping[date, float] | None = None):
     #function for building cash flows of a floating rate coupon as a list
+    #each floating rate is projected from the curve as the simple forward rate over its accrual period, (DF(accrual start)/DF(accrual end) - 1)/year fraction (single curve)
+    #coupons accruing from before the valuation date have already fixed, their rates are taken from fixings (accrual start date -> rate)
     cashflows= []
+
+    #validation checks
+    if not schedule:
+        raise ValueError("Payment schedule is empty!")
+    if notional < 0:
+        raise ValueError("Notional payment must not be less than 0.")
+
     for payment in schedule:
+        year_fraction = year_fraction_computation(payment[0], payment[1], convention)
+        if payment[0] < curve.valuation_date:
+            if fixings is None or payment[0] not in fixings:
+                raise ValueError("A fixing is required for every floating coupon accruing from before the valuation date!")
+            accrued_rate = fixings[payment[0]]*year_fraction
+        else:
+            #the projected floating rate times the year fraction, which stays defined for periods with a year fraction of 0
+            accrued_rate = curve.df(payment[0])/curve.df(payment[1]) - 1
+
         #add a 2-tuple to the cashflows list, which has both the payment date and the payment amount
-        #calls a function to determine the floating rate
-        cashflows.append((payment[2], notional*float_rate_computation(payment[0], payment[1])*year_fraction_computation(payment[0], payment[1], convention)))
+        cashflows.append((payment[2], notional*(accrued_rate + spread*year_fraction)))
     return cashflows
-"""
\ No newline at end of file
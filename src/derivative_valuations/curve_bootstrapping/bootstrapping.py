@@ -1,42 +1,189 @@
+import os
 import math
+import bisect
 from datetime import date
+from typing import NamedTuple
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
 from operator import methodcaller, attrgetter
 
-from derivative_valuations.curve_bootstrapping.financial_instruments import DepositQuote, FixedForFloatingSwapQuote
+from derivative_valuations.curve_bootstrapping.financial_instruments import DepositQuote, FixedForFloatingSwapQuote, SwapAnnuityCarry
 from derivative_valuations.df_curve.discount_factor import DiscountCurve
 
-def bootstrap_discount_curve(valuation_date: date, deposit_quotes: list[DepositQuote], swap_quotes: list[FixedForFloatingSwapQuote], convention: str,):
-    #function for bootstrapping a curve given a list of deposit quotes and a list of swap quotes
-    #declare empty lists
-    interpolation_dates = []
-    interpolation_dfs = []
-    
-    #first we sort deposit quotes
-    deposit_quotes.sort(key=methodcaller("year_fraction"))
+def _sorted_deposit_quotes(deposit_quotes: list[DepositQuote]):
+    #helper returning the deposit quotes in bootstrapping order (by year fraction), leaving the caller's list unchanged
+    deposit_quotes = sorted(deposit_quotes, key=methodcaller("year_fraction"))
     #validate the sorting worked correctly
     key = methodcaller("year_fraction")
     for i in range(len(deposit_quotes)-1):
         assert key(deposit_quotes[i+1])>=key(deposit_quotes[i]), "The list of deposit quotes could not be sorted."
-    
-    for quote in deposit_quotes:
-    #for a deposit we add the end date and the implied discount factor add that date to their corresponding lists
-        interpolation_dates.append(quote.end_date)
-        interpolation_dfs.append(quote.df_implied())
-    
-    #we create our curve
-    curve = DiscountCurve(valuation_date, interpolation_dates, interpolation_dfs, convention)
+    return deposit_quotes
 
-    #sort swap quotes
-    swap_quotes.sort(key=attrgetter("maturity_date"))
+def _sorted_swap_quotes(swap_quotes: list[FixedForFloatingSwapQuote]):
+    #helper returning the swap quotes in bootstrapping order (by maturity date), leaving the caller's list unchanged
+    swap_quotes = sorted(swap_quotes, key=attrgetter("maturity_date"))
     #validate the sorting worked correctly
     for i in range(len(swap_quotes)-1):
         assert swap_quotes[i+1].maturity_date>=swap_quotes[i].maturity_date, "The list of swap quotes could not be sorted."
+    return swap_quotes
 
-    #we use the curve to get the discount factors at maturity for the swap quotes
-    #add the new dates for use in interpolation at each step
-    for quote in swap_quotes:
+def _deposit_curve(valuation_date: date, deposit_quotes: list[DepositQuote], convention: str):
+    #helper creating the curve from deposit quotes already in bootstrapping order
+    interpolation_dates = []
+    interpolation_dfs = []
+    for quote in deposit_quotes:
+    #for a deposit we add the end date and the implied discount factor add that date to their corresponding lists
+        interpolation_dates.append(quote.end_date)
+        interpolation_dfs.append(quote.df_implied())
+    return DiscountCurve(valuation_date, interpolation_dates, interpolation_dfs, convention)
+
+def _add_swap_pillars(curve: DiscountCurve, swap_quotes: list[FixedForFloatingSwapQuote], pillar_sources: list[int] | None = None, first_source: int = 0):
+    #helper solving the swap quotes (in bootstrapping order) one after another, adding each maturity date and discount factor to the curve
+    #if pillar_sources is given it is kept aligned with the curve's known dates, recording first_source + the position of the swap that added each date
+    #swaps sharing a fixed leg carry their annuity forward so each coupon is only discounted once it is final
+    annuity_carries = {}
+    for j, quote in enumerate(swap_quotes):
         new_interpolation_dates = [quote.maturity_date]
-        new_interpolation_dfs = [quote.solve_last_df(curve)]
+        if quote.maturity_date > curve.interpolation_dates[-1]:
+            key = (quote.effective_date, quote.fixed_frequency_months, quote.fixed_convention)
+            if key not in annuity_carries:
+                annuity_carries[key] = SwapAnnuityCarry(*key)
+            new_interpolation_dfs = [quote.solve_last_df(curve, annuity_carries[key])]
+            position = len(curve.interpolation_dates)
+        else:
+            #the new date lands inside the curve and can move discount factors already carried, so the carries start afresh
+            annuity_carries.clear()
+            new_interpolation_dfs = [quote.solve_last_df(curve)]
+            position = bisect.bisect_right(curve.interpolation_dates, quote.maturity_date)
         curve.add_known_dates(new_interpolation_dates, new_interpolation_dfs)
+        if pillar_sources is not None:
+            pillar_sources.insert(position, first_source + j)
+
+def bootstrap_discount_curve(valuation_date: date, deposit_quotes: list[DepositQuote], swap_quotes: list[FixedForFloatingSwapQuote], convention: str,):
+    #function for bootstrapping a curve given a list of deposit quotes and a list of swap quotes
+    #the quote lists are not modified, the quotes are sorted into bootstrapping order on copies
+    #first we sort deposit quotes and create our curve from them
+    curve = _deposit_curve(valuation_date, _sorted_deposit_quotes(deposit_quotes), convention)
+
+    #we use the curve to get the discount factors at maturity for the sorted swap quotes
+    #add the new dates for use in interpolation at each step
+    _add_swap_pillars(curve, _sorted_swap_quotes(swap_quotes))
+    return curve
+
+class CurveQuotes(NamedTuple):
+#inputs of one curve for bootstrap_many, as for bootstrap_discount_curve
+    valuation_date: date
+    deposit_quotes: list[DepositQuote]
+    swap_quotes: list[FixedForFloatingSwapQuote]
+    convention: str
+
+class BootstrapResults(NamedTuple):
+#result of bootstrap_many, the curves that were built and the exception raised for each curve that failed, both keyed by curve name
+    curves: dict[str, DiscountCurve]
+    errors: dict[str, Exception]
+
+def _bootstrap_pillars(valuation_date: date, deposit_quotes: list[DepositQuote], swap_quotes: list[FixedForFloatingSwapQuote], convention: str):
+    #worker task bootstrapping one curve, returning its pillars rather than the curve so only plain lists are sent back
+    curve = bootstrap_discount_curve(valuation_date, deposit_quotes, swap_quotes, convention)
+    return list(curve.interpolation_dates), list(curve.interpolation_dfs), list(curve.interpolation_year_fractions)
+
+def bootstrap_many(curve_quotes: Mapping[str, CurveQuotes], processes: int | None = None):
+    #function bootstrapping many independent curves (e.g. currencies, indices or historical dates), given as a mapping of curve name -> CurveQuotes (or a tuple in the same order)
+    #the curves are shared out over a pool of processes, one task per curve, each bootstrapped exactly as by bootstrap_discount_curve without modifying the quotes
+    #a curve whose bootstrap raises an exception is reported in the errors of the result and does not stop the others
+    if processes is None:
+        processes = os.cpu_count() or 1
+    if processes <= 0:
+        raise ValueError("The number of processes must be greater than 0.")
+    curve_quotes = {name: CurveQuotes(*quotes) for name, quotes in curve_quotes.items()}
+
+    pillars = {}
+    errors = {}
+    if processes == 1 or len(curve_quotes) <= 1:
+        #no pool needed, run in this process
+        for name, quotes in curve_quotes.items():
+            try:
+                pillars[name] = _bootstrap_pillars(*quotes)
+            except Exception as error:
+                errors[name] = error
+    else:
+        with ProcessPoolExecutor(max_workers=min(processes, len(curve_quotes))) as executor:
+            futures = {name: executor.submit(_bootstrap_pillars, *quotes) for name, quotes in curve_quotes.items()}
+            for name, future in futures.items():
+                #a worker that dies takes its task with it, and the pool then fails the tasks still outstanding, which are reported as errors too
+                try:
+                    pillars[name] = future.result()
+                except Exception as error:
+                    errors[name] = error
+
+    #rebuild the curves from their pillars, in the order of the input mapping
+    curves = {}
+    for name, quotes in curve_quotes.items():
+        if name in pillars:
+            interpolation_dates, interpolation_dfs, interpolation_year_fractions = pillars[name]
+            curves[name] = DiscountCurve._from_pillars(quotes.valuation_date, interpolation_dates, interpolation_dfs, interpolation_year_fractions, quotes.convention)
+    return BootstrapResults(curves, errors)
+
+def _deposit_terms(quote: DepositQuote):
+    #helper returning the terms defining a deposit quote, used to detect changed quotes
+    return (quote.start_date, quote.end_date, quote.rate, quote.convention)
+
+def _swap_terms(quote: FixedForFloatingSwapQuote):
+    #helper returning the terms defining a swap quote, used to detect changed quotes
+    return (quote.effective_date, quote.maturity_date, quote.fixed_rate, quote.fixed_frequency_months, quote.fixed_convention, quote.float_frequency_months, quote.float_convention, quote.notional)
+
+class IncrementalBootstrapper:
+#class bootstrapping curves for one valuation date and convention repeatedly as quotes change, e.g. intraday
+#it remembers the previous quotes and pillars, in a sequential bootstrap each swap pillar only depends on the deposits and the swaps before it (in maturity order)
+#so when quotes change only the pillar of the first changed swap and those after it are solved again, a change to any deposit rebuilds the whole curve
+#the curves returned are identical to those of bootstrap_discount_curve on the same quotes
+    def __init__(self, valuation_date: date, convention: str):
+        self.valuation_date = valuation_date
+        self.convention = convention
+
+        #terms of the previous quotes (in bootstrapping order), the previous curve's pillars and, per pillar, -1 for a deposit or the position of the swap that added it
+        self._deposit_terms: list[tuple] | None = None
+        self._swap_terms: list[tuple] = []
+        self._interpolation_dates: list[date] = []
+        self._interpolation_dfs: list[float] = []
+        self._interpolation_year_fractions: list[float] = []
+        self._pillar_sources: list[int] = []
+
+        #number of swap pillars solved by the last call to bootstrap
+        self.solved_pillar_count = 0
+
+    def bootstrap(self, deposit_quotes: list[DepositQuote], swap_quotes: list[FixedForFloatingSwapQuote]):
+        #method returning the curve bootstrapped from the quotes, re-solving only the swap pillars affected by changes since the previous call
+        #a new curve object is returned on every call
+        deposit_quotes = _sorted_deposit_quotes(deposit_quotes)
+        swap_quotes = _sorted_swap_quotes(swap_quotes)
+        deposit_terms = [_deposit_terms(quote) for quote in deposit_quotes]
+        swap_terms = [_swap_terms(quote) for quote in swap_quotes]
+
+        if deposit_terms != self._deposit_terms:
+            #deposits changed (or first call), rebuild from the deposits
+            first_changed = 0
+            curve = _deposit_curve(self.valuation_date, deposit_quotes, self.convention)
+            pillar_sources = [-1]*len(curve.interpolation_dates)
+        else:
+            #the first swap whose terms changed, every swap before it keeps its pillar
+            first_changed = 0
+            while first_changed < min(len(swap_terms), len(self._swap_terms)) and swap_terms[first_changed] == self._swap_terms[first_changed]:
+                first_changed += 1
+
+            #the curve as it stood before the first changed swap was solved, i.e. the pillars from deposits and the unchanged swaps, which are in date order already
+            kept = [i for i, source in enumerate(self._pillar_sources) if source < first_changed]
+            curve = DiscountCurve._from_pillars(self.valuation_date, [self._interpolation_dates[i] for i in kept], [self._interpolation_dfs[i] for i in kept], [self._interpolation_year_fractions[i] for i in kept], self.convention)
+            pillar_sources = [self._pillar_sources[i] for i in kept]
+
+        _add_swap_pillars(curve, swap_quotes[first_changed:], pillar_sources, first_changed)
 
-    return curve
\ No newline at end of file
+        #remember the inputs and pillars for the next call only once the bootstrap has succeeded, keeping copies as the caller may modify the curve
+        self._deposit_terms = deposit_terms
+        self._swap_terms = swap_terms
+        self._interpolation_dates = list(curve.interpolation_dates)
+        self._interpolation_dfs = list(curve.interpolation_dfs)
+        self._interpolation_year_fractions = list(curve.interpolation_year_fractions)
+        self._pillar_sources = pillar_sources
+        self.solved_pillar_count = len(swap_quotes) - first_changed
+        return curve
@@ -1,10 +1,12 @@
 import math
+from bisect import bisect_left
 from datetime import date
 
 from derivative_valuations.df_curve.discount_factor import DiscountCurve
 from derivative_valuations.daycount_conventions.daycount import year_fraction_computation
-from derivative_valuations.payment_schedule.accrual_period_payment_schedule import generate_schedule
+from derivative_valuations.payment_schedule.accrual_period_payment_schedule import cached_schedule, add_months, _validate_schedule_inputs
 from derivative_valuations.cashflows.cash_flow import build_fixed_leg_cashflows
+from derivative_valuations.instrumentation.metrics import instrumented
 
 class DepositQuote:
     #class for a money market deposit instrument quote
@@ -48,12 +50,12 @@ class FixedForFloatingSwapQuote:
             raise ValueError("Fixed payment frequency and floating payment frequency must be greater than 0!")
         
     def fixed_schedule(self):
-        #method to return accrual periods for fixed leg of the swap
-        return generate_schedule(self.effective_date, self.maturity_date, self.fixed_frequency_months)
+        #method to return accrual periods for fixed leg of the swap, as an immutable cached schedule
+        return cached_schedule(self.effective_date, self.maturity_date, self.fixed_frequency_months)
     
     def floating_schedule(self):
-        #method to return accrual periods for floating leg of the swap
-        return generate_schedule(self.effective_date, self.maturity_date, self.float_frequency_months)
+        #method to return accrual periods for floating leg of the swap, as an immutable cached schedule
+        return cached_schedule(self.effective_date, self.maturity_date, self.float_frequency_months)
         
     def fixed_cashflows(self, notional_override: float | None = None):
         if notional_override == None:
@@ -61,8 +63,13 @@ class FixedForFloatingSwapQuote:
         else:
             return build_fixed_leg_cashflows(self.fixed_schedule(), notional_override, self.fixed_rate, self.fixed_convention)
         
-    def solve_last_df(self, curve: DiscountCurve):
+    @instrumented("FixedForFloatingSwapQuote.solve_last_df")
+    def solve_last_df(self, curve: DiscountCurve, annuity_carry: "SwapAnnuityCarry | None" = None):
         #method for solving for a discount factor at the swap's maturity date
+        #optionally reuses the annuity of coupons already discounted for an earlier swap with the same fixed leg, see SwapAnnuityCarry
+        if annuity_carry is not None:
+            return self._solve_last_df_with_carry(curve, annuity_carry)
+
         fixed_schedule = self.fixed_schedule()
 
         #validation checks
@@ -110,3 +117,79 @@ class FixedForFloatingSwapQuote:
             raise ValueError("Solved discount factor at maturity date of the swap is not greater than 0!")
 
         return df_maturity_date
+
+    def _solve_last_df_with_carry(self, curve: DiscountCurve, annuity_carry: "SwapAnnuityCarry"):
+        #solve_last_df using the running annuity, which only evaluates coupons not already carried from earlier swaps
+        if not annuity_carry.matches(self):
+            raise ValueError("The annuity carry was built for swaps with a different effective date, fixed frequency or fixed convention!")
+        _validate_schedule_inputs(self.effective_date, self.maturity_date, self.fixed_frequency_months)
+
+        #the fixed schedule is every regular accrual period ending before the maturity date, followed by a final period ending at the maturity date
+        regular_period_count = annuity_carry._regular_period_count(self.maturity_date)
+        annuity_carry._settle(curve, regular_period_count)
+
+        #the discount factor at maturity_date is given by a/b as in solve_last_df, continuing the carried sum in date order
+        a_sum = annuity_carry.annuity
+        for i in range(annuity_carry.settled_count, regular_period_count):
+            a_sum = a_sum + annuity_carry._year_fraction(i)*curve.df(annuity_carry.period_ends[i])
+        a = 1 - self.fixed_rate*a_sum
+
+        final_period_start = annuity_carry.period_ends[regular_period_count-1] if regular_period_count > 0 else self.effective_date
+        final_year_fraction = year_fraction_computation(final_period_start, self.maturity_date, self.fixed_convention)
+        if final_year_fraction <= 0:
+            raise ValueError("The year fraction must be greater than 0.")
+        b = 1 + self.fixed_rate*final_year_fraction
+
+        df_maturity_date = a/b
+
+        #validation check of result
+        if df_maturity_date <= 0:
+            raise ValueError("Solved discount factor at maturity date of the swap is not greater than 0!")
+
+        return df_maturity_date
+
+class SwapAnnuityCarry:
+    #class holding a running fixed leg annuity, sum(year_fraction_t_i * DF(t_i)), shared by swaps with the same effective date, fixed frequency and fixed convention
+    #as schedules step forward from the effective date, every regular coupon of a shorter swap is also a coupon of a longer one
+    #a coupon is only carried once it lies on or before the final known date of the curve, after which its discount factor cannot change provided the curve is only extended beyond its final known date
+    def __init__(self, effective_date: date, fixed_frequency_months: int, fixed_convention: str):
+        self.effective_date = effective_date
+        self.fixed_frequency_months = fixed_frequency_months
+        self.fixed_convention = fixed_convention
+
+        #regular accrual period end dates generated so far, each period starting at the end of the previous one
+        self.period_ends: list[date] = []
+        self._period_year_fractions: list[float] = []
+
+        #number of coupons carried and their annuity
+        self.settled_count = 0
+        self.annuity = 0.0
+
+    def matches(self, quote: FixedForFloatingSwapQuote):
+        #method checking whether the swap quote's fixed leg shares this carry's coupons
+        return (quote.effective_date, quote.fixed_frequency_months, quote.fixed_convention) == (self.effective_date, self.fixed_frequency_months, self.fixed_convention)
+
+    def _regular_period_count(self, maturity_date: date):
+        #helper that extends the regular periods (stepping as in generate_schedule) and returns how many end before maturity_date
+        while not self.period_ends or self.period_ends[-1] < maturity_date:
+            period_start = self.period_ends[-1] if self.period_ends else self.effective_date
+            period_end = add_months(period_start, self.fixed_frequency_months)
+            self.period_ends.append(period_end)
+            self._period_year_fractions.append(year_fraction_computation(period_start, period_end, self.fixed_convention))
+        return bisect_left(self.period_ends, maturity_date)
+
+    def _year_fraction(self, i: int):
+        #helper returning the year fraction of the i-th regular period
+        year_fraction = self._period_year_fractions[i]
+        if year_fraction <= 0:
+            raise ValueError("The year fraction must be greater than 0.")
+        return year_fraction
+
+    def _settle(self, curve: DiscountCurve, regular_period_count: int):
+        #helper adding coupons whose discount factor is now final to the carried annuity
+        if self.settled_count > regular_period_count:
+            raise ValueError("Swap quotes sharing an annuity carry must be solved in order of increasing maturity!")
+        final_known_date = curve.interpolation_dates[-1]
+        while self.settled_count < regular_period_count and self.period_ends[self.settled_count] <= final_known_date:
+            self.annuity = self.annuity + self._year_fraction(self.settled_count)*curve.df(self.period_ends[self.settled_count])
+            self.settled_count += 1
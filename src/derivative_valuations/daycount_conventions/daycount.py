@@ -1,30 +1,104 @@
 from datetime import date
+from collections.abc import Callable, Sequence
+import numpy as np
+from derivative_valuations.instrumentation.metrics import instrumented
 
+#ordinal (date.toordinal) of 01/01/1970, the numpy datetime64 epoch
+_EPOCH_ORDINAL = date(1970,1,1).toordinal()
+
+def _act_360(start_date: date, end_date: date):
+    #ACT/360
+    #computes number of days using standard python datetime library then divides by 360
+    timedelta = end_date - start_date
+    return timedelta.days/360
+
+def _act_365(start_date: date, end_date: date):
+    #ACT/365
+    #computes number of days using standard python datetime library then divides by 365
+    timedelta = end_date - start_date
+    return timedelta.days/365
+
+def _thirty_e_360(start_date: date, end_date: date):
+    #30/360 European/Eurobond basis (ISDA 2006)
+    d_0 = start_date.day
+    d_1 = end_date.day
+    if d_0 == 31:
+        d_0 = 30
+    if d_1 == 31:
+        d_1 = 30
+    return (1/360)*(360*(end_date.year-start_date.year)+30*(end_date.month-start_date.month)+(d_1-d_0))
+
+def _act_360_ordinals(start_ordinals: np.ndarray, end_ordinals: np.ndarray):
+    #vectorised ACT/360 over arrays of date ordinals
+    return (end_ordinals - start_ordinals)/360
+
+def _act_365_ordinals(start_ordinals: np.ndarray, end_ordinals: np.ndarray):
+    #vectorised ACT/365 over arrays of date ordinals
+    return (end_ordinals - start_ordinals)/365
+
+def _thirty_e_360_ordinals(start_ordinals: np.ndarray, end_ordinals: np.ndarray):
+    #vectorised 30E/360 over arrays of date ordinals, using the same formula as _thirty_e_360
+    y_0, m_0, d_0 = _year_month_day(start_ordinals)
+    y_1, m_1, d_1 = _year_month_day(end_ordinals)
+    d_0 = np.minimum(d_0, 30)
+    d_1 = np.minimum(d_1, 30)
+    return (1/360)*(360*(y_1-y_0)+30*(m_1-m_0)+(d_1-d_0))
+
+#dispatch tables from convention to year fraction function, scalar (dates) and vectorised (arrays of ordinals)
+_DAYCOUNT_FUNCTIONS = {
+    "ACT/360": _act_360,
+    "ACT/365": _act_365,
+    "30E/360": _thirty_e_360,
+}
+_VECTORISED_DAYCOUNT_FUNCTIONS = {
+    "ACT/360": _act_360_ordinals,
+    "ACT/365": _act_365_ordinals,
+    "30E/360": _thirty_e_360_ordinals,
+}
+
+def _year_month_day(ordinals: np.ndarray):
+    #helper splitting an array of date ordinals into arrays of years, months and days
+    days = (ordinals - _EPOCH_ORDINAL).astype("datetime64[D]")
+    months = days.astype("datetime64[M]")
+    years = months.astype("datetime64[Y]")
+    return years.astype(np.int64) + 1970, (months - years.astype("datetime64[M]")).astype(np.int64) + 1, (days - months.astype("datetime64[D]")).astype(np.int64) + 1
+
+def to_ordinals(dates: Sequence[date] | np.ndarray):
+    #function converting a sequence of dates to a numpy integer array of date ordinals (date.toordinal), integer arrays are returned unchanged
+    if isinstance(dates, np.ndarray) and np.issubdtype(dates.dtype, np.integer):
+        return dates.astype(np.int64, copy=False)
+    return np.fromiter((d.toordinal() for d in dates), dtype=np.int64)
+
+def resolve_convention(convention: str) -> Callable[[date, date], float]:
+    #function resolving a day count convention once into its year fraction function f(start_date, end_date)
+    #note the function does not check that the end date is after the start date
+    try:
+        return _DAYCOUNT_FUNCTIONS[convention]
+    except KeyError:
+        raise ValueError("This day count convention is either not recognised or has not yet been implemented.") from None
+
+@instrumented("year_fraction_computation")
 def year_fraction_computation(start_date: date, end_date: date, convention: str):
     #validation checks
     if end_date < start_date:
            raise ValueError("End date must be after start date!")
 
-    #check which convention is being used
-    if convention == "ACT/360":
-            #ACT/360
-            #computes number of days using standard python datetime library then divides by 360
-            timedelta = end_date - start_date
-            year_fraction = timedelta.days/360
-    elif convention == "ACT/365":
-            #ACT/365
-            #computes number of days using standard python datetime library then divides by 365
-            timedelta = end_date - start_date
-            year_fraction = timedelta.days/365
-    elif convention == "30E/360":
-            #30/360 European/Eurobond basis (ISDA 2006)
-            d_0 = start_date.day
-            d_1 = end_date.day
-            if d_0 == 31:
-                   d_0 = 30
-            if d_1 == 31:
-                   d_1 = 30
-            year_fraction = (1/360)*(360*(end_date.year-start_date.year)+30*(end_date.month-start_date.month)+(d_1-d_0))
-    else:
-           raise ValueError("This day count convention is either not recognised or has not yet been implemented.")
-    return year_fraction
\ No newline at end of file
+    #look up the convention in the dispatch table
+    return resolve_convention(convention)(start_date, end_date)
+
+def year_fractions(start_dates: Sequence[date] | np.ndarray | date, end_dates: Sequence[date] | np.ndarray | date, convention: str):
+    #vectorised counterpart of year_fraction_computation, returning a numpy array of year fractions
+    #start and end dates may each be a single date, a sequence of dates or a numpy integer array of date ordinals, and are broadcast against each other
+    start_ordinals = np.int64(start_dates.toordinal()) if isinstance(start_dates, date) else to_ordinals(start_dates)
+    end_ordinals = np.int64(end_dates.toordinal()) if isinstance(end_dates, date) else to_ordinals(end_dates)
+
+    #validation checks
+    if np.any(end_ordinals < start_ordinals):
+        raise ValueError("End date must be after start date!")
+
+    #look up the convention in the dispatch table
+    try:
+        function = _VECTORISED_DAYCOUNT_FUNCTIONS[convention]
+    except KeyError:
+        raise ValueError("This day count convention is either not recognised or has not yet been implemented.") from None
+    return np.asarray(function(start_ordinals, end_ordinals), dtype=float)
@@ -1,6 +1,11 @@
 import math
+import bisect
 from datetime import date
-from derivative_valuations.daycount_conventions.daycount import year_fraction_computation
+from collections.abc import Sequence
+import numpy as np
+from derivative_valuations.daycount_conventions.daycount import year_fraction_computation, year_fractions, resolve_convention, to_ordinals
+from derivative_valuations.instrumentation.metrics import instrumented
+from derivative_valuations.df_curve.interpolation import LOG_LINEAR, resolve_interpolation
 from operator import itemgetter
 import copy
 
@@ -65,13 +70,19 @@ def interpolate_log_df(valuation_date_t_0_year_fraction: float,  df_0: float, va
 
 class DiscountCurve:
 #object class for the curve of discount rates
-    def __init__(self, valuation_date: date, interpolation_dates: list, interpolation_dfs: list, convention: str):
+    def __init__(self, valuation_date: date, interpolation_dates: list, interpolation_dfs: list, convention: str, interpolation: str = LOG_LINEAR):
     #__init__ function to setup the year fractions of the given list of interpolation boundary points, first orders them and error checks, then converts to year fractions via a given convention
+    #interpolation is the method used between known dates, log_linear (the default) or one of the smooth methods in df_curve/interpolation.py
         self.valuation_date = valuation_date
         self.convention = convention
         self.interpolation_dates = interpolation_dates
         self.interpolation_dfs = interpolation_dfs
 
+        #resolve the day count convention and interpolation method once for lookups
+        self._year_fraction = resolve_convention(convention)
+        self.interpolation = interpolation
+        self._interpolation_fit = resolve_interpolation(interpolation)
+
         #validation checks
         if len(self.interpolation_dates) != len(self.interpolation_dfs):
             raise ValueError("Each given date must have a corresponding discount factor and vice versa!")
@@ -89,6 +100,30 @@ class DiscountCurve:
             if self.interpolation_year_fractions[i+1] <= self.interpolation_year_fractions[i]:
                 raise ValueError("Year fractions for each interpolation boundary must be strictly increasing!")
 
+        #precompute the pillar index used by df and dfs
+        self._build_pillar_index()
+
+    @classmethod
+    def _from_pillars(cls, valuation_date: date, interpolation_dates: list, interpolation_dfs: list, interpolation_year_fractions: list, convention: str, interpolation: str = LOG_LINEAR):
+        #alternative constructor for pillars taken from a curve that was already validated, e.g. a stored curve snapshot
+        #the given (sorted) dates, discount factors and year fractions are used as they are, so no sorting, day counts or checks are repeated
+        curve = cls.__new__(cls)
+        curve.valuation_date = valuation_date
+        curve.convention = convention
+        curve.interpolation_dates = interpolation_dates
+        curve.interpolation_dfs = interpolation_dfs
+        curve.interpolation_year_fractions = interpolation_year_fractions
+        curve._year_fraction = resolve_convention(convention)
+        curve.interpolation = interpolation
+        curve._interpolation_fit = resolve_interpolation(interpolation)
+        curve._build_pillar_index()
+        return curve
+
+    def with_interpolation(self, interpolation: str):
+        #method returning a new curve with the same known dates and discount factors, interpolated with another method
+        #note that a curve bootstrapped with log_linear interpolation only reprices its swap quotes exactly under log_linear interpolation
+        return DiscountCurve._from_pillars(self.valuation_date, list(self.interpolation_dates), list(self.interpolation_dfs), list(self.interpolation_year_fractions), self.convention, interpolation)
+
     def add_known_dates(self, new_interpolation_dates: list, new_interpolation_dfs: list):
         #method to add new dates that can be used for interpolation
 
@@ -98,17 +133,31 @@ class DiscountCurve:
         if any(df <= 0 for df in new_interpolation_dfs):
             raise ValueError("Discount factors must be greater than 0.")
         
-        #add the dates
-        for d in new_interpolation_dates:
-            self.interpolation_dates.append(d)
-        for df in new_interpolation_dfs:
-            self.interpolation_dfs.append(df)
-        #sort into chronological order
-        self._sort()
+        #insert each new date into its chronological position, only computing the year fraction and log discount factor of the new date
+        #dates equal to an existing date are placed after it, as the previous stable sort did
+        for d, df in zip(new_interpolation_dates, new_interpolation_dfs):
+            year_fraction = year_fraction_computation(self.valuation_date, d, self.convention)
+            if not self.interpolation_dates or d > self.interpolation_dates[-1]:
+                #fast path for dates beyond the final known date, as in bootstrapping
+                self.interpolation_dates.append(d)
+                self.interpolation_dfs.append(df)
+                self.interpolation_year_fractions.append(year_fraction)
+                self._log_dfs.append(math.log(df))
+            else:
+                i = bisect.bisect_right(self.interpolation_dates, d)
+                self.interpolation_dates.insert(i, d)
+                self.interpolation_dfs.insert(i, df)
+                self.interpolation_year_fractions.insert(i, year_fraction)
+                self._log_dfs.insert(i, math.log(df))
 
-        #recompute year fractions from the list of dates to use for the interpolation
-        self.interpolation_year_fractions = [year_fraction_computation(self.valuation_date, d, self.convention) for d in self.interpolation_dates] 
+        #refresh the extrapolation forward rate and mark the pillar arrays for rebuilding
+        self._update_extrapolation_forward_rate()
+        self._pillar_arrays = None
+        #smooth interpolation methods depend on every known date, so are fitted again
+        if self._interpolation_fit is not None:
+            self._fit_interpolation()
 
+    @instrumented("DiscountCurve.df")
     def df(self, t: date):
         #function that interpolates to find a discount rate on a target date t    
         
@@ -116,31 +165,215 @@ class DiscountCurve:
         if t <= self.valuation_date:
             return 1.0
         
-        #otherwise compute target date year fraction (from valuation date to t)
-        valuation_date_t_year_fraction = year_fraction_computation(self.valuation_date, t, self.convention)
-
-        #edge cases where the target date is equal to a given date (from the available dates for interpolation)
-        #just returns the discount factor at that date
-        for valuation_date_t_i_year_fraction, df in zip(self.interpolation_year_fractions, self.interpolation_dfs):
-            if valuation_date_t_i_year_fraction == valuation_date_t_year_fraction:
-                return df
-            
-        #otherwise interpolate between the lower and upper nearest known dates
-        for i in range(len(self.interpolation_year_fractions)-1):
-            valuation_date_t_0_year_fraction = self.interpolation_year_fractions[i]
-            valuation_date_t_1_year_fraction = self.interpolation_year_fractions[i+1]
-            
-            if valuation_date_t_0_year_fraction < valuation_date_t_year_fraction < valuation_date_t_1_year_fraction:
-                return interpolate_log_df(valuation_date_t_0_year_fraction,self.interpolation_dfs[i], valuation_date_t_year_fraction, valuation_date_t_1_year_fraction, self.interpolation_dfs[i+1])
-            elif valuation_date_t_0_year_fraction > valuation_date_t_year_fraction:
-                raise ValueError("Target date cannot be before the first known date!")
-            elif valuation_date_t_year_fraction > self.interpolation_year_fractions[-1]:
-                return interpolate_log_df(self.interpolation_year_fractions[-2],self.interpolation_dfs[-2], valuation_date_t_year_fraction, self.interpolation_year_fractions[-1], self.interpolation_dfs[-1])
-            
+        #otherwise compute target date year fraction (from valuation date to t) and look it up in the pillar index
+        valuation_date_t_year_fraction = self._year_fraction(self.valuation_date, t)
+        return self._df_from_year_fraction(valuation_date_t_year_fraction)
+
+    def dfs(self, dates: Sequence[date] | np.ndarray):
+        #vectorised counterpart of df, returns a numpy array with the discount factor for each target date
+        #dates may be a sequence of dates or a numpy integer array of date ordinals
+        valuation_date_t_year_fractions, settled = self._target_year_fractions(dates)
+        return self._dfs_from_year_fractions(valuation_date_t_year_fractions, settled)
+
+    def pillar_weights(self, dates: Sequence[date] | np.ndarray):
+        #method returning, for each target date, the two known dates and weights implied by the log DF interpolation/extrapolation
+        #the log discount factor at the target date is w_0*log(df_i_0) + w_1*log(df_i_1), output as numpy arrays (i_0, i_1, w_0, w_1)
+        #target dates on or before the valuation date have both weights 0, known dates have w_0 = 1 on that date
+        #only log_linear interpolation is a weighted sum of two known log discount factors
+        if self._interpolation_fit is not None:
+            raise ValueError("Pillar weights are only defined for log-linear interpolation.")
+        valuation_date_t_year_fractions, settled = self._target_year_fractions(dates)
+        pillar_year_fractions = self._get_pillar_arrays()[0]
+        n = len(pillar_year_fractions)
+        i_0 = np.zeros(len(settled), dtype=np.int64)
+        i_1 = np.zeros(len(settled), dtype=np.int64)
+        w_0 = np.zeros(len(settled))
+        w_1 = np.zeros(len(settled))
+        active = ~settled
+        if not active.any():
+            return i_0, i_1, w_0, w_1
+        t = valuation_date_t_year_fractions[active]
+
+        #binary search for the first known date at or after each target date, as in dfs
+        i = np.searchsorted(pillar_year_fractions, t, side="left")
+        exact = (i < n) & (pillar_year_fractions[np.minimum(i, n-1)] == t)
+        if np.any((i == 0) & ~exact):
+            raise ValueError("Target date cannot be before the first known date!")
+        beyond = i == n
+        if beyond.any() and self._extrapolation_forward_rate is None:
+            raise ValueError("At least two distinct known dates are required to extrapolate beyond the final known date!")
+
+        #interpolation uses the bracketing known dates, extrapolation uses the final two known dates with delta > 1
+        upper = np.where(beyond, n-1, np.maximum(i, 1))
+        lower = upper-1
+        delta = np.zeros(len(t))
+        segment = ~exact
+        delta[segment] = (t[segment] - pillar_year_fractions[lower[segment]])/(pillar_year_fractions[upper[segment]] - pillar_year_fractions[lower[segment]])
+
+        i_0[active] = np.where(exact, i, lower)
+        i_1[active] = np.where(exact, i, upper)
+        w_0[active] = np.where(exact, 1.0, 1-delta)
+        w_1[active] = np.where(exact, 0.0, delta)
+        return i_0, i_1, w_0, w_1
+
+    def _target_year_fractions(self, dates: Sequence[date] | np.ndarray):
+        #helper returning numpy arrays of year fractions from the valuation date to each target date, and a mask of target dates on or before the valuation date (given year fraction 0)
+        #target dates may also be given as a numpy integer array of date ordinals (date.toordinal)
+        target_ordinals = to_ordinals(dates)
+        settled = target_ordinals <= self.valuation_date.toordinal()
+        valuation_date_t_year_fractions = np.zeros(len(target_ordinals))
+        if not settled.all():
+            valuation_date_t_year_fractions[~settled] = year_fractions(self.valuation_date, target_ordinals[~settled], self.convention)
+        return valuation_date_t_year_fractions, settled
+
+    def _df_from_year_fraction(self, valuation_date_t_year_fraction: float):
+        #helper that finds the discount factor at a year fraction after the valuation date via binary search on the pillars
+        if self._segments is not None:
+            return self._smooth_df_from_year_fraction(valuation_date_t_year_fraction)
+        year_fractions = self.interpolation_year_fractions
+        i = bisect.bisect_left(year_fractions, valuation_date_t_year_fraction)
+
+        #edge case where the target date is equal to a known date, just return the discount factor at that date
+        if i < len(year_fractions) and year_fractions[i] == valuation_date_t_year_fraction:
+            return self.interpolation_dfs[i]
+        if i == 0:
+            raise ValueError("Target date cannot be before the first known date!")
+
+        #extrapolate beyond the final known date using the flat forward rate of the final segment
+        if i == len(year_fractions):
+            if self._extrapolation_forward_rate is None:
+                raise ValueError("At least two distinct known dates are required to extrapolate beyond the final known date!")
+            return self.interpolation_dfs[-1]*math.exp(-self._extrapolation_forward_rate*(valuation_date_t_year_fraction - year_fractions[-1]))
+
+        #otherwise linearly interpolate the log discount factors of the bracketing known dates (as in interpolate_log_df)
+        delta = (valuation_date_t_year_fraction - year_fractions[i-1])/(year_fractions[i] - year_fractions[i-1])
+        return math.exp((1-delta)*self._log_dfs[i-1]+delta*self._log_dfs[i])
+
+    def _smooth_df_from_year_fraction(self, valuation_date_t_year_fraction: float):
+        #counterpart of _df_from_year_fraction for smooth interpolation methods, with one binary search on the knots of the coefficient table
+        knots = self._segment_knots
+        k = bisect.bisect_right(knots, valuation_date_t_year_fraction) - 1
+        if k < 0:
+            raise ValueError("Target date cannot be before the first known date!")
+
+        #known dates return their discount factor, beyond the final known date extrapolate at the flat forward rate
+        if knots[k] == valuation_date_t_year_fraction and self._knot_dfs[k] is not None:
+            return self._knot_dfs[k]
+        if k == len(knots) - 1:
+            return self.interpolation_dfs[-1]*math.exp(-self._extrapolation_forward_rate*(valuation_date_t_year_fraction - knots[-1]))
+
+        c_0, c_1, c_2, c_3 = self._segment_coefficients[k]
+        s = valuation_date_t_year_fraction - knots[k]
+        return math.exp(c_0 + s*(c_1 + s*(c_2 + s*c_3)))
+
+    def _smooth_dfs_from_year_fractions(self, t: np.ndarray):
+        #vectorised counterpart of _smooth_df_from_year_fraction for year fractions after the valuation date
+        segments = self._segments
+        knots = segments.knots
+        k = np.searchsorted(knots, t, side="right") - 1
+        if np.any(k < 0):
+            raise ValueError("Target date cannot be before the first known date!")
+        exact = (knots[k] == t) & self._knot_is_pillar[k]
+        beyond = (k == len(knots) - 1) & ~exact
+        interior = ~exact & ~beyond
+
+        result = np.empty(len(t))
+        result[exact] = self._knot_df_array[k[exact]]
+        k_interior = k[interior]
+        s = t[interior] - knots[k_interior]
+        result[interior] = np.exp(segments.c_0[k_interior] + s*(segments.c_1[k_interior] + s*(segments.c_2[k_interior] + s*segments.c_3[k_interior])))
+        result[beyond] = self.interpolation_dfs[-1]*np.exp(-self._extrapolation_forward_rate*(t[beyond] - knots[-1]))
+        return result
+
+    def _dfs_from_year_fractions(self, valuation_date_t_year_fractions: np.ndarray, settled: np.ndarray):
+        #vectorised helper for dfs, settled marks target dates on or before the valuation date which get df 1.0
+        dfs = np.ones(len(valuation_date_t_year_fractions))
+        active = ~settled
+        if not active.any():
+            return dfs
+        t = valuation_date_t_year_fractions[active]
+        if self._segments is not None:
+            dfs[active] = self._smooth_dfs_from_year_fractions(t)
+            return dfs
+        pillar_year_fractions, pillar_dfs, pillar_log_dfs = self._get_pillar_arrays()
+        n = len(pillar_year_fractions)
+
+        #binary search for the first pillar at or after each target date
+        i = np.searchsorted(pillar_year_fractions, t, side="left")
+        exact = (i < n) & (pillar_year_fractions[np.minimum(i, n-1)] == t)
+        if np.any((i == 0) & ~exact):
+            raise ValueError("Target date cannot be before the first known date!")
+        beyond = i == n
+        interior = ~exact & ~beyond
+
+        result = np.empty(len(t))
+        result[exact] = pillar_dfs[i[exact]]
+
+        if interior.any():
+            upper = i[interior]
+            t_0 = pillar_year_fractions[upper-1]
+            t_1 = pillar_year_fractions[upper]
+            delta = (t[interior] - t_0)/(t_1 - t_0)
+            result[interior] = np.exp((1-delta)*pillar_log_dfs[upper-1]+delta*pillar_log_dfs[upper])
+
+        if beyond.any():
+            if self._extrapolation_forward_rate is None:
+                raise ValueError("At least two distinct known dates are required to extrapolate beyond the final known date!")
+            result[beyond] = pillar_dfs[-1]*np.exp(-self._extrapolation_forward_rate*(t[beyond] - pillar_year_fractions[-1]))
+
+        dfs[active] = result
+        return dfs
+
+    def _build_pillar_index(self):
+        #helper to precompute the log discount factors and extrapolation forward rate used by df and dfs
+        #must be called whenever the known dates or discount factors are changed other than through add_known_dates
+        self._log_dfs = [math.log(df) for df in self.interpolation_dfs]
+        self._update_extrapolation_forward_rate()
+        #numpy pillar arrays for dfs are built lazily on the next batch lookup
+        self._pillar_arrays = None
+        self._segments = None
+        if self._interpolation_fit is not None:
+            self._fit_interpolation()
+
+    def _fit_interpolation(self):
+        #helper fitting a smooth interpolation method's coefficient table to the known dates, kept as numpy arrays for dfs and as lists for df
+        #the flat forward rate beyond the final known date becomes the instantaneous forward rate there, so the forward curve is continuous
+        if len(self.interpolation_year_fractions) < 2:
+            self._segments = None
+            return
+        self._segments = self._interpolation_fit(np.array(self.interpolation_year_fractions, dtype=float), np.array(self._log_dfs, dtype=float))
+        self._segment_knots = self._segments.knots.tolist()
+        self._segment_coefficients = list(zip(self._segments.c_0.tolist(), self._segments.c_1.tolist(), self._segments.c_2.tolist(), self._segments.c_3.tolist()))
+        #the discount factor at each knot that is a known date, None at breakpoints inside an interval
+        known_dfs = dict(zip(self.interpolation_year_fractions, self.interpolation_dfs))
+        self._knot_dfs = [known_dfs.get(knot) for knot in self._segment_knots]
+        self._knot_is_pillar = np.array([df is not None for df in self._knot_dfs])
+        self._knot_df_array = np.array([np.nan if df is None else df for df in self._knot_dfs])
+        self._extrapolation_forward_rate = self._segments.end_forward_rate
+
+    def _update_extrapolation_forward_rate(self):
+        #helper for the flat forward rate between the final two known dates, computed as in _extrapolate_log_df
+        year_fractions = self.interpolation_year_fractions
+        if len(year_fractions) >= 2 and year_fractions[-1] != year_fractions[-2]:
+            self._extrapolation_forward_rate = (1/(year_fractions[-1]-year_fractions[-2]))*(math.log(self.interpolation_dfs[-2]/self.interpolation_dfs[-1]))
+        else:
+            self._extrapolation_forward_rate = None
+
+    def _get_pillar_arrays(self):
+        #helper returning numpy arrays of the pillar year fractions, discount factors and log discount factors
+        if self._pillar_arrays is None:
+            self._pillar_arrays = (np.array(self.interpolation_year_fractions, dtype=float), np.array(self.interpolation_dfs, dtype=float), np.array(self._log_dfs, dtype=float))
+        return self._pillar_arrays
+
+    @instrumented("DiscountCurve.bump_curve")
     def bump_curve(self, bp: float):
         #bump the curve by a given amount of basis points (1bp is 0.01% or 0.0001)
-        #first copy the curve
-        bumped_curve = copy.deepcopy(self)
+        #for pricing under a shift without building a new curve, see shifted
+        #first copy the curve, only the lists of known dates, discount factors and year fractions need copying as dates are immutable
+        bumped_curve = copy.copy(self)
+        bumped_curve.interpolation_dates = list(self.interpolation_dates)
+        bumped_curve.interpolation_dfs = list(self.interpolation_dfs)
+        bumped_curve.interpolation_year_fractions = list(self.interpolation_year_fractions)
 
         #validation check
         if len(bumped_curve.interpolation_dfs) != len(bumped_curve.interpolation_year_fractions):
@@ -158,8 +391,14 @@ class DiscountCurve:
             #recompute using _df_from_zero_rate helper
             bumped_curve.interpolation_dfs[i] =_df_from_zero_rate(bumped_zero_rate, bumped_curve.interpolation_year_fractions[i])
 
+        #rebuild the pillar index from the bumped discount factors
+        bumped_curve._build_pillar_index()
         return bumped_curve
 
+    def shifted(self, bp: float):
+        #return a ShiftedCurve view of the curve with every zero rate shifted by bp basis points, without copying the curve
+        return ShiftedCurve(self, bp)
+
     
     def _sort(self):
         #helper to sort the interpolation dates and discount factors
@@ -170,6 +409,61 @@ class DiscountCurve:
         self.interpolation_dates = list(dates)
         self.interpolation_dfs = list(dfs)
 
+class ShiftedCurve:
+#object class for a view of a DiscountCurve with the zero rate at every known date shifted by a given amount of basis points
+#under log DF interpolation and flat forward extrapolation, shifting every known zero rate by s multiplies the discount factor at any date by exp(-s*t)
+#this also holds for the smooth interpolation methods, which reproduce log discount factors linear in t, so shift every forward rate by s
+#so the view shares the base curve's known dates and discount factors and applies that factor at lookup time, rather than copying and rebuilding the curve
+    def __init__(self, base_curve: DiscountCurve, bp: float):
+        #shifts of a shifted curve are applied to the underlying base curve
+        if isinstance(base_curve, ShiftedCurve):
+            bp = base_curve.bp + bp
+            base_curve = base_curve.base_curve
+        self.base_curve = base_curve
+        self.bp = bp
+        self.valuation_date = base_curve.valuation_date
+        self.convention = base_curve.convention
+
+    @property
+    def interpolation_dates(self):
+        return self.base_curve.interpolation_dates
+
+    @property
+    def interpolation_year_fractions(self):
+        return self.base_curve.interpolation_year_fractions
+
+    @property
+    def interpolation_dfs(self):
+        #shifted discount factors at the known dates
+        return [df*math.exp(-(self.bp/10000)*year_fraction) for df, year_fraction in zip(self.base_curve.interpolation_dfs, self.base_curve.interpolation_year_fractions)]
+
+    def df(self, t: date):
+        #function that finds the shifted discount factor on a target date t
+        
+        #cashflows occurring before or on the valuation date have df 1.0
+        if t <= self.valuation_date:
+            return 1.0
+        
+        valuation_date_t_year_fraction = self.base_curve._year_fraction(self.valuation_date, t)
+        return self.base_curve._df_from_year_fraction(valuation_date_t_year_fraction)*math.exp(-(self.bp/10000)*valuation_date_t_year_fraction)
+
+    def dfs(self, dates: Sequence[date] | np.ndarray):
+        #vectorised counterpart of df, dates on or before the valuation date have year fraction 0 so are unaffected by the shift
+        valuation_date_t_year_fractions, settled = self.base_curve._target_year_fractions(dates)
+        return self.base_curve._dfs_from_year_fractions(valuation_date_t_year_fractions, settled)*np.exp(-(self.bp/10000)*valuation_date_t_year_fractions)
+
+    def pillar_weights(self, dates: Sequence[date] | np.ndarray):
+        #the shift does not change the interpolation weights, see DiscountCurve.pillar_weights
+        return self.base_curve.pillar_weights(dates)
+
+    def shifted(self, bp: float):
+        #return a view shifted by a further bp basis points
+        return ShiftedCurve(self.base_curve, self.bp + bp)
+
+    def bump_curve(self, bp: float):
+        #materialise the shifted curve as a DiscountCurve bumped by a further bp basis points
+        return self.base_curve.bump_curve(self.bp + bp)
+
 #unused present value function
 """        
 def pv(cashflows: list[tuple[date, float]], curve: DiscountCurve):
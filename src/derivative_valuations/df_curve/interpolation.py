@@ -0,0 +1,136 @@
+from typing import NamedTuple
+import numpy as np
+
+#interpolation methods for the log discount factor between the known dates of a DiscountCurve
+#log_linear (the default) is built into DiscountCurve, giving piecewise flat forward rates
+#the smooth methods are fitted once, when the curve is built or changed, to a table of cubic polynomials in s = t - knot on each interval between consecutive knots
+#so a lookup is one binary search and a cubic in Horner form, with no logarithms or exponentials of the known discount factors
+#beyond the final known date every method extrapolates at a flat forward rate, the instantaneous forward rate at the final known date
+
+LOG_LINEAR = "log_linear"
+MONOTONE_CONVEX = "monotone_convex"
+NATURAL_CUBIC = "natural_cubic"
+
+class PiecewiseCubic(NamedTuple):
+#coefficient table of a fitted interpolation, the log discount factor at year fraction t in [knots[k], knots[k+1]] is c_0[k] + s*(c_1[k] + s*(c_2[k] + s*c_3[k])) with s = t - knots[k]
+#the knots are the known year fractions plus any breakpoints inside an interval, end_forward_rate is the flat forward rate used beyond the final knot
+    knots: np.ndarray
+    c_0: np.ndarray
+    c_1: np.ndarray
+    c_2: np.ndarray
+    c_3: np.ndarray
+    end_forward_rate: float
+
+    def log_dfs(self, year_fractions: np.ndarray):
+        #method evaluating the log discount factor at year fractions from the first to the final knot
+        k = np.clip(np.searchsorted(self.knots, year_fractions, side="right") - 1, 0, len(self.c_0) - 1)
+        s = year_fractions - self.knots[k]
+        return self.c_0[k] + s*(self.c_1[k] + s*(self.c_2[k] + s*self.c_3[k]))
+
+def fit_natural_cubic(year_fractions: np.ndarray, log_dfs: np.ndarray):
+    #function fitting a natural cubic spline (zero second derivative at both ends) through the known (year fraction, log discount factor) points
+    #the second derivatives M at the known dates solve the tridiagonal system h_(i-1)*M_(i-1) + 2*(h_(i-1) + h_i)*M_i + h_i*M_(i+1) = 6*(slope_i - slope_(i-1))
+    t = np.asarray(year_fractions, dtype=float)
+    y = np.asarray(log_dfs, dtype=float)
+    h = np.diff(t)
+    slopes = np.diff(y)/h
+    n = len(t)
+    M = np.zeros(n)
+    if n > 2:
+        #Thomas algorithm on the interior known dates
+        lower = h[:-1].copy()
+        diagonal = 2*(h[:-1] + h[1:])
+        upper = h[1:].copy()
+        right = 6*np.diff(slopes)
+        for i in range(1, n-2):
+            factor = lower[i]/diagonal[i-1]
+            diagonal[i] -= factor*upper[i-1]
+            right[i] -= factor*right[i-1]
+        interior = np.zeros(n-2)
+        interior[-1] = right[-1]/diagonal[-1]
+        for i in range(n-4, -1, -1):
+            interior[i] = (right[i] - upper[i]*interior[i+1])/diagonal[i]
+        M[1:-1] = interior
+
+    c_1 = slopes - h*(2*M[:-1] + M[1:])/6
+    c_2 = M[:-1]/2
+    c_3 = (M[1:] - M[:-1])/(6*h)
+    #the forward rate is minus the slope of the log discount factor, at the final known date the spline's slope is c_1 + 2*c_2*h + 3*c_3*h^2 on the final interval
+    end_forward_rate = -float(c_1[-1] + 2*c_2[-1]*h[-1] + 3*c_3[-1]*h[-1]**2)
+    return PiecewiseCubic(t, y[:-1].copy(), c_1, c_2, c_3, end_forward_rate)
+
+def fit_monotone_convex(year_fractions: np.ndarray, log_dfs: np.ndarray):
+    #function fitting the monotone convex method of Hagan and West (2006) to the known (year fraction, log discount factor) points, without the positivity amendment
+    #the instantaneous forward rate on each interval is the interval's discrete forward rate plus a function g(x) of x in [0, 1] with zero integral, so every known discount factor is reproduced
+    #g is quadratic, or quadratic and flat either side of a breakpoint, so the log discount factor is a cubic on each interval or on each side of its breakpoint
+    t = np.asarray(year_fractions, dtype=float)
+    y = np.asarray(log_dfs, dtype=float)
+    h = np.diff(t)
+    discrete_forwards = -np.diff(y)/h
+    n = len(h)
+
+    #instantaneous forward rates at the known dates, interior ones weighting the neighbouring discrete forward rates by the opposite interval lengths
+    forwards = np.empty(n + 1)
+    if n == 1:
+        forwards[:] = discrete_forwards[0]
+    else:
+        forwards[1:-1] = (h[:-1]*discrete_forwards[1:] + h[1:]*discrete_forwards[:-1])/(h[:-1] + h[1:])
+        forwards[0] = discrete_forwards[0] - 0.5*(forwards[1] - discrete_forwards[0])
+        forwards[-1] = discrete_forwards[-1] - 0.5*(forwards[-2] - discrete_forwards[-1])
+
+    knots = []
+    coefficients = []
+    for i in range(n):
+        #each piece of g is given as (start x, p_0, p_1, p_2) with g(x) = p_0 + p_1*u + p_2*u^2 for u = x - start x
+        g_0 = forwards[i] - discrete_forwards[i]
+        g_1 = forwards[i+1] - discrete_forwards[i]
+        if g_0 == 0 and g_1 == 0:
+            pieces = [(0.0, 0.0, 0.0, 0.0)]
+        elif (g_0 < 0 and g_1 > -2*g_0) or (g_0 > 0 and g_1 < -2*g_0):
+            #flat then rising (or falling) to g_1
+            eta = (g_1 + 2*g_0)/(g_1 - g_0)
+            pieces = [(0.0, g_0, 0.0, 0.0), (eta, g_0, 0.0, (g_1 - g_0)/(1 - eta)**2)]
+        elif (g_0 > 0 and 0 > g_1 > -0.5*g_0) or (g_0 < 0 and 0 < g_1 < -0.5*g_0):
+            #moving from g_0 to g_1, then flat
+            eta = 3*g_1/(g_1 - g_0)
+            pieces = [(0.0, g_0, -2*(g_0 - g_1)/eta, (g_0 - g_1)/eta**2), (eta, g_1, 0.0, 0.0)]
+        elif (g_0 > 0 and g_1 > 0) or (g_0 < 0 and g_1 < 0):
+            #through a turning point A at the breakpoint
+            eta = g_1/(g_1 + g_0)
+            A = -g_0*g_1/(g_0 + g_1)
+            pieces = [(0.0, g_0, -2*(g_0 - A)/eta, (g_0 - A)/eta**2), (eta, A, 0.0, (g_1 - A)/(1 - eta)**2)]
+        else:
+            #quadratic through g_0 and g_1 with zero integral
+            pieces = [(0.0, g_0, -4*g_0 - 2*g_1, 3*g_0 + 3*g_1)]
+
+        #integrate the forward rate over each piece of positive length, f = discrete forward + g, scaling x to year fractions
+        ends = [piece[0] for piece in pieces[1:]] + [1.0]
+        log_df = y[i]
+        for (start, p_0, p_1, p_2), end in zip(pieces, ends):
+            if end <= start:
+                continue
+            knots.append(t[i] + start*h[i])
+            c_1 = -(discrete_forwards[i] + p_0)
+            c_2 = -p_1/(2*h[i])
+            c_3 = -p_2/(3*h[i]**2)
+            coefficients.append((log_df, c_1, c_2, c_3))
+            s = (end - start)*h[i]
+            log_df = log_df + s*(c_1 + s*(c_2 + s*c_3))
+    knots.append(t[-1])
+
+    c_0, c_1, c_2, c_3 = (np.array(column) for column in zip(*coefficients))
+    return PiecewiseCubic(np.array(knots), c_0, c_1, c_2, c_3, float(forwards[-1]))
+
+_INTERPOLATION_FITS = {
+    MONOTONE_CONVEX: fit_monotone_convex,
+    NATURAL_CUBIC: fit_natural_cubic,
+}
+
+def resolve_interpolation(interpolation: str):
+    #function resolving an interpolation method into its fitting function, None for the built-in log_linear method
+    if interpolation == LOG_LINEAR:
+        return None
+    try:
+        return _INTERPOLATION_FITS[interpolation]
+    except KeyError:
+        raise ValueError("This interpolation method is either not recognised or has not yet been implemented.") from None
@@ -0,0 +1,195 @@
+import os
+import sys
+import atexit
+import threading
+from types import FunctionType
+from time import perf_counter_ns
+from functools import wraps
+from contextlib import contextmanager
+from collections.abc import Callable
+
+#opt-in call counters, timers and cache statistics for the library's hot paths
+#instrumentation is off by default and then costs nothing, the original functions are called directly
+#enabling it swaps timing wrappers in for the instrumented functions (and methods) across the library's loaded modules, disabling it swaps the originals back
+#note references taken outside the library (e.g. from ... import year_fraction_computation in user code) are not swapped, calls through them are not counted
+#switch it on with the environment variable below (read once at import), enable()/disable(), or the instrumentation() context manager
+#timings are wall clock and inclusive, e.g. the time of solve_last_df includes the DiscountCurve.df calls it makes
+
+ENABLE_ENVIRONMENT_VARIABLE = "DERIVATIVE_VALUATIONS_INSTRUMENTATION"
+#if set, the Prometheus text is written to this file when the interpreter exits
+METRICS_FILE_ENVIRONMENT_VARIABLE = "DERIVATIVE_VALUATIONS_METRICS_FILE"
+
+_PACKAGE = "derivative_valuations"
+_METRIC_PREFIX = "derivative_valuations"
+
+_enabled = os.environ.get(ENABLE_ENVIRONMENT_VARIABLE, "").strip().lower() not in ("", "0", "false", "no", "off")
+_lock = threading.Lock()
+_swap_lock = threading.Lock()
+
+#timing wrapper of each instrumented function, and the reverse mapping
+_wrappers: dict[Callable, Callable] = {}
+_originals: dict[Callable, Callable] = {}
+
+#per function [call count, total nanoseconds, maximum nanoseconds], registered at decoration so every series is reported even before its first call
+_calls: dict[str, list[int]] = {}
+
+#per cache the cache_info function and the (hits, misses) at the last reset, so reported hits and misses cover the same window as the call counters
+_caches: dict[str, Callable] = {}
+_cache_baselines: dict[str, tuple[int, int]] = {}
+
+def _record(name: str, elapsed_ns: int):
+    #helper adding one timed call to the counters of a function
+    with _lock:
+        counters = _calls[name]
+        counters[0] += 1
+        counters[1] += elapsed_ns
+        if elapsed_ns > counters[2]:
+            counters[2] = elapsed_ns
+
+def _timed(function: Callable, name: str):
+    #helper returning a wrapper counting and timing calls to function under the given name
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+        start = perf_counter_ns()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            _record(name, perf_counter_ns() - start)
+    return wrapper
+
+def instrumented(name: str):
+    #decorator registering a function (or method) for instrumentation under the given name, functions sharing a name share counters
+    #the function itself is returned unless instrumentation is already enabled, in which case its timing wrapper is
+    _calls.setdefault(name, [0, 0, 0])
+
+    def decorator(function: Callable):
+        wrapper = _timed(function, name)
+        _wrappers[function] = wrapper
+        _originals[wrapper] = function
+        return wrapper if _enabled else function
+    return decorator
+
+def _swap(replacements: dict[Callable, Callable]):
+    #helper replacing every reference to a key of replacements by its value, in the globals of the library's loaded modules and in the library's classes
+    for module_name, module in list(sys.modules.items()):
+        if module is None or not (module_name == _PACKAGE or module_name.startswith(_PACKAGE + ".")):
+            continue
+        module_globals = vars(module)
+        updates = {}
+        for key, value in module_globals.items():
+            if isinstance(value, FunctionType) and value in replacements:
+                updates[key] = replacements[value]
+            elif isinstance(value, type) and value.__module__ == module_name:
+                for attribute, member in list(vars(value).items()):
+                    if isinstance(member, FunctionType) and member in replacements:
+                        setattr(value, attribute, replacements[member])
+        module_globals.update(updates)
+
+def register_cache(name: str, cache_info: Callable):
+    #function registering a cache for reporting, cache_info must return an object with hits, misses, maxsize and currsize (as functools.lru_cache's cache_info)
+    _caches[name] = cache_info
+    info = cache_info()
+    _cache_baselines[name] = (info.hits, info.misses)
+
+def enable():
+    #switch instrumentation on
+    global _enabled
+    with _swap_lock:
+        if not _enabled:
+            _swap(_wrappers)
+            _enabled = True
+
+def disable():
+    #switch instrumentation off, collected counters are kept until reset
+    global _enabled
+    with _swap_lock:
+        if _enabled:
+            _swap(_originals)
+            _enabled = False
+
+def is_enabled():
+    return _enabled
+
+def reset():
+    #zero every call counter and restart the cache hit/miss window
+    with _lock:
+        for counters in _calls.values():
+            counters[0] = counters[1] = counters[2] = 0
+        for name, cache_info in _caches.items():
+            info = cache_info()
+            _cache_baselines[name] = (info.hits, info.misses)
+
+@contextmanager
+def instrumentation(reset_counters: bool = True):
+    #context manager enabling instrumentation inside the with block, restoring the previous state on exit
+    #by default the counters are reset on entry, the collected statistics stay available through snapshot() after the block
+    previously_enabled = _enabled
+    if reset_counters:
+        reset()
+    enable()
+    try:
+        yield
+    finally:
+        if not previously_enabled:
+            disable()
+
+def snapshot():
+    #function returning the current statistics as a dictionary of plain Python values
+    with _lock:
+        calls = {name: tuple(counters) for name, counters in _calls.items()}
+    output = {"enabled": _enabled, "calls": {}, "caches": {}}
+    for name, (count, total_ns, max_ns) in calls.items():
+        output["calls"][name] = {
+            "count": count,
+            "total_seconds": total_ns/1e9,
+            "mean_seconds": total_ns/count/1e9 if count else 0.0,
+            "max_seconds": max_ns/1e9,
+        }
+    for name, cache_info in _caches.items():
+        info = cache_info()
+        baseline_hits, baseline_misses = _cache_baselines[name]
+        hits = info.hits - baseline_hits
+        misses = info.misses - baseline_misses
+
+        #clearing the cache also zeroes its statistics, fall back to the raw counts if they went backwards
+        if hits < 0 or misses < 0:
+            hits, misses = info.hits, info.misses
+        output["caches"][name] = {
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": hits/(hits + misses) if hits + misses else 0.0,
+            "size": info.currsize,
+            "max_size": info.maxsize,
+        }
+    return output
+
+def prometheus_text():
+    #function rendering the current statistics in the Prometheus text exposition format
+    statistics = snapshot()
+    metrics = [
+        ("calls_total", "counter", "Number of calls to the function.", "calls", "function", "count"),
+        ("call_seconds_total", "counter", "Total wall clock time spent in the function.", "calls", "function", "total_seconds"),
+        ("call_seconds_max", "gauge", "Longest single call to the function.", "calls", "function", "max_seconds"),
+        ("cache_hits_total", "counter", "Number of cache hits.", "caches", "cache", "hits"),
+        ("cache_misses_total", "counter", "Number of cache misses.", "caches", "cache", "misses"),
+        ("cache_hit_ratio", "gauge", "Share of cache lookups that were hits.", "caches", "cache", "hit_ratio"),
+        ("cache_size", "gauge", "Number of entries held in the cache.", "caches", "cache", "size"),
+    ]
+    lines = [f"# HELP {_METRIC_PREFIX}_instrumentation_enabled Whether instrumentation is switched on.", f"# TYPE {_METRIC_PREFIX}_instrumentation_enabled gauge", f"{_METRIC_PREFIX}_instrumentation_enabled {int(statistics['enabled'])}"]
+    for metric, metric_type, description, group, label, key in metrics:
+        lines.append(f"# HELP {_METRIC_PREFIX}_{metric} {description}")
+        lines.append(f"# TYPE {_METRIC_PREFIX}_{metric} {metric_type}")
+        for name, values in statistics[group].items():
+            lines.append(f'{_METRIC_PREFIX}_{metric}{{{label}="{name}"}} {values[key]!r}')
+    return "\n".join(lines) + "\n"
+
+def write_prometheus(path: str | os.PathLike):
+    #function writing the Prometheus text to a file, e.g. for the node_exporter textfile collector
+    #the text is written to a temporary file first and moved into place so a scrape never reads a partial file
+    temporary_path = f"{os.fspath(path)}.tmp"
+    with open(temporary_path, "w") as file:
+        file.write(prometheus_text())
+    os.replace(temporary_path, path)
+
+if os.environ.get(METRICS_FILE_ENVIRONMENT_VARIABLE):
+    atexit.register(write_prometheus, os.environ[METRICS_FILE_ENVIRONMENT_VARIABLE])
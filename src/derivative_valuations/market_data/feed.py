@@ -0,0 +1,183 @@
+import asyncio
+import inspect
+from time import perf_counter
+from datetime import date
+from collections import deque
+from collections.abc import AsyncIterable, Callable
+from typing import NamedTuple
+import numpy as np
+from derivative_valuations.curve_bootstrapping.financial_instruments import DepositQuote, FixedForFloatingSwapQuote
+from derivative_valuations.curve_bootstrapping.bootstrapping import IncrementalBootstrapper
+from derivative_valuations.df_curve.discount_factor import DiscountCurve
+from derivative_valuations.valuation.present_value import pv_many
+from derivative_valuations.market_data.quotes import normalise_quote
+
+#live curve feed, consuming quotes from any number of asynchronous sources (see market_data/sources.py), rebuilding the curve and repricing a portfolio as they change
+#bursts of quotes are coalesced into one rebuild, rebuilds are rate limited, and each rebuild runs in a worker thread so the event loop keeps receiving quotes
+#curves are rebuilt with an IncrementalBootstrapper, so a tick to one swap quote only re-solves the pillars from that swap onwards
+
+class PricingUpdate(NamedTuple):
+#result of one rebuild, the curve, the present value of every trade of the portfolio and the timings of the quotes it includes
+#times are time.perf_counter values, latency is the time from the arrival of the earliest quote included to publication
+    curve: DiscountCurve
+    trade_ids: np.ndarray
+    pvs: np.ndarray
+    quote_count: int
+    first_arrival: float
+    published: float
+    latency: float
+
+class LiveCurveFeed:
+#class running the feed for one valuation date and curve convention
+#portfolio is an optional tuple of columnar cashflows (payment dates, amounts, trade ids) as for pv_many
+#coalesce_seconds is how long a rebuild waits after the first quote of a burst for the rest of it, min_rebuild_interval the minimum number of seconds between the starts of two rebuilds
+#on_update is called (or awaited, if a coroutine function) with each PricingUpdate
+    def __init__(self, valuation_date: date, convention: str, sources: list[AsyncIterable], portfolio: tuple[np.ndarray, np.ndarray, np.ndarray] | None = None, coalesce_seconds: float = 0.05, min_rebuild_interval: float = 0.0, on_update: Callable | None = None, latency_window: int = 10000):
+        if coalesce_seconds < 0 or min_rebuild_interval < 0:
+            raise ValueError("Coalescing and rate limit intervals must not be less than 0.")
+        self.valuation_date = valuation_date
+        self.convention = convention
+        self.sources = list(sources)
+        self.portfolio = portfolio
+        self.coalesce_seconds = coalesce_seconds
+        self.min_rebuild_interval = min_rebuild_interval
+        self.on_update = on_update
+
+        #latest quote per instrument id and the quotes received since the last rebuild
+        self.quotes: dict[str, DepositQuote | FixedForFloatingSwapQuote] = {}
+        self._pending_count = 0
+        self._pending_since: float | None = None
+        self._bootstrapper = IncrementalBootstrapper(valuation_date, convention)
+        self.latest_update: PricingUpdate | None = None
+
+        #counters and the latencies of the most recent rebuilds
+        self.quotes_received = 0
+        self.quotes_rejected = 0
+        self.source_errors = 0
+        self.rebuilds = 0
+        self.failed_rebuilds = 0
+        self.last_error: Exception | None = None
+        self._latencies: deque[float] = deque(maxlen=latency_window)
+        self._last_rebuild_start = float("-inf")
+
+        self._changed: asyncio.Event | None = None
+        self._idle: asyncio.Event | None = None
+        self._stop: asyncio.Event | None = None
+
+    async def _consume(self, source: AsyncIterable):
+        #task reading one source, normalising each message and marking the curve for rebuilding
+        try:
+            async for message in source:
+                arrival = perf_counter()
+                self.quotes_received += 1
+                try:
+                    quote_id, quote = normalise_quote(message)
+                except ValueError as error:
+                    self.quotes_rejected += 1
+                    self.last_error = error
+                    continue
+                self.quotes[quote_id] = quote
+                if self._pending_since is None:
+                    self._pending_since = arrival
+                self._pending_count += 1
+                self._idle.clear()
+                self._changed.set()
+        except Exception as error:
+            #a failing source ends without stopping the others
+            self.source_errors += 1
+            self.last_error = error
+
+    def _rebuild(self, deposit_quotes: list[DepositQuote], swap_quotes: list[FixedForFloatingSwapQuote]):
+        #helper bootstrapping and repricing, run in a worker thread
+        curve = self._bootstrapper.bootstrap(deposit_quotes, swap_quotes)
+        if self.portfolio is None:
+            return curve, np.zeros(0), np.zeros(0)
+        trade_ids, pvs = pv_many(*self.portfolio, curve)
+        return curve, trade_ids, pvs
+
+    async def _rebuild_loop(self):
+        #task rebuilding the curve whenever quotes changed, coalescing bursts and respecting the rate limit
+        while True:
+            if not self._changed.is_set():
+                self._idle.set()
+            await self._changed.wait()
+            self._idle.clear()
+
+            #let the rest of a burst arrive, then wait out the rate limit
+            await asyncio.sleep(self.coalesce_seconds)
+            await asyncio.sleep(max(0.0, self._last_rebuild_start + self.min_rebuild_interval - perf_counter()))
+
+            self._changed.clear()
+            deposit_quotes = [quote for quote in self.quotes.values() if isinstance(quote, DepositQuote)]
+            swap_quotes = [quote for quote in self.quotes.values() if isinstance(quote, FixedForFloatingSwapQuote)]
+            if not deposit_quotes:
+                #no curve can be built until a deposit arrives, the pending quotes stay pending
+                continue
+            quote_count, first_arrival = self._pending_count, self._pending_since
+            self._pending_count, self._pending_since = 0, None
+
+            self._last_rebuild_start = perf_counter()
+            try:
+                curve, trade_ids, pvs = await asyncio.to_thread(self._rebuild, deposit_quotes, swap_quotes)
+            except Exception as error:
+                self.failed_rebuilds += 1
+                self.last_error = error
+                continue
+            published = perf_counter()
+            self.rebuilds += 1
+            self._latencies.append(published - first_arrival)
+            self.latest_update = PricingUpdate(curve, trade_ids, pvs, quote_count, first_arrival, published, published - first_arrival)
+            if self.on_update is not None:
+                result = self.on_update(self.latest_update)
+                if inspect.isawaitable(result):
+                    await result
+
+    def stop(self):
+        #ask a running feed to stop
+        if self._stop is not None:
+            self._stop.set()
+
+    async def run(self):
+        #coroutine running the feed until stop is called or every source has ended, in which case the quotes received are rebuilt first
+        self._changed = asyncio.Event()
+        self._idle = asyncio.Event()
+        self._stop = asyncio.Event()
+        source_tasks = [asyncio.create_task(self._consume(source)) for source in self.sources]
+        sources_done = asyncio.gather(*source_tasks)
+        rebuild_task = asyncio.create_task(self._rebuild_loop())
+        stop_task = asyncio.create_task(self._stop.wait())
+        idle_task = None
+        try:
+            await asyncio.wait([sources_done, stop_task, rebuild_task], return_when=asyncio.FIRST_COMPLETED)
+            if sources_done.done() and not self._stop.is_set():
+                #the rebuild loop is idle once it waits with no quotes pending
+                idle_task = asyncio.create_task(self._idle.wait())
+                await asyncio.wait([idle_task, stop_task, rebuild_task], return_when=asyncio.FIRST_COMPLETED)
+            if rebuild_task.done():
+                rebuild_task.result()
+        finally:
+            tasks = [task for task in (sources_done, rebuild_task, stop_task, idle_task) if task is not None]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def metrics(self):
+        #function returning the feed counters and a summary of the latency from quote arrival to published present values, in seconds
+        latencies = np.array(self._latencies, dtype=float)
+        latency = {"count": len(latencies)}
+        if len(latencies):
+            latency.update({
+                "mean": float(latencies.mean()),
+                "p50": float(np.percentile(latencies, 50)),
+                "p95": float(np.percentile(latencies, 95)),
+                "p99": float(np.percentile(latencies, 99)),
+                "max": float(latencies.max()),
+            })
+        return {
+            "quotes_received": self.quotes_received,
+            "quotes_rejected": self.quotes_rejected,
+            "source_errors": self.source_errors,
+            "rebuilds": self.rebuilds,
+            "failed_rebuilds": self.failed_rebuilds,
+            "latency_seconds": latency,
+        }
@@ -0,0 +1,36 @@
+from datetime import date
+from derivative_valuations.curve_bootstrapping.financial_instruments import DepositQuote, FixedForFloatingSwapQuote
+
+#normalisation of market data messages into the quote classes used for bootstrapping
+#a message is a dictionary (e.g. decoded JSON) with a type and the terms of the quote, dates are ISO formatted (YYYY-MM-DD) and rates are decimals unless rate_unit is "percent":
+#   {"type": "deposit", "start_date": ..., "end_date": ..., "rate": ..., "convention": ...}
+#   {"type": "swap", "effective_date": ..., "maturity_date": ..., "fixed_rate": ..., "fixed_frequency_months": ..., "fixed_convention": ..., "float_frequency_months": ..., "float_convention": ...}
+#an optional id names the instrument quoted, by default a deposit is identified by its dates and a swap by its dates and fixed leg
+#a later message with the same id replaces the earlier quote
+
+_RATE_SCALES = {"decimal": 1.0, "percent": 0.01}
+
+def _rate(message: dict, field: str):
+    #helper reading a rate from a message as a decimal
+    rate_unit = message.get("rate_unit", "decimal")
+    if rate_unit not in _RATE_SCALES:
+        raise ValueError("Rate unit must be either decimal or percent.")
+    return float(message[field])*_RATE_SCALES[rate_unit]
+
+def normalise_quote(message: dict):
+    #function converting a market data message into an (id, quote) pair, with the quote a DepositQuote or FixedForFloatingSwapQuote
+    try:
+        quote_type = message["type"]
+        if quote_type == "deposit":
+            quote = DepositQuote(date.fromisoformat(message["start_date"]), date.fromisoformat(message["end_date"]), _rate(message, "rate"), message["convention"])
+            quote_id = message.get("id", f"deposit:{quote.start_date.isoformat()}:{quote.end_date.isoformat()}")
+        elif quote_type == "swap":
+            quote = FixedForFloatingSwapQuote(date.fromisoformat(message["effective_date"]), date.fromisoformat(message["maturity_date"]), _rate(message, "fixed_rate"), int(message["fixed_frequency_months"]), message["fixed_convention"], int(message["float_frequency_months"]), message["float_convention"])
+            quote_id = message.get("id", f"swap:{quote.effective_date.isoformat()}:{quote.maturity_date.isoformat()}:{quote.fixed_frequency_months}:{quote.fixed_convention}")
+        else:
+            raise ValueError("Quote type must be either deposit or swap.")
+    except KeyError:
+        raise ValueError("The market data message is missing required fields!") from None
+    except TypeError:
+        raise ValueError("The market data message is not in the expected format!") from None
+    return str(quote_id), quote
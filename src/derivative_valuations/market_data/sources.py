@@ -0,0 +1,141 @@
+import json
+import asyncio
+import urllib.request
+from pathlib import Path
+from collections.abc import Callable
+
+#asynchronous market data sources, each is an async iterable of messages (dictionaries, see market_data/quotes.py) that can be plugged into a LiveCurveFeed
+#blocking work (HTTP requests, file reads) runs in worker threads so the event loop is never blocked
+
+def _messages_from_payload(payload):
+    #helper accepting a list of messages or an object holding them under "quotes"
+    if isinstance(payload, dict):
+        payload = payload.get("quotes", [payload])
+    if not isinstance(payload, list):
+        raise ValueError("The market data payload is not in the expected format!")
+    return payload
+
+def parse_json_messages(body: bytes):
+    #default parser of HTTP responses, a JSON list of messages or an object with a list under "quotes"
+    return _messages_from_payload(json.loads(body))
+
+class HttpPollingSource:
+#source polling an HTTP endpoint every interval seconds, yielding only the messages that changed since the previous poll
+#parser converts a response body into a list of messages, e.g. to adapt a provider's format such as the Bank of England's yield curve data
+#failed requests are counted and retried at the next poll rather than ending the feed
+    def __init__(self, url: str, interval: float = 1.0, timeout: float = 5.0, parser: Callable[[bytes], list[dict]] = parse_json_messages):
+        if interval <= 0:
+            raise ValueError("The polling interval must be greater than 0.")
+        self.url = url
+        self.interval = interval
+        self.timeout = timeout
+        self.parser = parser
+        self.poll_count = 0
+        self.error_count = 0
+        self.last_error: Exception | None = None
+
+    def _fetch(self):
+        #helper making one blocking request, run in a worker thread
+        with urllib.request.urlopen(self.url, timeout=self.timeout) as response:
+            return response.read()
+
+    async def __aiter__(self):
+        previous_messages = set()
+        while True:
+            try:
+                messages = self.parser(await asyncio.to_thread(self._fetch))
+            except Exception as error:
+                self.error_count += 1
+                self.last_error = error
+                messages = None
+            self.poll_count += 1
+
+            if messages is not None:
+                #unchanged messages are not passed on again, so an idle market does not trigger rebuilds
+                encoded_messages = [json.dumps(message, sort_keys=True) for message in messages]
+                for message, encoded_message in zip(messages, encoded_messages):
+                    if encoded_message not in previous_messages:
+                        yield message
+                previous_messages = set(encoded_messages)
+            await asyncio.sleep(self.interval)
+
+class FileTailSource:
+#source following a file of JSON messages, one per line, yielding each line as it is appended
+#by default the lines already in the file are read first, partially written lines are held back until complete
+#lines that are not valid JSON are passed on as text, for the feed to reject
+    def __init__(self, path: str, poll_interval: float = 0.1, from_start: bool = True):
+        if poll_interval <= 0:
+            raise ValueError("The polling interval must be greater than 0.")
+        self.path = Path(path)
+        self.poll_interval = poll_interval
+        self.from_start = from_start
+        self._position = None
+        self._partial_line = b""
+
+    def _read_lines(self):
+        #helper reading the complete lines appended since the last read, run in a worker thread
+        if not self.path.exists():
+            return []
+        with open(self.path, "rb") as file:
+            if self._position is None:
+                self._position = 0 if self.from_start else file.seek(0, 2)
+            file.seek(self._position)
+            data = self._partial_line + file.read()
+            self._position = file.tell()
+        *lines, self._partial_line = data.split(b"\n")
+        return [line for line in lines if line.strip()]
+
+    async def __aiter__(self):
+        while True:
+            for line in await asyncio.to_thread(self._read_lines):
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    yield line.decode(errors="replace")
+            await asyncio.sleep(self.poll_interval)
+
+class LocalQuoteServer:
+#minimal local HTTP server standing in for a market data provider in tests and demos
+#every GET request is answered with the current messages as a JSON list, which can be replaced at any time with set_messages
+    def __init__(self, messages: list[dict] | None = None, host: str = "127.0.0.1", port: int = 0):
+        self.host = host
+        self.port = port
+        self.messages = list(messages or [])
+        self.request_count = 0
+        self._server: asyncio.Server | None = None
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}/quotes"
+
+    def set_messages(self, messages: list[dict]):
+        self.messages = list(messages)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        #read the request head, the body of a GET request is ignored
+        try:
+            while (await reader.readline()).strip():
+                pass
+            body = json.dumps(self.messages).encode()
+            self.request_count += 1
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\nContent-Length: " + str(len(body)).encode() + b"\r\nConnection: close\r\n\r\n" + body)
+            await writer.drain()
+        finally:
+            writer.close()
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
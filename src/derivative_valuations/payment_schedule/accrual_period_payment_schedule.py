@@ -1,34 +1,111 @@
 from datetime import date
-from dateutil.relativedelta import relativedelta
+from functools import lru_cache
+from collections.abc import Sequence
+from derivative_valuations.instrumentation.metrics import instrumented, register_cache
+from derivative_valuations.payment_schedule.calendars import HolidayCalendar, MODIFIED_FOLLOWING, resolve_calendar
 
-def generate_schedule(start_date: date, end_date: date, frequency: int):
-    #takes frequency as the number of months between payments to determine accrual periods and payment dates, outputting a list of 3-tuples (accrual start, accrual end and payment date)
-    schedule = []
+#maximum number of distinct (start date, end date, frequency) schedules held in the schedule cache
+SCHEDULE_CACHE_SIZE = 65536
 
-    #validation checks
+_DAYS_IN_MONTH = (31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+def _days_in_month(year: int, month: int):
+    #helper returning the number of days in a month, accounting for leap years
+    if month == 2 and year % 4 == 0 and (year % 100 != 0 or year % 400 == 0):
+        return 29
+    return _DAYS_IN_MONTH[month-1]
+
+def add_months(d: date, months: int):
+    #function adding a number of months to a date using integer month arithmetic, equivalent to d + relativedelta(months=months)
+    #the day is clipped to the last day of the resulting month where needed, e.g. 31/01 + 1 month is 28/02 (or 29/02)
+    year, month_index = divmod(d.year*12 + d.month - 1 + months, 12)
+    month = month_index + 1
+    day = d.day
+    if day > 28:
+        day = min(day, _days_in_month(year, month))
+    return date(year, month, day)
+
+def _months_between(start_date: date, end_date: date):
+    #helper returning the number of whole months from start_date to a later end_date, equivalent to relativedelta(end_date, start_date) in months
+    months = (end_date.year - start_date.year)*12 + (end_date.month - start_date.month)
+    while add_months(start_date, months) > end_date:
+        months -= 1
+    return months
+
+def _validate_schedule_inputs(start_date: date, end_date: date, frequency: int):
+    #helper holding the validation checks for a schedule between start_date and end_date with payments every frequency months
     if end_date <= start_date:
         raise ValueError("End date must be after start date!")
     if frequency <= 0:
         raise ValueError("Payment frequency must be greater than 0.")
-    delta = relativedelta(end_date,start_date)
-    if (delta.years*12)+delta.months < frequency:
+    if _months_between(start_date, end_date) < frequency:
         raise ValueError("The frequency of payments cannot be greater than the number of months between the start date and the end date.")
 
+@instrumented("generate_schedule")
+def _build_schedule(start_date: date, end_date: date, frequency: int, calendar: HolidayCalendar | str | None, business_day_convention: str):
+    #helper building the schedule held by cached_schedule, instrumented here as every library path goes through cached_schedule, so the counter and timer cover each schedule actually built (the cache misses)
+    schedule = []
+
+    #validation checks
+    _validate_schedule_inputs(start_date, end_date, frequency)
+
+    #payment dates are the period end dates moved by the calendar's adjustments of non-business days, every period end lies between the start date and end date so one range check covers them all
+    adjustments = {}
+    if calendar is not None:
+        calendar = resolve_calendar(calendar)
+        if start_date.toordinal() < calendar.first_ordinal or end_date.toordinal() > calendar.last_ordinal:
+            raise ValueError("Date is outside the range of the calendar!")
+        adjustments = calendar.adjustments(business_day_convention)
+
     #run a while loop until period end date surpasses or equals the end date, then break and consider stub period
-    #timedelta = end_date - start_date
-    #n = math.ceil(timedelta.months/frequency)
     period_start = start_date
-    period_end = period_start + relativedelta(months=frequency)
+    period_end = add_months(period_start, frequency)
     while period_end < end_date:
-
-        #to do, payment date computation taking into consideration bank holidays etc.
-        payment_date = period_end
+        payment_date = adjustments.get(period_end, period_end)
 
         schedule.append((period_start, period_end, payment_date))
         period_start = period_end
-        period_end = period_start + relativedelta(months=frequency)
+        period_end = add_months(period_start, frequency)
 
-    #stub period, again needs modification for payment date
+    #stub period
     if period_start != end_date:
-        schedule.append((period_start, end_date, end_date))
-    return schedule
\ No newline at end of file
+        schedule.append((period_start, end_date, adjustments.get(end_date, end_date)))
+    return tuple(schedule)
+
+@lru_cache(maxsize=SCHEDULE_CACHE_SIZE)
+def cached_schedule(start_date: date, end_date: date, frequency: int, calendar: HolidayCalendar | str | None = None, business_day_convention: str = MODIFIED_FOLLOWING):
+    #cached counterpart of generate_schedule, outputting the schedule as an immutable tuple of 3-tuples (accrual start, accrual end and payment date)
+    #repeat calls with the same start date, end date, frequency and calendar return the same tuple without rebuilding it
+    #with a calendar (or calendar name, see resolve_calendar) payment dates are the accrual end dates adjusted to business days by the business day convention, accrual dates are not adjusted
+    return _build_schedule(start_date, end_date, frequency, calendar, business_day_convention)
+
+def generate_schedule(start_date: date, end_date: date, frequency: int, calendar: HolidayCalendar | str | None = None, business_day_convention: str = MODIFIED_FOLLOWING):
+    #takes frequency as the number of months between payments to determine accrual periods and payment dates, outputting a list of 3-tuples (accrual start, accrual end and payment date)
+    #payment dates equal the accrual end dates unless a calendar is given, see cached_schedule
+    #the schedule is built once and cached, see cached_schedule
+    if calendar is None:
+        return list(cached_schedule(start_date, end_date, frequency))
+    return list(cached_schedule(start_date, end_date, frequency, calendar, business_day_convention))
+
+def generate_schedules(start_dates: Sequence[date], end_dates: Sequence[date], frequencies: Sequence[int], calendar: HolidayCalendar | str | None = None, business_day_convention: str = MODIFIED_FOLLOWING):
+    #batch counterpart of cached_schedule, outputting one immutable schedule per instrument
+    #instruments sharing a start date, end date and frequency share the same schedule, which is only built once
+    if not len(start_dates) == len(end_dates) == len(frequencies):
+        raise ValueError("Each schedule must have a start date, an end date and a frequency!")
+    adjustment = () if calendar is None else (resolve_calendar(calendar), business_day_convention)
+    schedules = {}
+    for key in zip(start_dates, end_dates, frequencies):
+        if key not in schedules:
+            schedules[key] = cached_schedule(*key, *adjustment)
+    return [schedules[key] for key in zip(start_dates, end_dates, frequencies)]
+
+#report the schedule cache hit/miss statistics alongside the call counters
+register_cache("schedule", cached_schedule.cache_info)
+
+def schedule_cache_info():
+    #function returning the hit/miss statistics of the schedule cache
+    return cached_schedule.cache_info()
+
+def clear_schedule_cache():
+    #function emptying the schedule cache
+    cached_schedule.cache_clear()
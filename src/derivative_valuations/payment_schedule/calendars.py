@@ -0,0 +1,199 @@
+from datetime import date, timedelta
+from collections.abc import Iterable, Sequence
+import numpy as np
+from derivative_valuations.daycount_conventions.daycount import to_ordinals, _year_month_day
+
+#holiday calendars for adjusting payment dates to business days
+#each calendar is built once, over a fixed range of years, into dense arrays indexed by date ordinal: whether each day is a business day, and the date each business day convention moves it to
+#so adjusting a date is one array lookup, and adjusting a whole array of dates is one numpy indexing operation
+
+FOLLOWING = "following"
+MODIFIED_FOLLOWING = "modified_following"
+PRECEDING = "preceding"
+
+#weekdays as in date.weekday(), Saturday and Sunday
+WEEKEND = (5, 6)
+
+#days either side of a calendar's range also flagged, so dates near the ends of the range can be adjusted
+_PADDING_DAYS = 31
+
+class HolidayCalendar:
+#class for a business day calendar built from a list of holidays and the weekend days, valid for dates from 01/01 of first_year to 31/12 of last_year
+#days within a month either side of the range are treated as business days unless they are weekend days or listed holidays
+    def __init__(self, name: str, holidays: Iterable[date], first_year: int = 1970, last_year: int = 2100, weekend: Sequence[int] = WEEKEND):
+        #validation checks
+        if last_year < first_year:
+            raise ValueError("The last year of the calendar cannot be before the first year!")
+
+        self.name = name
+        self.first_year = first_year
+        self.last_year = last_year
+        self.weekend = tuple(weekend)
+        self.first_ordinal = date(first_year,1,1).toordinal()
+        self.last_ordinal = date(last_year,12,31).toordinal()
+        self.holidays = frozenset(holiday for holiday in holidays if self.first_ordinal <= holiday.toordinal() <= self.last_ordinal)
+
+        #business day flags of every day in the range and a month either side, date.fromordinal(1) is a Monday
+        padded_first_ordinal = self.first_ordinal - _PADDING_DAYS
+        ordinals = np.arange(padded_first_ordinal, self.last_ordinal + _PADDING_DAYS + 1, dtype=np.int64)
+        business_days = ~np.isin((ordinals - 1) % 7, self.weekend)
+        if self.holidays:
+            business_days[to_ordinals(sorted(self.holidays)) - padded_first_ordinal] = False
+
+        #next and previous business day of every day, found by running minima/maxima over the business day ordinals
+        following = np.minimum.accumulate(np.where(business_days, ordinals, np.iinfo(np.int64).max)[::-1])[::-1]
+        preceding = np.maximum.accumulate(np.where(business_days, ordinals, -1))
+
+        #modified following moves to the previous business day where the following one is in the next month
+        _, months, _ = _year_month_day(ordinals)
+        _, following_months, _ = _year_month_day(np.minimum(following, ordinals[-1]))
+        modified_following = np.where(following_months != months, preceding, following)
+
+        #keep the range itself, where the padding guarantees a business day either side
+        in_range = slice(_PADDING_DAYS, len(ordinals) - _PADDING_DAYS)
+        self.business_days = business_days[in_range]
+        self._adjusted = {FOLLOWING: following[in_range], MODIFIED_FOLLOWING: modified_following[in_range], PRECEDING: preceding[in_range]}
+        for adjusted_ordinals in self._adjusted.values():
+            if adjusted_ordinals.min() < padded_first_ordinal or adjusted_ordinals.max() > ordinals[-1]:
+                raise ValueError("Every day of the calendar must be within a month of a business day!")
+        self._adjustments: dict[str, dict[date, date]] = {}
+
+    def __repr__(self):
+        return f"HolidayCalendar({self.name!r}, {self.first_year}-{self.last_year})"
+
+    def _table(self, business_day_convention: str):
+        #helper looking up the adjusted ordinals of a business day convention in the dispatch table
+        try:
+            return self._adjusted[business_day_convention]
+        except KeyError:
+            raise ValueError("This business day convention is either not recognised or has not yet been implemented.") from None
+
+    def adjustments(self, business_day_convention: str = MODIFIED_FOLLOWING):
+        #method returning a dictionary of every non-business day in the range -> its adjusted date, business days being left unchanged
+        #built once per business day convention, for adjusting dates one at a time with adjustments.get(d, d)
+        if business_day_convention not in self._adjustments:
+            table = self._table(business_day_convention)
+            non_business_days = np.flatnonzero(~self.business_days)
+            self._adjustments[business_day_convention] = {date.fromordinal(self.first_ordinal + i): date.fromordinal(ordinal) for i, ordinal in zip(non_business_days.tolist(), table[non_business_days].tolist())}
+        return self._adjustments[business_day_convention]
+
+    def _index(self, ordinal: int):
+        #helper returning the position of a date ordinal in the calendar arrays
+        if not self.first_ordinal <= ordinal <= self.last_ordinal:
+            raise ValueError("Date is outside the range of the calendar!")
+        return ordinal - self.first_ordinal
+
+    def is_business_day(self, d: date):
+        return bool(self.business_days[self._index(d.toordinal())])
+
+    def adjust(self, d: date, business_day_convention: str = MODIFIED_FOLLOWING):
+        #method moving a date to a business day according to the business day convention, business days are unchanged
+        self._index(d.toordinal())
+        return self.adjustments(business_day_convention).get(d, d)
+
+    def adjust_ordinals(self, dates: Sequence[date] | np.ndarray, business_day_convention: str = MODIFIED_FOLLOWING):
+        #vectorised counterpart of adjust, taking a sequence of dates or a numpy integer array of date ordinals and returning a numpy array of adjusted date ordinals
+        ordinals = to_ordinals(dates)
+        table = self._table(business_day_convention)
+        if len(ordinals) and (ordinals.min() < self.first_ordinal or ordinals.max() > self.last_ordinal):
+            raise ValueError("Date is outside the range of the calendar!")
+        return table[ordinals - self.first_ordinal]
+
+    def business_days_between(self, start_date: date, end_date: date):
+        #method counting the business days d with start_date <= d < end_date
+        if end_date < start_date:
+            raise ValueError("End date must be after start date!")
+        return int(np.count_nonzero(self.business_days[self._index(start_date.toordinal()):self._index(end_date.toordinal())]))
+
+    def with_holidays(self, name: str, holidays: Iterable[date]):
+        #method returning a new calendar with additional holidays, e.g. one-off closures
+        return HolidayCalendar(name, self.holidays | set(holidays), self.first_year, self.last_year, self.weekend)
+
+def easter_sunday(year: int):
+    #function returning the date of Easter Sunday in the Gregorian calendar (anonymous Gregorian algorithm)
+    a = year % 19
+    b, c = divmod(year, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8)//25
+    g = (b - f + 1)//3
+    h = (19*a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2*e + 2*i - h - k) % 7
+    m = (a + 11*h + 22*l)//451
+    month, day = divmod(h + l - 7*m + 114, 31)
+    return date(year, month, day + 1)
+
+def _first_weekday(year: int, month: int, weekday: int):
+    #helper returning the first given weekday of a month
+    first = date(year, month, 1)
+    return first + timedelta(days=(weekday - first.weekday()) % 7)
+
+def _last_weekday(year: int, month: int, weekday: int):
+    #helper returning the last given weekday of a month
+    last = date(year + month//12, month % 12 + 1, 1) - timedelta(days=1)
+    return last - timedelta(days=(last.weekday() - weekday) % 7)
+
+#one-off bank holidays in England and Wales, and regular bank holidays that were moved in those years
+_LONDON_SPECIAL_HOLIDAYS = (date(1977,6,7), date(1981,7,29), date(1999,12,31), date(2002,6,3), date(2011,4,29), date(2012,6,5), date(2022,6,3), date(2022,9,19), date(2023,5,8))
+_LONDON_EARLY_MAY_EXCEPTIONS = {1995: date(1995,5,8), 2020: date(2020,5,8)}
+_LONDON_SPRING_EXCEPTIONS = {1977: date(1977,6,6), 2002: date(2002,6,4), 2012: date(2012,6,4), 2022: date(2022,6,2)}
+
+def london_holidays(first_year: int, last_year: int):
+    #function returning the bank holidays of England and Wales between two years, weekend holidays being substituted by the following weekday(s)
+    holidays = [holiday for holiday in _LONDON_SPECIAL_HOLIDAYS if first_year <= holiday.year <= last_year]
+    for year in range(first_year, last_year + 1):
+        new_year = date(year,1,1)
+        holidays.append(new_year + timedelta(days=7 - new_year.weekday() if new_year.weekday() >= 5 else 0))
+        easter = easter_sunday(year)
+        holidays.extend((easter - timedelta(days=2), easter + timedelta(days=1)))
+        if year >= 1978:
+            holidays.append(_LONDON_EARLY_MAY_EXCEPTIONS.get(year, _first_weekday(year, 5, 0)))
+        holidays.append(_LONDON_SPRING_EXCEPTIONS.get(year, _last_weekday(year, 5, 0)))
+        holidays.append(_last_weekday(year, 8, 0))
+
+        #Christmas Day and Boxing Day, each moving to the next weekday not already a holiday if it falls on a weekend
+        christmas_holidays = []
+        for holiday in (date(year,12,25), date(year,12,26)):
+            while holiday.weekday() >= 5 or holiday in christmas_holidays:
+                holiday = holiday + timedelta(days=1)
+            christmas_holidays.append(holiday)
+        holidays.extend(christmas_holidays)
+    return holidays
+
+def target_holidays(first_year: int, last_year: int):
+    #function returning the TARGET (euro settlement) closing days between two years, from 1999
+    holidays = []
+    for year in range(max(first_year, 1999), last_year + 1):
+        holidays.extend((date(year,1,1), date(year,12,25), date(year,12,26)))
+        if year >= 2000:
+            easter = easter_sunday(year)
+            holidays.extend((easter - timedelta(days=2), easter + timedelta(days=1), date(year,5,1)))
+        if year in (1999, 2001):
+            holidays.append(date(year,12,31))
+    return holidays
+
+#built-in calendars, as (holiday function, first year, last year), built on first use
+_CALENDAR_RULES = {
+    "London": (london_holidays, 1970, 2100),
+    "TARGET": (target_holidays, 1999, 2100),
+}
+_CALENDARS: dict[str, HolidayCalendar] = {}
+
+def register_calendar(calendar: HolidayCalendar):
+    #function adding a calendar, e.g. one built from a user-supplied holiday list, so it can be resolved by name
+    #names cannot be reused, as schedules adjusted with a calendar given by name are cached under the name
+    if calendar.name in _CALENDARS or calendar.name in _CALENDAR_RULES:
+        raise ValueError("A calendar with this name is already registered!")
+    _CALENDARS[calendar.name] = calendar
+    return calendar
+
+def resolve_calendar(calendar: HolidayCalendar | str):
+    #function resolving a calendar name into its calendar, building a built-in calendar the first time it is needed, calendars are returned unchanged
+    if isinstance(calendar, HolidayCalendar):
+        return calendar
+    if calendar not in _CALENDARS:
+        if calendar not in _CALENDAR_RULES:
+            raise ValueError("This calendar is either not recognised or has not yet been registered.")
+        holiday_function, first_year, last_year = _CALENDAR_RULES[calendar]
+        _CALENDARS[calendar] = HolidayCalendar(calendar, holiday_function(first_year, last_year), first_year, last_year)
+    return _CALENDARS[calendar]
@@ -0,0 +1,70 @@
+import os
+import json
+import struct
+from pathlib import Path
+import numpy as np
+
+#binary columnar file layout shared by the on-disk stores
+#a fixed header (8 byte magic, uint32 format version, uint32 reserved, uint64 length of the JSON table of contents), the JSON table of contents, then each array
+#arrays are fixed-width, little-endian and aligned to ALIGNMENT bytes, so they can be memory-mapped and used in place without copying or parsing
+
+ALIGNMENT = 64
+_HEADER = struct.Struct("<8sIIQ")
+_OFFSET_PLACEHOLDER = 2**63 - 1
+
+def _aligned(offset: int):
+    #helper rounding an offset up to the next multiple of ALIGNMENT
+    return -(-offset // ALIGNMENT)*ALIGNMENT
+
+def write_arrays(path: str | os.PathLike, magic: bytes, version: int, arrays: dict[str, np.ndarray], metadata: dict):
+    #function writing named numpy arrays and a JSON-serialisable metadata dictionary to a columnar file
+    #the file is written to a temporary path first and moved into place, so readers never see a partial file
+    if len(magic) != 8:
+        raise ValueError("The magic number must be 8 bytes.")
+
+    #fixed-width little-endian copies of the arrays, object arrays cannot be stored
+    arrays = {name: np.ascontiguousarray(array, dtype=np.asarray(array).dtype.newbyteorder("<")) for name, array in arrays.items()}
+    if any(array.dtype.hasobject for array in arrays.values()):
+        raise ValueError("Arrays must have a fixed-width dtype.")
+
+    #lay out the arrays after the table of contents, sized with placeholder offsets at least as wide as any real offset
+    contents = {"metadata": metadata, "arrays": {name: {"dtype": array.dtype.str, "shape": list(array.shape), "offset": _OFFSET_PLACEHOLDER} for name, array in arrays.items()}}
+    offset = _aligned(_HEADER.size + len(json.dumps(contents).encode()))
+    for name, array in arrays.items():
+        contents["arrays"][name]["offset"] = offset
+        offset = _aligned(offset + array.nbytes)
+    encoded_contents = json.dumps(contents).encode()
+
+    temporary_path = Path(f"{os.fspath(path)}.tmp")
+    with open(temporary_path, "wb") as file:
+        file.write(_HEADER.pack(magic, version, 0, len(encoded_contents)))
+        file.write(encoded_contents)
+        for name, array in arrays.items():
+            file.seek(contents["arrays"][name]["offset"])
+            file.write(array.tobytes())
+    os.replace(temporary_path, path)
+
+def read_header(path: str | os.PathLike, magic: bytes, supported_versions: tuple[int, ...]):
+    #function reading and checking the header and table of contents of a columnar file, returning the format version and the table of contents
+    with open(path, "rb") as file:
+        header = file.read(_HEADER.size)
+        if len(header) < _HEADER.size or header[:8] != magic:
+            raise ValueError("The file is not in the expected format!")
+        _, version, _, contents_length = _HEADER.unpack(header)
+        if version not in supported_versions:
+            raise ValueError("This file format version is not supported.")
+        contents = json.loads(file.read(contents_length))
+    return version, contents
+
+def map_arrays(path: str | os.PathLike, magic: bytes, supported_versions: tuple[int, ...]):
+    #function memory-mapping a columnar file read-only, returning the format version, the metadata and a dictionary of zero-copy array views
+    #the mapping stays open for as long as any of the arrays is referenced
+    version, contents = read_header(path, magic, supported_versions)
+    mapped = np.memmap(path, dtype=np.uint8, mode="r")
+    arrays = {}
+    for name, layout in contents["arrays"].items():
+        dtype = np.dtype(layout["dtype"])
+        shape = tuple(layout["shape"])
+        nbytes = dtype.itemsize*int(np.prod(shape, dtype=np.int64))
+        arrays[name] = mapped[layout["offset"]:layout["offset"] + nbytes].view(dtype).reshape(shape)
+    return version, contents["metadata"], arrays
@@ -0,0 +1,98 @@
+import os
+import json
+import hashlib
+from datetime import date
+from pathlib import Path
+import numpy as np
+from derivative_valuations.curve_bootstrapping.financial_instruments import DepositQuote, FixedForFloatingSwapQuote
+from derivative_valuations.curve_bootstrapping.bootstrapping import bootstrap_discount_curve
+from derivative_valuations.df_curve.discount_factor import DiscountCurve
+from derivative_valuations.df_curve.interpolation import LOG_LINEAR
+from derivative_valuations.storage.columnar import write_arrays, map_arrays
+
+#on-disk store of bootstrapped curve snapshots, keyed by valuation date and a hash of the quotes the curve was bootstrapped from
+#each snapshot is one small columnar file (see storage/columnar.py) of pillar date ordinals, discount factors and year fractions, named after its key
+#snapshots are only read when requested, by memory-mapping their file, so opening a store of thousands of curves does no work per curve
+
+CURVE_STORE_MAGIC = b"DVCURVE\x00"
+CURVE_STORE_VERSION = 1
+_SUFFIX = ".dvc"
+
+def quotes_hash(deposit_quotes: list[DepositQuote], swap_quotes: list[FixedForFloatingSwapQuote], convention: str):
+    #function returning a hex digest identifying the inputs of bootstrap_discount_curve, any change to a quote's terms changes the hash
+    #floats are hashed exactly (float.hex) and quotes in the order given, as the bootstrap's ordering of tied quotes depends on it
+    terms = [convention]
+    for quote in deposit_quotes:
+        terms.append(("deposit", quote.start_date.isoformat(), quote.end_date.isoformat(), float(quote.rate).hex(), quote.convention))
+    for quote in swap_quotes:
+        terms.append(("swap", quote.effective_date.isoformat(), quote.maturity_date.isoformat(), float(quote.fixed_rate).hex(), quote.fixed_frequency_months, quote.fixed_convention, quote.float_frequency_months, quote.float_convention, float(quote.notional).hex()))
+    return hashlib.sha256(json.dumps(terms).encode()).hexdigest()
+
+class CurveSnapshot:
+#class holding one stored curve as zero-copy memory-mapped arrays of its pillars
+    def __init__(self, path: str | os.PathLike):
+        self.path = path
+        self.version, metadata, arrays = map_arrays(path, CURVE_STORE_MAGIC, (CURVE_STORE_VERSION,))
+        self.valuation_date = date.fromisoformat(metadata["valuation_date"])
+        self.quotes_hash = metadata["quotes_hash"]
+        self.convention = metadata["convention"]
+        #snapshots written before curves had a choice of interpolation are log_linear
+        self.interpolation = metadata.get("interpolation", LOG_LINEAR)
+        self.interpolation_dates = arrays["interpolation_dates"]
+        self.interpolation_dfs = arrays["interpolation_dfs"]
+        self.interpolation_year_fractions = arrays["interpolation_year_fractions"]
+
+    def to_curve(self):
+        #method building a DiscountCurve identical to the one stored, reusing the stored year fractions
+        return DiscountCurve._from_pillars(self.valuation_date, [date.fromordinal(ordinal) for ordinal in self.interpolation_dates.tolist()], self.interpolation_dfs.tolist(), self.interpolation_year_fractions.tolist(), self.convention, self.interpolation)
+
+class CurveStore:
+#class for a directory of curve snapshots, keyed by (valuation date, quotes hash)
+    def __init__(self, directory: str | os.PathLike):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, valuation_date: date, quotes_hash: str):
+        #helper returning the file path of a key
+        return self.directory / f"{valuation_date.isoformat()}_{quotes_hash}{_SUFFIX}"
+
+    def __contains__(self, key: tuple[date, str]):
+        return self._path(*key).exists()
+
+    def keys(self):
+        #method listing the stored (valuation date, quotes hash) keys in date order, from the file names only
+        keys = []
+        for path in self.directory.glob(f"*{_SUFFIX}"):
+            valuation_date, _, stored_hash = path.stem.partition("_")
+            keys.append((date.fromisoformat(valuation_date), stored_hash))
+        return sorted(keys)
+
+    def save(self, curve: DiscountCurve, quotes_hash: str):
+        #method storing the pillars of a curve under its valuation date and the given quotes hash, replacing any snapshot with the same key
+        arrays = {
+            "interpolation_dates": np.array([d.toordinal() for d in curve.interpolation_dates], dtype=np.int64),
+            "interpolation_dfs": np.array(curve.interpolation_dfs, dtype=np.float64),
+            "interpolation_year_fractions": np.array(curve.interpolation_year_fractions, dtype=np.float64),
+        }
+        metadata = {"valuation_date": curve.valuation_date.isoformat(), "quotes_hash": quotes_hash, "convention": curve.convention, "interpolation": curve.interpolation}
+        write_arrays(self._path(curve.valuation_date, quotes_hash), CURVE_STORE_MAGIC, CURVE_STORE_VERSION, arrays, metadata)
+
+    def snapshot(self, valuation_date: date, quotes_hash: str):
+        #method memory-mapping the snapshot stored under a key
+        path = self._path(valuation_date, quotes_hash)
+        if not path.exists():
+            raise ValueError("No curve snapshot is stored for this valuation date and quotes hash!")
+        return CurveSnapshot(path)
+
+    def load(self, valuation_date: date, quotes_hash: str):
+        #method returning the DiscountCurve stored under a key, a new curve object on every call
+        return self.snapshot(valuation_date, quotes_hash).to_curve()
+
+    def bootstrap(self, valuation_date: date, deposit_quotes: list[DepositQuote], swap_quotes: list[FixedForFloatingSwapQuote], convention: str):
+        #method returning the curve bootstrapped from the quotes, from the store if it holds it, otherwise bootstrapping and storing it
+        key = quotes_hash(deposit_quotes, swap_quotes, convention)
+        if (valuation_date, key) in self:
+            return self.load(valuation_date, key)
+        curve = bootstrap_discount_curve(valuation_date, deposit_quotes, swap_quotes, convention)
+        self.save(curve, key)
+        return curve
@@ -0,0 +1,145 @@
+import os
+from datetime import date
+from collections.abc import Mapping
+import numpy as np
+from derivative_valuations.daycount_conventions.daycount import year_fraction_computation
+from derivative_valuations.df_curve.discount_factor import DiscountCurve, ShiftedCurve
+from derivative_valuations.valuation.bond import Bond
+from derivative_valuations.valuation.FRA import FRA
+from derivative_valuations.valuation.present_value import pv_many
+from derivative_valuations.storage.columnar import write_arrays, map_arrays
+
+#on-disk columnar store of a portfolio of bonds and FRAs with their expanded cashflows
+#instrument terms are held one row per instrument (dates as ordinals, conventions as codes into a table of convention names), cashflows as flat arrays with offsets per instrument
+#a store is opened by memory-mapping the file, so the arrays can be passed straight to pricing (e.g. pv_many) without copying or parsing
+
+PORTFOLIO_STORE_MAGIC = b"DVPORTFO"
+PORTFOLIO_STORE_VERSION = 1
+
+#instrument type codes
+BOND_INSTRUMENT = 0
+FRA_INSTRUMENT = 1
+
+def _instrument_cashflows(instrument: Bond | FRA):
+    #helper returning the (date, amount) cashflows stored for an instrument
+    #a bond's are its coupons (and redemption), an FRA's are the two cashflows with the same present value as the FRA, sign*N at the start date and -sign*N*(1+tau*K) at the end date
+    if isinstance(instrument, Bond):
+        return instrument.build_bond_cashflows()
+    sign = 1.0 if instrument.pay_fixed else -1.0
+    year_fraction = year_fraction_computation(instrument.start_date, instrument.end_date, instrument.convention)
+    return [(instrument.start_date, sign*instrument.notional), (instrument.end_date, -sign*instrument.notional*(1+year_fraction*instrument.strike_rate))]
+
+def write_portfolio(path: str | os.PathLike, instruments: Mapping[int | str, Bond | FRA]):
+    #function writing a portfolio, given as a mapping of trade id -> Bond or FRA, to a portfolio store file
+    #trade ids must be all integers or all strings
+    trade_ids = list(instruments.keys())
+    if all(isinstance(trade_id, (int, np.integer)) for trade_id in trade_ids):
+        trade_id_array = np.array(trade_ids, dtype=np.int64)
+    elif all(isinstance(trade_id, str) for trade_id in trade_ids):
+        trade_id_array = np.array(trade_ids, dtype=str) if trade_ids else np.zeros(0, dtype="U1")
+    else:
+        raise ValueError("Trade ids must be all integers or all strings!")
+
+    conventions = []
+    columns = {name: [] for name in ("instrument_types", "start_dates", "end_dates", "rates", "notionals", "frequencies", "convention_codes", "flags")}
+    cashflow_offsets = [0]
+    payment_dates = []
+    amounts = []
+    for instrument in instruments.values():
+        if isinstance(instrument, Bond):
+            row = (BOND_INSTRUMENT, instrument.issue_date, instrument.maturity_date, instrument.rate, instrument.notional, instrument.frequency, instrument.convention, instrument.redemption_at_maturity)
+        elif isinstance(instrument, FRA):
+            row = (FRA_INSTRUMENT, instrument.start_date, instrument.end_date, instrument.strike_rate, instrument.notional, 0, instrument.convention, instrument.pay_fixed)
+        else:
+            raise ValueError("Only bonds and FRAs can be stored.")
+        instrument_type, start_date, end_date, rate, notional, frequency, convention, flag = row
+        if convention not in conventions:
+            conventions.append(convention)
+        for name, value in zip(columns, (instrument_type, start_date.toordinal(), end_date.toordinal(), rate, notional, frequency, conventions.index(convention), flag)):
+            columns[name].append(value)
+
+        for payment_date, amount in _instrument_cashflows(instrument):
+            payment_dates.append(payment_date.toordinal())
+            amounts.append(amount)
+        cashflow_offsets.append(len(payment_dates))
+
+    cashflow_offsets = np.array(cashflow_offsets, dtype=np.int64)
+    arrays = {
+        "trade_ids": trade_id_array,
+        "instrument_types": np.array(columns["instrument_types"], dtype=np.uint8),
+        "start_dates": np.array(columns["start_dates"], dtype=np.int64),
+        "end_dates": np.array(columns["end_dates"], dtype=np.int64),
+        "rates": np.array(columns["rates"], dtype=np.float64),
+        "notionals": np.array(columns["notionals"], dtype=np.float64),
+        "frequencies": np.array(columns["frequencies"], dtype=np.int32),
+        "convention_codes": np.array(columns["convention_codes"], dtype=np.uint8),
+        "flags": np.array(columns["flags"], dtype=np.bool_),
+        "cashflow_offsets": cashflow_offsets,
+        "payment_dates": np.array(payment_dates, dtype=np.int64),
+        "amounts": np.array(amounts, dtype=np.float64),
+        "cashflow_trades": np.repeat(np.arange(len(trade_ids), dtype=np.int64), np.diff(cashflow_offsets)),
+    }
+    write_arrays(path, PORTFOLIO_STORE_MAGIC, PORTFOLIO_STORE_VERSION, arrays, {"conventions": conventions})
+
+class PortfolioStore:
+#class giving read-only access to a portfolio store file through memory-mapped arrays
+#every array attribute is a zero-copy view of the file: one row per instrument for the instrument terms, and one entry per cashflow for payment_dates, amounts and cashflow_trades (the row of each cashflow's instrument)
+    def __init__(self, path: str | os.PathLike):
+        self.path = path
+        self.version, metadata, arrays = map_arrays(path, PORTFOLIO_STORE_MAGIC, (PORTFOLIO_STORE_VERSION,))
+        self.conventions = tuple(metadata["conventions"])
+        self.trade_ids = arrays["trade_ids"]
+        self.instrument_types = arrays["instrument_types"]
+        self.start_dates = arrays["start_dates"]
+        self.end_dates = arrays["end_dates"]
+        self.rates = arrays["rates"]
+        self.notionals = arrays["notionals"]
+        self.frequencies = arrays["frequencies"]
+        self.convention_codes = arrays["convention_codes"]
+        self.flags = arrays["flags"]
+        self.cashflow_offsets = arrays["cashflow_offsets"]
+        self.payment_dates = arrays["payment_dates"]
+        self.amounts = arrays["amounts"]
+        self.cashflow_trades = arrays["cashflow_trades"]
+
+    def __len__(self):
+        return len(self.trade_ids)
+
+    def trade_id(self, i: int):
+        #method returning the trade id of row i as a Python int or str
+        return self.trade_ids[i].item()
+
+    def instrument(self, i: int):
+        #method rebuilding the Bond or FRA held in row i
+        start_date = date.fromordinal(int(self.start_dates[i]))
+        end_date = date.fromordinal(int(self.end_dates[i]))
+        convention = self.conventions[self.convention_codes[i]]
+        if self.instrument_types[i] == BOND_INSTRUMENT:
+            return Bond(start_date, end_date, float(self.rates[i]), int(self.frequencies[i]), float(self.notionals[i]), convention, bool(self.flags[i]))
+        return FRA(start_date, end_date, float(self.rates[i]), float(self.notionals[i]), convention, bool(self.flags[i]))
+
+    def instruments(self):
+        #method rebuilding the whole portfolio as a dictionary of trade id -> Bond or FRA, in stored order
+        return {self.trade_id(i): self.instrument(i) for i in range(len(self))}
+
+    def cashflows(self, i: int):
+        #method returning the stored (date, amount) cashflows of row i
+        start, stop = self.cashflow_offsets[i], self.cashflow_offsets[i+1]
+        return [(date.fromordinal(int(payment_date)), float(amount)) for payment_date, amount in zip(self.payment_dates[start:stop], self.amounts[start:stop])]
+
+    def present_values(self, curve: DiscountCurve | ShiftedCurve):
+        #method computing the present value of every instrument from the mapped cashflow arrays, as bond_dirty_price and FRA_price do
+        #bond cashflows paid on or before the valuation date are left out, and FRAs must not have started before it
+        #returns a numpy array aligned with the stored rows
+        valuation_ordinal = curve.valuation_date.toordinal()
+        if np.any((self.instrument_types == FRA_INSTRUMENT) & (self.start_dates < valuation_ordinal)):
+            raise ValueError("Valuation date cannot be before the forward start date.")
+        pvs = np.zeros(len(self))
+        if len(self.payment_dates) == 0:
+            return pvs
+
+        #the mapped date and trade columns are priced as they are, settled cashflows are zeroed in a new amounts array (the one copy made) rather than masked out of all three columns
+        future = (self.payment_dates > valuation_ordinal) | (self.instrument_types[self.cashflow_trades] == FRA_INSTRUMENT)
+        rows, row_pvs = pv_many(self.payment_dates, np.where(future, self.amounts, 0.0), self.cashflow_trades, curve)
+        pvs[rows] = row_pvs
+        return pvs
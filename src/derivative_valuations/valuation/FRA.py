@@ -1,10 +1,9 @@
 import math
 from datetime import date
-from derivative_valuations.payment_schedule.accrual_period_payment_schedule import generate_schedule
 from derivative_valuations.cashflows.cash_flow import build_bond_cashflows
 from derivative_valuations.daycount_conventions.daycount import year_fraction_computation
-from derivative_valuations.df_curve.discount_factor import DiscountCurve
-from derivative_valuations.valuation.present_value import pv
+from derivative_valuations.df_curve.discount_factor import DiscountCurve, ShiftedCurve
+from derivative_valuations.valuation.present_value import pv, pillar_sensitivities
 
 class FRA:
 #class for holding information about a FRA (forward rate agreement)
@@ -61,7 +60,7 @@ def _FRA_payoff(fra: FRA, curve: DiscountCurve):
     
 
 
-def FRA_price(fra: FRA, curve: DiscountCurve, valuation_date: date):
+def FRA_price(fra: FRA, curve: DiscountCurve | ShiftedCurve, valuation_date: date):
     #prices an FRA by computing the implied simple forward rate from the curve, then discounting the sole cashflow
 
     #validation checks
@@ -76,7 +75,22 @@ def FRA_price(fra: FRA, curve: DiscountCurve, valuation_date: date):
 
     return pv(fra_cashflow, curve)
 
+def FRA_pillar_sensitivities(fra: FRA, curve: DiscountCurve, valuation_date: date):
+    #computes d(price)/d(zero rate) at every known date of the curve, see pillar_sensitivities
+    #with 1+year_fraction*forward_rate = df_t_0/df_t_1, the discounted payoff is notional*(df_t_0 - (1+year_fraction*strike_rate)*df_t_1)
+    #so the FRA has the same sensitivities as those two cashflows
 
+    #validation checks
+    if valuation_date != curve.valuation_date:
+        raise ValueError("The curve used to price the bond is for a different valuation date!")
+    if curve.valuation_date > fra.start_date:
+        raise ValueError("Valuation date cannot be before the forward start date.")
 
+    year_fraction_start_date_end_date = year_fraction_computation(fra.start_date, fra.end_date, fra.convention)
+    equivalent_cashflows = [(fra.start_date, fra.notional), (fra.end_date, -fra.notional*(1+year_fraction_start_date_end_date*fra.strike_rate))]
 
-
+    #consider whether paying fixed or paying floating
+    sensitivities = pillar_sensitivities(equivalent_cashflows, curve)
+    if fra.pay_fixed == False:
+        sensitivities = sensitivities * -1
+    return sensitivities
@@ -1,9 +1,11 @@
 from datetime import date
-from derivative_valuations.payment_schedule.accrual_period_payment_schedule import generate_schedule
+from typing import NamedTuple
+import numpy as np
+from derivative_valuations.payment_schedule.accrual_period_payment_schedule import cached_schedule
 from derivative_valuations.cashflows.cash_flow import build_bond_cashflows
-from derivative_valuations.daycount_conventions.daycount import year_fraction_computation
-from derivative_valuations.df_curve.discount_factor import DiscountCurve
-from derivative_valuations.valuation.present_value import pv
+from derivative_valuations.daycount_conventions.daycount import year_fraction_computation, year_fractions, to_ordinals
+from derivative_valuations.df_curve.discount_factor import DiscountCurve, ShiftedCurve
+from derivative_valuations.valuation.present_value import pv, pillar_sensitivities
 
 class Bond:
 #class for holding information about a bond
@@ -17,7 +19,8 @@ class Bond:
         self.redemption_at_maturity = redemption_at_maturity
 
     def generate_schedule(self):
-        return generate_schedule(self.issue_date, self.maturity_date, self.frequency)
+        #method to return the accrual periods of the bond, as an immutable cached schedule
+        return cached_schedule(self.issue_date, self.maturity_date, self.frequency)
     
     def build_bond_cashflows(self):
         return build_bond_cashflows(self.generate_schedule(), self.notional, self.rate, self.convention, self.redemption_at_maturity)
@@ -39,7 +42,7 @@ def bond_accrued_interest(bond: Bond, t: date):
         if accrual_start_date < t < accrual_end_date:
             return bond.notional*bond.rate*year_fraction_computation(accrual_start_date, t, bond.convention)
         
-def bond_dirty_price(bond: Bond, curve: DiscountCurve, valuation_date: date):
+def bond_dirty_price(bond: Bond, curve: DiscountCurve | ShiftedCurve, valuation_date: date):
     #function for computing the dirty price of a bond at a valuation date
 
     #validation checks
@@ -57,9 +60,92 @@ def bond_dirty_price(bond: Bond, curve: DiscountCurve, valuation_date: date):
     #otherwise return present value of future cashflows
     return pv(future_cashflows, curve)
 
+def bond_pillar_sensitivities(bond: Bond, curve: DiscountCurve, valuation_date: date):
+    #function for computing d(dirty price)/d(zero rate) at every known date of the curve, see pillar_sensitivities
+
+    #validation checks
+    if valuation_date != curve.valuation_date:
+        raise ValueError("The curve used to price the bond is for a different valuation date!")
+
+    #only future cashflows contribute to the dirty price
+    cashflows = bond.build_bond_cashflows()
+    future_cashflows = [(payment_date, amount) for payment_date, amount in cashflows if payment_date > valuation_date]
+
+    #no sensitivity if no future cashflows
+    if not future_cashflows:
+        return np.zeros(len(curve.interpolation_dates))
+
+    return pillar_sensitivities(future_cashflows, curve)
+
 def bond_clean_price(bond: Bond, curve: DiscountCurve, valuation_date: date):
     #calculates clean price as dirty price less accrued interest
     return bond_dirty_price(bond, curve, valuation_date) - bond_accrued_interest(bond, valuation_date)
 
 def price_bond(bond: Bond, curve: DiscountCurve, valuation_date: date):
-    return bond_clean_price(bond, curve, valuation_date), bond_dirty_price(bond, curve, valuation_date), bond_accrued_interest(bond, valuation_date)
\ No newline at end of file
+    #returns the clean price, dirty price and accrued interest, computing the dirty price and accrued interest once each
+    dirty_price = bond_dirty_price(bond, curve, valuation_date)
+    accrued_interest = bond_accrued_interest(bond, valuation_date)
+    return dirty_price - accrued_interest, dirty_price, accrued_interest
+
+class BondAnalytics(NamedTuple):
+#result record of bond_analytics and price_bonds, DV01 and convexity are as DV01 and convexity in present_value.py for the bond's future cashflows
+#a bond with no future cashflows has prices and DV01 of 0 and a convexity of nan
+    clean_price: float
+    dirty_price: float
+    accrued_interest: float
+    DV01: float
+    convexity: float
+
+def bond_analytics(bond: Bond, curve: DiscountCurve, valuation_date: date, bp: float = 1.0):
+    #function computing clean price, dirty price, accrued interest, DV01 and convexity for a bp basis point parallel shift in one pass
+    return price_bonds([bond], curve, valuation_date, bp)[0]
+
+def price_bonds(bonds: list[Bond], curve: DiscountCurve, valuation_date: date, bp: float = 1.0):
+    #function computing BondAnalytics for every bond in a list against one curve
+    #the future cashflows of all bonds are discounted together, each distinct payment date once
+    #shifted prices reuse the same discount factors, as a parallel zero rate shift s multiplies each discount factor by exp(-s*t) (see ShiftedCurve)
+
+    #validation checks
+    if valuation_date != curve.valuation_date:
+        raise ValueError("The curve used to price the bond is for a different valuation date!")
+
+    #gather the future cashflows of every bond in columnar form
+    payment_dates = []
+    amounts = []
+    cashflow_counts = []
+    for bond in bonds:
+        future_cashflows = [(payment_date, amount) for payment_date, amount in bond.build_bond_cashflows() if payment_date > valuation_date]
+        payment_dates.extend(payment_date for payment_date, _ in future_cashflows)
+        amounts.extend(amount for _, amount in future_cashflows)
+        cashflow_counts.append(len(future_cashflows))
+
+    dirty_prices = np.zeros(len(bonds))
+    shifted_up_prices = np.zeros(len(bonds))
+    shifted_down_prices = np.zeros(len(bonds))
+    if payment_dates:
+        #discount each distinct payment date once, with base and shifted discount factors
+        distinct_payment_dates, payment_date_index = np.unique(to_ordinals(payment_dates), return_inverse=True)
+        dfs = curve.dfs(distinct_payment_dates)
+        shift_factors = np.exp(-(bp/10000)*year_fractions(valuation_date, distinct_payment_dates, curve.convention))
+        amounts = np.array(amounts, dtype=float)
+
+        #sum each bond's segment of discounted cashflows
+        has_cashflows = np.array(cashflow_counts) > 0
+        segment_starts = np.concatenate(([0], np.cumsum(cashflow_counts)[:-1]))[has_cashflows]
+        discounted_cashflows = amounts*dfs[payment_date_index]
+        dirty_prices[has_cashflows] = np.add.reduceat(discounted_cashflows, segment_starts)
+        shifted_up_prices[has_cashflows] = np.add.reduceat(discounted_cashflows*shift_factors[payment_date_index], segment_starts)
+        shifted_down_prices[has_cashflows] = np.add.reduceat(discounted_cashflows/shift_factors[payment_date_index], segment_starts)
+
+    results = []
+    for bond, dirty_price, shifted_up_price, shifted_down_price in zip(bonds, dirty_prices, shifted_up_prices, shifted_down_prices):
+        accrued_interest = bond_accrued_interest(bond, valuation_date)
+        dirty_price = float(dirty_price)
+        DV01 = float(shifted_up_price) - dirty_price
+        #convexity is relative to the dirty price, so it is undefined (nan) for a bond with no future cashflows, where convexity in present_value.py cannot be computed
+        if dirty_price == 0:
+            convexity = float("nan")
+        else:
+            convexity = (float(shifted_up_price) - 2*dirty_price + float(shifted_down_price))/(dirty_price*(bp**2))
+        results.append(BondAnalytics(dirty_price - accrued_interest, dirty_price, accrued_interest, DV01, convexity))
+    return results
\ No newline at end of file
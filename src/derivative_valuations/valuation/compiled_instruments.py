@@ -0,0 +1,160 @@
+import bisect
+from datetime import date
+import numpy as np
+from derivative_valuations.curve_bootstrapping.financial_instruments import FixedForFloatingSwapQuote
+from derivative_valuations.daycount_conventions.daycount import year_fraction_computation, year_fractions, to_ordinals
+from derivative_valuations.df_curve.discount_factor import DiscountCurve, ShiftedCurve
+from derivative_valuations.valuation.bond import Bond
+from derivative_valuations.valuation.FRA import FRA
+from derivative_valuations.valuation.present_value import pillar_sensitivities
+
+#compiled instruments derive an instrument's schedule, cashflows and year fractions once, so repricing does no schedule or day count work
+#they hold a reference to the source instrument, if its terms are edited invalidate() must be called to recompile
+
+class CompiledBond:
+#class holding a Bond with its schedule, cashflows and accrual year fractions precomputed
+    __slots__ = ("bond", "schedule", "accrual_end_dates", "accrual_fractions", "cashflows", "payment_dates", "payment_ordinals", "amounts")
+
+    def __init__(self, bond: Bond):
+        self.bond = bond
+        self.invalidate()
+
+    def invalidate(self):
+        #method to recompile from the bond's current terms
+        bond = self.bond
+        self.schedule = bond.generate_schedule()
+        self.accrual_end_dates = [accrual_end_date for _, accrual_end_date, _ in self.schedule]
+        self.accrual_fractions = year_fractions([period[0] for period in self.schedule], self.accrual_end_dates, bond.convention)
+
+        #validation checks, as build_bond_cashflows
+        if bond.notional < 0:
+            raise ValueError("Notional payment must not be less than 0.")
+        if bond.rate < 0:
+            raise ValueError("Fixed rate must not be less than 0.")
+
+        #cashflows derived from the accrual fractions, the coupons followed by the redemption if any, as build_bond_cashflows
+        self.payment_dates = [payment_date for _, _, payment_date in self.schedule]
+        self.amounts = bond.notional*bond.rate*self.accrual_fractions
+        if bond.redemption_at_maturity == True:
+            self.payment_dates.append(self.schedule[-1][-1])
+            self.amounts = np.append(self.amounts, float(bond.notional))
+        self.payment_ordinals = to_ordinals(self.payment_dates)
+        self.cashflows = tuple(zip(self.payment_dates, self.amounts.tolist()))
+
+    def accrued_interest(self, t: date):
+        #method that calculates accrued interest on a target date t, as bond_accrued_interest
+        bond = self.bond
+        if t <= bond.issue_date or t >= bond.maturity_date:
+            return 0.0
+
+        #find the accrual period containing t, no interest has accrued if t is a payment date
+        i = bisect.bisect_left(self.accrual_end_dates, t)
+        if self.accrual_end_dates[i] == t:
+            return 0.0
+        return bond.notional*bond.rate*year_fraction_computation(self.schedule[i][0], t, bond.convention)
+
+    def dirty_price(self, curve: DiscountCurve | ShiftedCurve, valuation_date: date):
+        #method for computing the dirty price at a valuation date, as bond_dirty_price
+        if valuation_date != curve.valuation_date:
+            raise ValueError("The curve used to price the bond is for a different valuation date!")
+        future = self.payment_ordinals > valuation_date.toordinal()
+        if not future.any():
+            return 0.0
+        return float(np.dot(self.amounts[future], curve.dfs(self.payment_ordinals[future])))
+
+    def clean_price(self, curve: DiscountCurve | ShiftedCurve, valuation_date: date):
+        #calculates clean price as dirty price less accrued interest
+        return self.dirty_price(curve, valuation_date) - self.accrued_interest(valuation_date)
+
+    def pillar_sensitivities(self, curve: DiscountCurve, valuation_date: date):
+        #method for computing d(dirty price)/d(zero rate) at every known date of the curve, as bond_pillar_sensitivities
+        if valuation_date != curve.valuation_date:
+            raise ValueError("The curve used to price the bond is for a different valuation date!")
+        future_cashflows = [(payment_date, amount) for payment_date, amount in self.cashflows if payment_date > valuation_date]
+        if not future_cashflows:
+            return np.zeros(len(curve.interpolation_dates))
+        return pillar_sensitivities(future_cashflows, curve)
+
+class CompiledFRA:
+#class holding an FRA with its year fraction and equivalent cashflows precomputed
+    __slots__ = ("fra", "year_fraction", "sign", "equivalent_cashflows")
+
+    def __init__(self, fra: FRA):
+        self.fra = fra
+        self.invalidate()
+
+    def invalidate(self):
+        #method to recompile from the FRA's current terms
+        fra = self.fra
+        self.year_fraction = year_fraction_computation(fra.start_date, fra.end_date, fra.convention)
+        self.sign = 1.0 if fra.pay_fixed else -1.0
+        self.equivalent_cashflows = [(fra.start_date, fra.notional), (fra.end_date, -fra.notional*(1+self.year_fraction*fra.strike_rate))]
+
+    def price(self, curve: DiscountCurve | ShiftedCurve, valuation_date: date):
+        #method pricing the FRA, as FRA_price
+        fra = self.fra
+        if valuation_date != curve.valuation_date:
+            raise ValueError("The curve used to price the bond is for a different valuation date!")
+        if fra.end_date <= fra.start_date:
+            raise ValueError("The forward start date must be before the end date.")
+        if curve.valuation_date > fra.start_date:
+            raise ValueError("Valuation date cannot be before the forward start date.")
+
+        #implied simple forward rate and payoff at the start date
+        df_t_0, df_t_1 = curve.dfs([fra.start_date, fra.end_date])
+        forward_rate = (1/self.year_fraction)*((df_t_0/df_t_1)-1)
+        payoff = fra.notional*self.year_fraction*((forward_rate-fra.strike_rate)/(1+self.year_fraction*forward_rate))
+        return float(self.sign*payoff*df_t_0)
+
+    def pillar_sensitivities(self, curve: DiscountCurve, valuation_date: date):
+        #method computing d(price)/d(zero rate) at every known date of the curve, as FRA_pillar_sensitivities
+        if valuation_date != curve.valuation_date:
+            raise ValueError("The curve used to price the bond is for a different valuation date!")
+        if curve.valuation_date > self.fra.start_date:
+            raise ValueError("Valuation date cannot be before the forward start date.")
+        return self.sign*pillar_sensitivities(self.equivalent_cashflows, curve)
+
+class CompiledSwapQuote:
+#class holding a fixed-for-floating swap quote with its fixed leg payment dates and year fractions precomputed
+    __slots__ = ("quote", "fixed_schedule", "payment_dates", "year_fractions", "fixed_cashflows")
+
+    def __init__(self, quote: FixedForFloatingSwapQuote):
+        self.quote = quote
+        self.invalidate()
+
+    def invalidate(self):
+        #method to recompile from the quote's current terms
+        quote = self.quote
+        self.fixed_schedule = quote.fixed_schedule()
+        if not self.fixed_schedule:
+            raise ValueError("Fixed payment schedule is empty!")
+        self.payment_dates = [payment_date for _, _, payment_date in self.fixed_schedule]
+        self.year_fractions = [year_fraction_computation(accrual_start, accrual_end, quote.fixed_convention) for accrual_start, accrual_end, _ in self.fixed_schedule]
+        if any(year_fraction <= 0 for year_fraction in self.year_fractions):
+            raise ValueError("The year fraction must be greater than 0.")
+        if self.payment_dates[-1] != quote.maturity_date:
+            raise ValueError("Last fixed payment date must equal the swap maturity_date.")
+        self.fixed_cashflows = tuple(quote.fixed_cashflows())
+
+    def solve_last_df(self, curve: DiscountCurve):
+        #method for solving for a discount factor at the swap's maturity date, as FixedForFloatingSwapQuote.solve_last_df
+        a_sum = 0.0
+        for payment_date, year_fraction in zip(self.payment_dates[:-1], self.year_fractions[:-1]):
+            a_sum = a_sum + year_fraction*curve.df(payment_date)
+        a = 1 - self.quote.fixed_rate*a_sum
+        b = 1 + self.quote.fixed_rate*self.year_fractions[-1]
+
+        df_maturity_date = a/b
+        if df_maturity_date <= 0:
+            raise ValueError("Solved discount factor at maturity date of the swap is not greater than 0!")
+        return df_maturity_date
+
+def compile_instrument(instrument: Bond | FRA | FixedForFloatingSwapQuote):
+    #function returning the compiled counterpart of a Bond, FRA or FixedForFloatingSwapQuote
+    if isinstance(instrument, Bond):
+        return CompiledBond(instrument)
+    if isinstance(instrument, FRA):
+        return CompiledFRA(instrument)
+    if isinstance(instrument, FixedForFloatingSwapQuote):
+        return CompiledSwapQuote(instrument)
+    raise ValueError("This instrument type cannot be compiled.")
@@ -0,0 +1,229 @@
+from datetime import date
+from typing import NamedTuple
+from collections.abc import Mapping, Sequence
+import numpy as np
+from derivative_valuations.daycount_conventions.daycount import year_fraction_computation, year_fractions, to_ordinals
+from derivative_valuations.df_curve.discount_factor import DiscountCurve
+from derivative_valuations.valuation.bond import Bond
+from derivative_valuations.valuation.FRA import FRA
+
+#Monte Carlo exposure simulation under a one-factor Hull-White model fitted to a DiscountCurve
+#the short rate is r(t) = x(t) + phi(t), with x an Ornstein-Uhlenbeck process dx = -a*x*dt + sigma*dW started at 0 and phi the deterministic shift fitting the curve exactly
+#zero coupon bond prices are then closed form in x (Brigo-Mercurio G1++), P(t,T) = P(0,T)/P(0,t)*exp(0.5*(V(t,T) - V(0,T) + V(0,t)) - B(t,T)*x(t)), where P(0,.) are the curve's discount factors
+#x is simulated exactly at the exposure dates (no time discretisation error), for batches of paths at a time so memory does not grow with the number of paths
+#times are year fractions from the valuation date in the curve's day count convention
+
+class HullWhiteModel:
+#class for a one-factor Hull-White model with constant mean reversion a and volatility sigma, fitted to a discount curve
+    def __init__(self, curve: DiscountCurve, mean_reversion: float, volatility: float):
+        #validation checks
+        if mean_reversion <= 0:
+            raise ValueError("Mean reversion must be greater than 0.")
+        if volatility < 0:
+            raise ValueError("Volatility must not be less than 0.")
+        self.curve = curve
+        self.mean_reversion = mean_reversion
+        self.volatility = volatility
+
+    def times(self, dates: Sequence[date] | np.ndarray):
+        #method returning the model times (year fractions from the valuation date) of dates, 0 for dates on or before the valuation date
+        ordinals = np.maximum(to_ordinals(dates), self.curve.valuation_date.toordinal())
+        return year_fractions(self.curve.valuation_date, ordinals, self.curve.convention)
+
+    def B(self, t: float | np.ndarray, T: float | np.ndarray):
+        #B(t,T) = (1 - exp(-a*(T-t)))/a, the sensitivity of log P(t,T) to x(t)
+        a = self.mean_reversion
+        return (1 - np.exp(-a*(T - t)))/a
+
+    def V(self, t: float | np.ndarray, T: float | np.ndarray):
+        #V(t,T), the variance of the integral of x from t to T given x(t)
+        a, sigma = self.mean_reversion, self.volatility
+        tau = T - t
+        return (sigma**2/a**2)*(tau + (2/a)*np.exp(-a*tau) - (1/(2*a))*np.exp(-2*a*tau) - 3/(2*a))
+
+    def x_variance(self, t: float | np.ndarray):
+        #variance of x(t), sigma^2*(1 - exp(-2*a*t))/(2*a)
+        a, sigma = self.mean_reversion, self.volatility
+        return sigma**2*(1 - np.exp(-2*a*t))/(2*a)
+
+    def simulate(self, times: np.ndarray, paths: int, rng: np.random.Generator):
+        #method simulating x at increasing times (after 0) for a number of paths, returned as a (paths x times) array
+        #each step uses the exact Gaussian transition of the Ornstein-Uhlenbeck process, x(t+dt) = x(t)*exp(-a*dt) + sqrt(sigma^2*(1 - exp(-2*a*dt))/(2*a))*Z
+        #the normals are drawn path by path, so simulating paths in batches from one generator gives the same paths as simulating them all at once
+        times = np.asarray(times, dtype=float)
+        steps = np.diff(np.concatenate(([0.0], times)))
+        if np.any(steps <= 0):
+            raise ValueError("Simulation times must be strictly increasing and after 0!")
+        decay = np.exp(-self.mean_reversion*steps)
+        step_deviation = np.sqrt(self.x_variance(steps))
+        shocks = rng.standard_normal((paths, len(times)))*step_deviation
+        x = np.empty((paths, len(times)))
+        previous = np.zeros(paths)
+        for j in range(len(times)):
+            previous = previous*decay[j] + shocks[:, j]
+            x[:, j] = previous
+        return x
+
+    def zero_coupon_bonds(self, t: date, x: np.ndarray, maturities: Sequence[date] | np.ndarray):
+        #method returning the zero coupon bond prices P(t,T) on each path for maturities T on or after t, as a (paths x maturities) array
+        #x holds the value of x(t) on each path
+        t_time = float(self.times([t])[0])
+        maturity_times = self.times(maturities)
+        if np.any(maturity_times < t_time):
+            raise ValueError("Maturities cannot be before the simulation date!")
+        forward_dfs, B = self._bond_terms(t, t_time, maturities, maturity_times)
+        return forward_dfs*np.exp(-np.outer(np.asarray(x, dtype=float), B))
+
+    def _bond_terms(self, t: date, t_time: float, maturities: Sequence[date] | np.ndarray, maturity_times: np.ndarray):
+        #helper returning the deterministic factor P(0,T)/P(0,t)*exp(0.5*(V(t,T) - V(0,T) + V(0,t))) and B(t,T) of each maturity
+        forward_dfs = self.curve.dfs(maturities)/self.curve.df(t)
+        convexity = 0.5*(self.V(t_time, maturity_times) - self.V(0.0, maturity_times) + self.V(0.0, t_time))
+        return forward_dfs*np.exp(convexity), self.B(t_time, maturity_times)
+
+def exposure_cashflows(instruments: Mapping[int | str, Bond | FRA | list[tuple[date, float]]]):
+    #function converting a mapping of trade id -> Bond, FRA or list of (date, amount) cashflows (e.g. a fixed leg) into columnar cashflows for exposure simulation
+    #returns numpy arrays of payment date ordinals, amounts, trade ids and expiry date ordinals, a cashflow counts towards a trade's value at dates before its expiry
+    #a cashflow expires when paid, except that an FRA is replaced by the two cashflows with the same value, sign*N at the start date and -sign*N*(1+tau*K) at the end date, which both expire when the FRA settles at its start date
+    payment_dates = []
+    amounts = []
+    trade_ids = []
+    expiry_dates = []
+    for trade_id, instrument in instruments.items():
+        if isinstance(instrument, Bond):
+            cashflows = [(payment_date, amount, payment_date) for payment_date, amount in instrument.build_bond_cashflows()]
+        elif isinstance(instrument, FRA):
+            sign = 1.0 if instrument.pay_fixed else -1.0
+            year_fraction = year_fraction_computation(instrument.start_date, instrument.end_date, instrument.convention)
+            cashflows = [(instrument.start_date, sign*instrument.notional, instrument.start_date), (instrument.end_date, -sign*instrument.notional*(1+year_fraction*instrument.strike_rate), instrument.start_date)]
+        else:
+            cashflows = [(payment_date, amount, payment_date) for payment_date, amount in instrument]
+        for payment_date, amount, expiry_date in cashflows:
+            payment_dates.append(payment_date.toordinal())
+            amounts.append(amount)
+            trade_ids.append(trade_id)
+            expiry_dates.append(expiry_date.toordinal())
+    return np.array(payment_dates, dtype=np.int64), np.array(amounts, dtype=float), np.array(trade_ids), np.array(expiry_dates, dtype=np.int64)
+
+#the netted value at an exposure date, sum_d c_d*exp(-B_d*x), is a smooth function of x alone, so for many paths it is evaluated at Chebyshev nodes spanning the simulated x and interpolated
+#as a sum of exponentials its Chebyshev series converges faster than geometrically, with degree _CHEBYSHEV_DEGREE it is exact to rounding while the spread of B*x is below _CHEBYSHEV_MAX_SPREAD
+_CHEBYSHEV_DEGREE = 40
+_CHEBYSHEV_MAX_SPREAD = 8.0
+_CHEBYSHEV_NODES = np.polynomial.chebyshev.chebpts1(_CHEBYSHEV_DEGREE + 1)
+_CHEBYSHEV_FIT = np.linalg.inv(np.polynomial.chebyshev.chebvander(_CHEBYSHEV_NODES, _CHEBYSHEV_DEGREE))
+
+def _netted_values(x: np.ndarray, B: np.ndarray, coefficients: np.ndarray):
+    #helper returning sum_d coefficients_d*exp(-B_d*x) for each x
+    lower, upper = float(x.min()), float(x.max())
+    half_width = (upper - lower)/2
+    if len(x) <= 2*_CHEBYSHEV_DEGREE or half_width*float(np.abs(B).max()) > _CHEBYSHEV_MAX_SPREAD:
+        return np.exp(-np.outer(x, B)) @ coefficients
+    if half_width == 0:
+        return np.full(len(x), np.exp(-lower*B) @ coefficients)
+    centre = (upper + lower)/2
+    node_values = np.exp(-np.outer(centre + half_width*_CHEBYSHEV_NODES, B)) @ coefficients
+    series = _CHEBYSHEV_FIT @ node_values
+    return np.polynomial.chebyshev.chebval((x - centre)/half_width, series)
+
+class ExposureProfile(NamedTuple):
+#result record of simulate_exposure
+#expected_exposure and potential_future_exposure hold E[max(V, 0)] and the quantile of V at each exposure date, expected_positive_exposure is the time average of the expected exposure up to the final date
+    exposure_dates: list[date]
+    times: np.ndarray
+    mean_value: np.ndarray
+    expected_exposure: np.ndarray
+    potential_future_exposure: np.ndarray
+    expected_positive_exposure: float
+    quantile: float
+    paths: int
+
+class ExposureSimulator:
+#class valuing a portfolio of columnar cashflows (see exposure_cashflows) on simulated Hull-White paths at a grid of exposure dates
+#the deterministic part of every bond price is computed once per exposure date and payment date, so valuing a batch of paths is one matrix product per exposure date
+    def __init__(self, model: HullWhiteModel, payment_dates: np.ndarray, amounts: np.ndarray, trade_ids: np.ndarray, expiry_dates: np.ndarray, exposure_dates: Sequence[date]):
+        payment_dates = np.asarray(payment_dates, dtype=np.int64)
+        amounts = np.asarray(amounts, dtype=float)
+        trade_ids = np.asarray(trade_ids)
+        expiry_dates = np.asarray(expiry_dates, dtype=np.int64)
+
+        #validation checks
+        if len(payment_dates) == 0:
+            raise ValueError("Cash flows are empty!")
+        if not len(payment_dates) == len(amounts) == len(trade_ids) == len(expiry_dates):
+            raise ValueError("Each cash flow must have a payment date, an amount, a trade id and an expiry date!")
+        if np.any(expiry_dates > payment_dates):
+            raise ValueError("Cash flows cannot expire after their payment date!")
+        exposure_ordinals = to_ordinals(exposure_dates)
+        if len(exposure_ordinals) == 0 or exposure_ordinals[0] <= model.curve.valuation_date.toordinal() or np.any(np.diff(exposure_ordinals) <= 0):
+            raise ValueError("Exposure dates must be strictly increasing and after the valuation date!")
+
+        self.model = model
+        self.exposure_dates = list(exposure_dates)
+        self.times = model.times(exposure_ordinals)
+        self._expiry_dates = expiry_dates
+        self._amounts = amounts
+        self.trade_ids, self._trade_index = np.unique(trade_ids, return_inverse=True)
+        self._distinct_payment_dates, self._payment_date_index = np.unique(payment_dates, return_inverse=True)
+
+        #for each exposure date, the payment dates of live cashflows with the deterministic bond price factor and B of each, and the netted amount due on each
+        self._plans = []
+        for exposure_date, ordinal, t_time in zip(self.exposure_dates, exposure_ordinals.tolist(), self.times.tolist()):
+            live = expiry_dates > ordinal
+            date_indices = np.unique(self._payment_date_index[live])
+            maturities = self._distinct_payment_dates[date_indices]
+            factors, B = model._bond_terms(date.fromordinal(ordinal), t_time, maturities, model.times(maturities))
+            netted_amounts = np.bincount(self._payment_date_index[live], weights=amounts[live], minlength=len(self._distinct_payment_dates))[date_indices]
+            self._plans.append((live, date_indices, factors, B, netted_amounts*factors))
+
+    def path_values(self, x: np.ndarray):
+        #method returning the netted portfolio value on each path at each exposure date, as a (paths x exposure dates) array
+        #x is a (paths x exposure dates) array of simulated x values, e.g. from HullWhiteModel.simulate at self.times
+        values = np.zeros(x.shape)
+        for j, (_, date_indices, _, B, coefficients) in enumerate(self._plans):
+            if len(date_indices):
+                values[:, j] = _netted_values(x[:, j], B, coefficients)
+        return values
+
+    def trade_values(self, x: np.ndarray, exposure_index: int):
+        #method returning the value of every trade (in the order of self.trade_ids) on each path at one exposure date, as a (paths x trades) array
+        #x is a (paths x exposure dates) array of simulated x values, memory is of the order of paths x live cashflows
+        live, date_indices, factors, B, _ = self._plans[exposure_index]
+        values = np.zeros((x.shape[0], len(self.trade_ids)))
+        if not len(date_indices):
+            return values
+        bond_prices = np.zeros((x.shape[0], len(self._distinct_payment_dates)))
+        bond_prices[:, date_indices] = factors*np.exp(-np.outer(x[:, exposure_index], B))
+
+        #discount the live cashflows ordered by trade, then sum each trade's segment
+        live_cashflows = np.flatnonzero(live)
+        live_cashflows = live_cashflows[np.argsort(self._trade_index[live_cashflows], kind="stable")]
+        live_trades, trade_starts = np.unique(self._trade_index[live_cashflows], return_index=True)
+        discounted_cashflows = bond_prices[:, self._payment_date_index[live_cashflows]]*self._amounts[live_cashflows]
+        values[:, live_trades] = np.add.reduceat(discounted_cashflows, trade_starts, axis=1)
+        return values
+
+    def simulate(self, paths: int, chunk_size: int = 1000, seed: int | None = None):
+        #generator of (paths x exposure dates) arrays of netted portfolio values, for batches of at most chunk_size paths
+        #the batches are drawn from one generator, so for a given seed the paths do not depend on chunk_size
+        if paths <= 0 or chunk_size <= 0:
+            raise ValueError("The number of paths and the chunk size must be greater than 0.")
+        rng = np.random.default_rng(seed)
+        for start in range(0, paths, chunk_size):
+            x = self.model.simulate(self.times, min(chunk_size, paths - start), rng)
+            yield self.path_values(x)
+
+def simulate_exposure(model: HullWhiteModel, instruments: Mapping[int | str, Bond | FRA | list[tuple[date, float]]], exposure_dates: Sequence[date], paths: int = 10000, chunk_size: int = 1000, seed: int | None = None, quantile: float = 0.95):
+    #function simulating the netted value of a portfolio of bonds, FRAs and cashflow lists (e.g. fixed legs) at a grid of exposure dates, returned as an ExposureProfile
+    #values are not discounted back to the valuation date, and only the (paths x exposure dates) netted values are kept, so memory is bounded by chunk_size rather than by the portfolio size times the number of paths
+    if not 0 < quantile < 1:
+        raise ValueError("Quantile must be between 0 and 1.")
+    simulator = ExposureSimulator(model, *exposure_cashflows(instruments), exposure_dates)
+    values = np.empty((paths, len(simulator.exposure_dates)))
+    start = 0
+    for chunk_values in simulator.simulate(paths, chunk_size, seed):
+        values[start:start + len(chunk_values)] = chunk_values
+        start += len(chunk_values)
+
+    expected_exposure = np.maximum(values, 0).mean(axis=0)
+    time_steps = np.diff(np.concatenate(([0.0], simulator.times)))
+    expected_positive_exposure = float((expected_exposure*time_steps).sum()/simulator.times[-1])
+    return ExposureProfile(simulator.exposure_dates, simulator.times, values.mean(axis=0), expected_exposure, np.quantile(values, quantile, axis=0), expected_positive_exposure, quantile, paths)
@@ -1,7 +1,11 @@
 from datetime import date
-from derivative_valuations.df_curve.discount_factor import DiscountCurve
+from typing import NamedTuple
+from collections.abc import Sequence
+import numpy as np
+from derivative_valuations.daycount_conventions.daycount import year_fractions
+from derivative_valuations.df_curve.discount_factor import DiscountCurve, ShiftedCurve
 
-def pv(cashflows: list[tuple[date, float]], curve: DiscountCurve):
+def pv(cashflows: list[tuple[date, float]], curve: DiscountCurve | ShiftedCurve):
     #function to compute present value of future cash flows from a discount factor given on the curve
     pv = 0.0
 
@@ -14,11 +18,11 @@ def pv(cashflows: list[tuple[date, float]], curve: DiscountCurve):
         pv = pv + curve.df(cashflow[0])*cashflow[1]
     return pv
 
-def DV01(cashflows: list[tuple[date, float]], curve: DiscountCurve, bp: float, absolute: bool = False):
+def DV01(cashflows: list[tuple[date, float]], curve: DiscountCurve | ShiftedCurve, bp: float, absolute: bool = False):
     #compute DV01 (numerical approximation) given a set of cashflows, a curve and a basis point bump
     #optionally compute as absolute
-    #first bump curve
-    bumped_curve = curve.bump_curve(bp)
+    #first shift curve, using a view rather than copying it
+    bumped_curve = curve.shifted(bp)
     #bumped pv less base pv
     DV01 = pv(cashflows, bumped_curve) - pv(cashflows, curve)
     if absolute == True:
@@ -26,16 +30,173 @@ def DV01(cashflows: list[tuple[date, float]], curve: DiscountCurve, bp: float, a
     else:
         return DV01
     
-def convexity(cashflows: list[tuple[date, float]], curve: DiscountCurve, bp: float, absolute: bool = False):
+def convexity(cashflows: list[tuple[date, float]], curve: DiscountCurve | ShiftedCurve, bp: float, absolute: bool = False):
     #compute convexity (numerical approximation) given a set of cashflows, a curve and a basis point bump
     #optionally compute as absolute
-    #first bump curve by a positive and negative bp
-    bumped_curve_positive = curve.bump_curve(bp)
-    bumped_curve_negative = curve.bump_curve(-bp)
+    #first shift curve by a positive and negative bp, using views rather than copying it
+    bumped_curve_positive = curve.shifted(bp)
+    bumped_curve_negative = curve.shifted(-bp)
 
-    #convexity via numerical approximation formula
-    convexity = (pv(cashflows, bumped_curve_positive) - 2*pv(cashflows, curve) + pv(cashflows, bumped_curve_negative))/(pv(cashflows, curve)*(bp^2))
+    #convexity via numerical approximation formula, computing the base pv once
+    base_pv = pv(cashflows, curve)
+    convexity = (pv(cashflows, bumped_curve_positive) - 2*base_pv + pv(cashflows, bumped_curve_negative))/(base_pv*(bp**2))
     if absolute == True:
         return abs(convexity)
     else:
-        return convexity
\ No newline at end of file
+        return convexity
+
+def columnar_cashflows(trade_cashflows: dict):
+    #function converting a dictionary of trade id -> list of (date, amount) cashflows into the columnar form used by pv_many
+    #returns numpy arrays of payment date ordinals, amounts and trade ids
+    payment_dates = []
+    amounts = []
+    trade_ids = []
+    for trade_id, cashflows in trade_cashflows.items():
+        for payment_date, amount in cashflows:
+            payment_dates.append(payment_date.toordinal())
+            amounts.append(amount)
+            trade_ids.append(trade_id)
+    return np.array(payment_dates, dtype=np.int64), np.array(amounts, dtype=float), np.array(trade_ids)
+
+def pv_many(payment_dates: np.ndarray, amounts: np.ndarray, trade_ids: np.ndarray, curve: DiscountCurve | ShiftedCurve):
+    #function to compute the present value of every trade in a portfolio of columnar cashflows, i.e. equal length arrays of payment date ordinals, amounts and trade ids
+    #each distinct payment date is discounted once, then the discounted cashflows are summed per trade
+    #returns numpy arrays of the distinct trade ids (sorted) and their present values
+    payment_dates = np.asarray(payment_dates, dtype=np.int64)
+    amounts = np.asarray(amounts, dtype=float)
+    trade_ids = np.asarray(trade_ids)
+
+    #validation checks
+    if len(payment_dates) == 0:
+        raise ValueError("Cash flows are empty!")
+    if not len(payment_dates) == len(amounts) == len(trade_ids):
+        raise ValueError("Each cash flow must have a payment date, an amount and a trade id!")
+
+    #discount each distinct payment date once
+    distinct_payment_dates, payment_date_index = np.unique(payment_dates, return_inverse=True)
+    dfs = curve.dfs(distinct_payment_dates)
+
+    #segmented sum of the discounted cashflows by trade
+    distinct_trade_ids, trade_index = np.unique(trade_ids, return_inverse=True)
+    pvs = np.bincount(trade_index, weights=amounts*dfs[payment_date_index], minlength=len(distinct_trade_ids))
+    return distinct_trade_ids, pvs
+
+class Greeks(NamedTuple):
+#result record of greeks and greeks_many, holding the present value and a DV01 and convexity for each bump size (in basis points)
+#for greeks_many each value is a numpy array with one entry per trade
+    pv: float | np.ndarray
+    bumps: tuple[float, ...]
+    scheme: str
+    DV01: tuple
+    convexity: tuple
+
+#finite difference schemes for greeks, as the multiples of the bump at which the present value is needed for the DV01 and for the convexity (each includes the base present value)
+#forward gives the same DV01 as DV01, central gives the same convexity as convexity
+_GREEKS_SCHEMES = {
+    "forward": ((1, 0), (2, 1, 0)),
+    "backward": ((0, -1), (0, -1, -2)),
+    "central": ((1, -1), (1, 0, -1)),
+}
+
+def _greeks_from_columns(payment_dates: np.ndarray, amounts: np.ndarray, segment_index: np.ndarray, segment_count: int, curve: DiscountCurve | ShiftedCurve, bumps: tuple[float, ...], scheme: str):
+    #helper computing the present values of each segment (e.g. trade) at every shift needed by the scheme, from one set of discount factors and year fractions
+    #a parallel zero rate shift s multiplies each discount factor by exp(-s*t) (see ShiftedCurve), so no shifted curves are built
+    if scheme not in _GREEKS_SCHEMES:
+        raise ValueError("The finite difference scheme must be one of forward, backward or central.")
+    dv01_multiples, convexity_multiples = _GREEKS_SCHEMES[scheme]
+
+    #discount each distinct payment date once
+    distinct_payment_dates, payment_date_index = np.unique(payment_dates, return_inverse=True)
+    dfs = curve.dfs(distinct_payment_dates)
+    t = year_fractions(curve.valuation_date, np.maximum(distinct_payment_dates, curve.valuation_date.toordinal()), curve.convention)
+
+    #present value of each segment at every shift needed
+    shifts = sorted({multiple*bp for bp in bumps for multiple in dv01_multiples + convexity_multiples})
+    shift_factors = np.exp(-np.outer(np.array(shifts)/10000, t))
+    discounted = (dfs*shift_factors)[:, payment_date_index]*amounts
+    shifted_pvs = np.stack([np.bincount(segment_index, weights=row, minlength=segment_count) for row in discounted])
+    pvs = {shift: shifted_pvs[i] for i, shift in enumerate(shifts)}
+
+    #finite differences for every bump size
+    base_pv = pvs[0.0]
+    DV01s = []
+    convexities = []
+    for bp in bumps:
+        up, down = dv01_multiples
+        DV01s.append((pvs[up*bp] - pvs[down*bp])/(up - down))
+        first, middle, last = convexity_multiples
+        with np.errstate(divide="ignore", invalid="ignore"):
+            convexities.append((pvs[first*bp] - 2*pvs[middle*bp] + pvs[last*bp])/(base_pv*(bp**2)))
+    return base_pv, tuple(DV01s), tuple(convexities)
+
+def _validate_bumps(bumps: float | Sequence[float]):
+    #helper converting bumps to a tuple of bump sizes and checking them
+    bumps = (float(bumps),) if np.isscalar(bumps) else tuple(float(bp) for bp in bumps)
+    if not bumps:
+        raise ValueError("At least one bump size is required!")
+    if any(bp == 0 for bp in bumps):
+        raise ValueError("Bump sizes must not be 0.")
+    return bumps
+
+def greeks(cashflows: list[tuple[date, float]], curve: DiscountCurve | ShiftedCurve, bumps: float | Sequence[float] = 1.0, scheme: str = "central"):
+    #compute present value, DV01 and convexity for one or more basis point bump sizes in one pass, returned as a Greeks record
+    #scheme is one of forward (bumps up), backward (bumps down) or central (bumps both ways), the central DV01 is the average of the up and down DV01s
+    #validation checks
+    if not cashflows:
+        raise ValueError("Cash flows are empty!")
+    bumps = _validate_bumps(bumps)
+
+    payment_dates = np.array([cashflow[0].toordinal() for cashflow in cashflows], dtype=np.int64)
+    amounts = np.array([cashflow[1] for cashflow in cashflows], dtype=float)
+    base_pv, DV01s, convexities = _greeks_from_columns(payment_dates, amounts, np.zeros(len(cashflows), dtype=np.int64), 1, curve, bumps, scheme)
+    return Greeks(float(base_pv[0]), bumps, scheme, tuple(float(DV01[0]) for DV01 in DV01s), tuple(float(convexity[0]) for convexity in convexities))
+
+def greeks_many(payment_dates: np.ndarray, amounts: np.ndarray, trade_ids: np.ndarray, curve: DiscountCurve | ShiftedCurve, bumps: float | Sequence[float] = 1.0, scheme: str = "central"):
+    #portfolio counterpart of greeks for columnar cashflows (see pv_many)
+    #returns numpy arrays of the distinct trade ids (sorted) and a Greeks record of per-trade arrays
+    payment_dates = np.asarray(payment_dates, dtype=np.int64)
+    amounts = np.asarray(amounts, dtype=float)
+    trade_ids = np.asarray(trade_ids)
+
+    #validation checks
+    if len(payment_dates) == 0:
+        raise ValueError("Cash flows are empty!")
+    if not len(payment_dates) == len(amounts) == len(trade_ids):
+        raise ValueError("Each cash flow must have a payment date, an amount and a trade id!")
+    bumps = _validate_bumps(bumps)
+
+    distinct_trade_ids, trade_index = np.unique(trade_ids, return_inverse=True)
+    base_pv, DV01s, convexities = _greeks_from_columns(payment_dates, amounts, trade_index, len(distinct_trade_ids), curve, bumps, scheme)
+    return distinct_trade_ids, Greeks(base_pv, bumps, scheme, DV01s, convexities)
+
+def pillar_sensitivities(cashflows: list[tuple[date, float]], curve: DiscountCurve):
+    #compute d(PV)/d(zero rate) for the zero rate at every known date of the curve in a single pass (continuous compounding, as in bump_curve)
+    #each discount factor is exp(w_0*log(df_i_0) + w_1*log(df_i_1)) and log(df_i) = -zero_rate_i*t_i, so d(df)/d(zero_rate_i) = -df*w*t_i
+    #returns a numpy array aligned with curve.interpolation_dates
+    
+    #validation checks
+    if not cashflows:
+        raise ValueError("Cash flows are empty!")
+
+    payment_dates = [cashflow[0] for cashflow in cashflows]
+    amounts = np.array([cashflow[1] for cashflow in cashflows], dtype=float)
+
+    #discount factors and interpolation weights of every cashflow
+    dfs = curve.dfs(payment_dates)
+    i_0, i_1, w_0, w_1 = curve.pillar_weights(payment_dates)
+    pillar_year_fractions = np.array(curve.interpolation_year_fractions, dtype=float)
+
+    #accumulate the adjoint of each cashflow onto the two known dates it depends on
+    sensitivities = np.zeros(len(pillar_year_fractions))
+    np.add.at(sensitivities, i_0, -amounts*dfs*w_0*pillar_year_fractions[i_0])
+    np.add.at(sensitivities, i_1, -amounts*dfs*w_1*pillar_year_fractions[i_1])
+    return sensitivities
+
+def bucketed_DV01(cashflows: list[tuple[date, float]], curve: DiscountCurve, bp: float, absolute: bool = False):
+    #compute DV01 for a bump of bp basis points to the zero rate at each known date of the curve separately (first order, without revaluing)
+    #the buckets sum to the first order parallel DV01
+    bucketed_DV01 = pillar_sensitivities(cashflows, curve)*(bp/10000)
+    if absolute == True:
+        return np.abs(bucketed_DV01)
+    else:
+        return bucketed_DV01
@@ -0,0 +1,149 @@
+from collections.abc import Mapping
+import numpy as np
+from derivative_valuations.df_curve.discount_factor import DiscountCurve
+
+#incremental repricing of a portfolio of columnar cashflows (see pv_many) when known discount factors of the curve move
+#under log DF interpolation the discount factor at a payment date depends only on the two known dates either side of it (the final two when extrapolating)
+#so the payment dates are indexed by the known dates they depend on, and a pillar update only rediscounts the cashflows on its neighbouring segments, applying the change to each trade's present value and the portfolio total
+
+class IncrementalRepricer:
+#class holding the present values of a portfolio against a curve, kept up to date as the curve's known discount factors are updated
+#the curve's known dates are fixed, a curve with different known dates needs a new repricer
+#present values are updated by adding deltas, so after very many updates they can differ from a full revaluation by rounding, revalue recomputes them from scratch
+    def __init__(self, payment_dates: np.ndarray, amounts: np.ndarray, trade_ids: np.ndarray, curve: DiscountCurve):
+        payment_dates = np.asarray(payment_dates, dtype=np.int64)
+        amounts = np.asarray(amounts, dtype=float)
+        trade_ids = np.asarray(trade_ids)
+
+        #validation checks
+        if len(payment_dates) == 0:
+            raise ValueError("Cash flows are empty!")
+        if not len(payment_dates) == len(amounts) == len(trade_ids):
+            raise ValueError("Each cash flow must have a payment date, an amount and a trade id!")
+
+        self.valuation_date = curve.valuation_date
+        self.convention = curve.convention
+        self.interpolation_dates = list(curve.interpolation_dates)
+        self.interpolation_year_fractions = list(curve.interpolation_year_fractions)
+        self.interpolation_dfs = list(curve.interpolation_dfs)
+        self._curve = curve
+
+        #distinct payment dates in date order, with the cashflows reordered by payment date so those of consecutive dates are contiguous
+        distinct_payment_dates, payment_date_index = np.unique(payment_dates, return_inverse=True)
+        order = np.argsort(payment_date_index, kind="stable")
+        self._distinct_payment_dates = distinct_payment_dates
+        self._payment_date_index = payment_date_index[order]
+        self._amounts = amounts[order]
+        self.trade_ids, trade_index = np.unique(trade_ids, return_inverse=True)
+        self._trade_index = trade_index[order]
+        self._cashflow_starts = np.concatenate(([0], np.cumsum(np.bincount(payment_date_index, minlength=len(distinct_payment_dates)))))
+
+        #interpolation weights of every distinct payment date, dates on or before the valuation date have both weights 0 (df 1) and depend on no known date
+        self._i_0, self._i_1, self._w_0, self._w_1 = curve.pillar_weights(distinct_payment_dates)
+        settled = (self._w_0 == 0) & (self._w_1 == 0)
+
+        #the known date indices grow with the payment date, so the dates depending on each known date lie within one range, from the first to the last date using it
+        #(a range can also hold dates not depending on the known date, e.g. the final known date itself within the range of the known date before it, whose extrapolated dates come after it, recomputing those changes nothing)
+        #this gives a compressed index from each known date to the payment dates, and so the cashflows, to rediscount when it moves
+        pillar_count = len(self.interpolation_dfs)
+        active_dates = np.flatnonzero(~settled)
+        self._date_starts = np.full(pillar_count, len(distinct_payment_dates), dtype=np.int64)
+        self._date_stops = np.zeros(pillar_count, dtype=np.int64)
+        for pillar_index in (self._i_0[active_dates], self._i_1[active_dates]):
+            np.minimum.at(self._date_starts, pillar_index, active_dates)
+            np.maximum.at(self._date_stops, pillar_index, active_dates + 1)
+
+        self.revalue()
+
+    def _discount_factors(self, start: int, stop: int):
+        #helper computing the discount factors of distinct payment dates start to stop from the current known discount factors
+        log_dfs = self._log_dfs
+        return np.exp(self._w_0[start:stop]*log_dfs[self._i_0[start:stop]] + self._w_1[start:stop]*log_dfs[self._i_1[start:stop]])
+
+    def revalue(self):
+        #method recomputing the discount factors and every present value from the current known discount factors, returning the portfolio total
+        self._log_dfs = np.log(np.array(self.interpolation_dfs, dtype=float))
+        self._dfs = self._discount_factors(0, len(self._w_0))
+        self.pvs = np.bincount(self._trade_index, weights=self._amounts*self._dfs[self._payment_date_index], minlength=len(self.trade_ids))
+        self.total_pv = float(self.pvs.sum())
+        return self.total_pv
+
+    def _dependent_dates(self, pillar: int):
+        #helper returning the indices of the distinct payment dates whose discount factor depends on a known date, given by its index
+        dates = np.arange(self._date_starts[pillar], max(self._date_stops[pillar], self._date_starts[pillar]))
+        depends = ((self._i_0[dates] == pillar) & (self._w_0[dates] != 0)) | ((self._i_1[dates] == pillar) & (self._w_1[dates] != 0))
+        return dates[depends]
+
+    def affected_dates(self, pillar: int):
+        #method returning the ordinals of the distinct payment dates whose discount factor depends on a known date, given by its index
+        return self._distinct_payment_dates[self._dependent_dates(pillar)]
+
+    def affected_trades(self, pillar: int):
+        #method returning the ids of the trades whose present value depends on a known date, given by its index
+        dates = self._dependent_dates(pillar)
+        if len(dates) == 0:
+            return self.trade_ids[:0]
+        first, last = self._cashflow_starts[dates[0]], self._cashflow_starts[dates[-1] + 1]
+        cashflows = np.isin(self._payment_date_index[first:last], dates)
+        return self.trade_ids[np.unique(self._trade_index[first:last][cashflows])]
+
+    def update_pillars(self, pillar_dfs: Mapping[int, float]):
+        #method setting the discount factors of known dates, given as a mapping of known date index -> discount factor
+        #only the cashflows on the segments next to the updated known dates are rediscounted, returns the change in the portfolio total
+        if not pillar_dfs:
+            return 0.0
+        pillars = sorted(pillar_dfs)
+        if pillars[0] < 0 or pillars[-1] >= len(self.interpolation_dfs):
+            raise ValueError("Known date index is out of range!")
+        if any(pillar_dfs[pillar] <= 0 for pillar in pillars):
+            raise ValueError("Discount factors must be greater than 0.")
+
+        for pillar in pillars:
+            self.interpolation_dfs[pillar] = float(pillar_dfs[pillar])
+            self._log_dfs[pillar] = np.log(self.interpolation_dfs[pillar])
+        self._curve = None
+
+        #merge the date ranges of the updated known dates, neighbouring known dates share a segment so their ranges overlap
+        ranges = []
+        for pillar in pillars:
+            start, stop = int(self._date_starts[pillar]), int(self._date_stops[pillar])
+            if start >= stop:
+                continue
+            if ranges and start <= ranges[-1][1]:
+                ranges[-1][1] = max(ranges[-1][1], stop)
+            else:
+                ranges.append([start, stop])
+
+        change = 0.0
+        for start, stop in ranges:
+            #rediscount the affected dates and apply the change in value of their cashflows to each trade
+            new_dfs = self._discount_factors(start, stop)
+            df_changes = new_dfs - self._dfs[start:stop]
+            self._dfs[start:stop] = new_dfs
+            first, last = self._cashflow_starts[start], self._cashflow_starts[stop]
+            cashflow_changes = self._amounts[first:last]*df_changes[self._payment_date_index[first:last] - start]
+            np.add.at(self.pvs, self._trade_index[first:last], cashflow_changes)
+            change += float(cashflow_changes.sum())
+        self.total_pv += change
+        return change
+
+    def update_pillar(self, pillar: int, df: float):
+        #method setting the discount factor of one known date, given by its index, returns the change in the portfolio total
+        return self.update_pillars({pillar: df})
+
+    def update_curve(self, curve: DiscountCurve):
+        #method moving the repricer onto a curve with the same known dates, only updating the known discount factors that changed
+        #returns the change in the portfolio total
+        if curve.valuation_date != self.valuation_date or curve.convention != self.convention or list(curve.interpolation_dates) != self.interpolation_dates:
+            raise ValueError("The curve must have the same valuation date, convention and known dates as the repricer!")
+        changed = {i: df for i, (df, current_df) in enumerate(zip(curve.interpolation_dfs, self.interpolation_dfs)) if df != current_df}
+        change = self.update_pillars(changed)
+        self._curve = curve
+        return change
+
+    @property
+    def curve(self):
+        #the curve of the current known discount factors, built when first needed after an update
+        if self._curve is None:
+            self._curve = DiscountCurve._from_pillars(self.valuation_date, list(self.interpolation_dates), list(self.interpolation_dfs), list(self.interpolation_year_fractions), self.convention)
+        return self._curve
@@ -0,0 +1,113 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import numpy as np
+from derivative_valuations.df_curve.discount_factor import DiscountCurve
+
+#numpy views onto the shared memory blocks, set up once in each worker process by _attach_shared_arrays
+_worker_arrays = {}
+_worker_blocks = []
+
+def _scenario_pvs(arrays: dict, start: int, stop: int):
+    #helper computing trade present values for scenarios start to stop, writing them into arrays["pvs"]
+    #every zero rate shock shifts a log discount factor by -shock*t, so the log discount factor at a payment date moves by -(w_0*shock_i_0*t_i_0 + w_1*shock_i_1*t_i_1)
+    shocks = arrays["pillar_shocks"][start:stop]/10000
+    shifts = shocks[:, arrays["i_0"]]*arrays["w_0_t_0"] + shocks[:, arrays["i_1"]]*arrays["w_1_t_1"]
+    scenario_dfs = arrays["base_dfs"]*np.exp(-shifts)
+
+    #discount the cashflows (ordered by trade) and sum each trade's segment
+    discounted_cashflows = scenario_dfs[:, arrays["payment_date_index"]]*arrays["amounts"]
+    arrays["pvs"][start:stop] = np.add.reduceat(discounted_cashflows, arrays["trade_starts"], axis=1)
+
+def _attach_shared_arrays(specs: dict):
+    #worker initializer attaching to the shared memory blocks created by scenario_pnl, so no arrays are pickled per task
+    for name, (block_name, shape, dtype) in specs.items():
+        block = shared_memory.SharedMemory(name=block_name)
+        _worker_blocks.append(block)
+        _worker_arrays[name] = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+
+def _run_scenarios(start: int, stop: int):
+    #worker task for a range of scenarios
+    _scenario_pvs(_worker_arrays, start, stop)
+    return stop - start
+
+def scenario_pnl(curve: DiscountCurve, pillar_shocks: np.ndarray, payment_dates: np.ndarray, amounts: np.ndarray, trade_ids: np.ndarray, processes: int | None = None, scenarios_per_task: int = 64):
+    #function for revaluing a portfolio of columnar cashflows (see pv_many) under many scenarios of shocks to the zero rates at the known dates of the curve
+    #pillar_shocks is a (scenarios x known dates) array of zero rate shocks in basis points (continuous compounding, as in bump_curve)
+    #the scenarios are shared out over a pool of processes, with the curve, cashflow and output arrays held in shared memory
+    #returns numpy arrays of the distinct trade ids (sorted) and the (scenarios x trades) matrix of PnL against the unshocked curve
+    pillar_shocks = np.atleast_2d(np.asarray(pillar_shocks, dtype=float))
+    payment_dates = np.asarray(payment_dates, dtype=np.int64)
+    amounts = np.asarray(amounts, dtype=float)
+    trade_ids = np.asarray(trade_ids)
+
+    #validation checks
+    if len(payment_dates) == 0:
+        raise ValueError("Cash flows are empty!")
+    if not len(payment_dates) == len(amounts) == len(trade_ids):
+        raise ValueError("Each cash flow must have a payment date, an amount and a trade id!")
+    if pillar_shocks.shape[1] != len(curve.interpolation_dates):
+        raise ValueError("Each scenario must have a shock for every known date of the curve!")
+    if scenarios_per_task <= 0:
+        raise ValueError("The number of scenarios per task must be greater than 0.")
+    if processes is None:
+        processes = os.cpu_count() or 1
+    if processes <= 0:
+        raise ValueError("The number of processes must be greater than 0.")
+
+    #order the cashflows by trade so each trade is a contiguous segment
+    distinct_trade_ids, trade_index = np.unique(trade_ids, return_inverse=True)
+    order = np.argsort(trade_index, kind="stable")
+    trade_starts = np.searchsorted(trade_index[order], np.arange(len(distinct_trade_ids)))
+
+    #base discount factors and interpolation weights of each distinct payment date, computed once
+    distinct_payment_dates, payment_date_index = np.unique(payment_dates[order], return_inverse=True)
+    i_0, i_1, w_0, w_1 = curve.pillar_weights(distinct_payment_dates)
+    pillar_year_fractions = np.array(curve.interpolation_year_fractions, dtype=float)
+
+    arrays = {
+        "pillar_shocks": np.vstack([np.zeros(pillar_shocks.shape[1]), pillar_shocks]),
+        "i_0": i_0,
+        "i_1": i_1,
+        "w_0_t_0": w_0*pillar_year_fractions[i_0],
+        "w_1_t_1": w_1*pillar_year_fractions[i_1],
+        "base_dfs": curve.dfs(distinct_payment_dates),
+        "payment_date_index": payment_date_index,
+        "amounts": amounts[order],
+        "trade_starts": trade_starts,
+        "pvs": np.zeros((pillar_shocks.shape[0]+1, len(distinct_trade_ids))),
+    }
+    scenario_count = len(arrays["pillar_shocks"])
+    tasks = [(start, min(start+scenarios_per_task, scenario_count)) for start in range(0, scenario_count, scenarios_per_task)]
+
+    if processes == 1 or len(tasks) == 1:
+        #no pool needed, run in this process
+        for start, stop in tasks:
+            _scenario_pvs(arrays, start, stop)
+        pvs = arrays["pvs"]
+    else:
+        #copy the arrays into shared memory blocks which the workers attach to once
+        blocks = []
+        shared_arrays = {}
+        try:
+            specs = {}
+            for name, array in arrays.items():
+                block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+                blocks.append(block)
+                shared_arrays[name] = np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)
+                shared_arrays[name][...] = array
+                specs[name] = (block.name, array.shape, array.dtype.str)
+
+            with ProcessPoolExecutor(max_workers=min(processes, len(tasks)), initializer=_attach_shared_arrays, initargs=(specs,)) as executor:
+                for _ in executor.map(_run_scenarios, *zip(*tasks)):
+                    pass
+            pvs = shared_arrays["pvs"].copy()
+        finally:
+            #release the views before closing the blocks
+            shared_arrays.clear()
+            for block in blocks:
+                block.close()
+                block.unlink()
+
+    #the first row holds the unshocked present values
+    return distinct_trade_ids, pvs[1:] - pvs[0]
@@ -0,0 +1,178 @@
+import csv
+import queue
+import threading
+from datetime import date
+from collections.abc import Callable, Iterable, Iterator
+import numpy as np
+from derivative_valuations.payment_schedule.accrual_period_payment_schedule import generate_schedule
+from derivative_valuations.cashflows.cash_flow import build_fixed_leg_cashflows, build_bond_cashflows
+from derivative_valuations.df_curve.discount_factor import DiscountCurve, ShiftedCurve
+from derivative_valuations.valuation.present_value import _greeks_from_columns
+
+#streaming valuation of trade files too large to hold in memory
+#trades are read in chunks, expanded into schedules and cashflows, then discounted, and the results are written out one chunk at a time
+#the read, expand and price stages run concurrently and are linked by bounded queues, so a slow stage holds back the ones before it and at most a fixed number of chunks are in memory
+
+#required columns of a trade file, dates are ISO formatted (YYYY-MM-DD) and frequency is the number of months between payments
+TRADE_FILE_COLUMNS = ("trade_id", "instrument", "start_date", "end_date", "frequency", "notional", "rate", "convention")
+#optional columns: redemption_at_maturity (bonds only, default true) and direction (receive or pay, default receive)
+RESULT_FILE_COLUMNS = ("trade_id", "pv", "DV01")
+
+_TRUE_VALUES = ("true", "1", "yes", "y")
+_FALSE_VALUES = ("false", "0", "no", "n")
+_DIRECTION_SIGNS = {"receive": 1.0, "pay": -1.0}
+
+#end of stream marker passed down the queues, and the poll interval at which blocked stages check whether the pipeline has been stopped
+_END_OF_STREAM = object()
+_POLL_SECONDS = 0.1
+
+def _parse_flag(value: str | None, default: bool):
+    #helper parsing an optional true/false column
+    if value is None or value.strip() == "":
+        return default
+    if value.strip().lower() in _TRUE_VALUES:
+        return True
+    if value.strip().lower() in _FALSE_VALUES:
+        return False
+    raise ValueError("Flags must be given as true or false.")
+
+def trade_cashflows(row: dict[str, str]):
+    #function building the (date, amount) cashflows of one trade file row, using the cached schedules
+    instrument = row["instrument"].strip().lower()
+    schedule = generate_schedule(date.fromisoformat(row["start_date"]), date.fromisoformat(row["end_date"]), int(row["frequency"]))
+    notional = float(row["notional"])
+    rate = float(row["rate"])
+    convention = row["convention"].strip()
+    if instrument == "fixed_leg":
+        cashflows = build_fixed_leg_cashflows(schedule, notional, rate, convention)
+    elif instrument == "bond":
+        cashflows = build_bond_cashflows(schedule, notional, rate, convention, _parse_flag(row.get("redemption_at_maturity"), True))
+    else:
+        raise ValueError("This instrument type is either not recognised or has not yet been implemented.")
+
+    #paid trades have negative cashflows
+    direction = (row.get("direction") or "receive").strip().lower()
+    if direction not in _DIRECTION_SIGNS:
+        raise ValueError("Direction must be either receive or pay.")
+    if _DIRECTION_SIGNS[direction] < 0:
+        cashflows = [(payment_date, -amount) for payment_date, amount in cashflows]
+    return cashflows
+
+def read_trade_chunks(path: str, chunk_size: int):
+    #generator reading a trade file, yielding lists of at most chunk_size rows (dictionaries keyed by column)
+    if chunk_size <= 0:
+        raise ValueError("Chunk size must be greater than 0.")
+    with open(path, newline="") as file:
+        reader = csv.DictReader(file)
+        if reader.fieldnames is None or any(column not in reader.fieldnames for column in TRADE_FILE_COLUMNS):
+            raise ValueError("The trade file is missing required columns!")
+        chunk = []
+        for row in reader:
+            chunk.append(row)
+            if len(chunk) == chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+def expand_trade_chunk(rows: list[dict[str, str]], valuation_date: date):
+    #function expanding a chunk of trade file rows into columnar cashflows, keeping only those paid after the valuation date as in bond_dirty_price
+    #returns the trade ids (in file order) and numpy arrays of payment date ordinals, amounts and the position of each cashflow's trade in the chunk
+    trade_ids = []
+    payment_dates = []
+    amounts = []
+    segment_index = []
+    for i, row in enumerate(rows):
+        trade_ids.append(row["trade_id"])
+        for payment_date, amount in trade_cashflows(row):
+            if payment_date <= valuation_date:
+                continue
+            payment_dates.append(payment_date.toordinal())
+            amounts.append(amount)
+            segment_index.append(i)
+    return trade_ids, np.array(payment_dates, dtype=np.int64), np.array(amounts, dtype=float), np.array(segment_index, dtype=np.int64)
+
+def price_trade_chunk(trade_ids: list[str], payment_dates: np.ndarray, amounts: np.ndarray, segment_index: np.ndarray, curve: DiscountCurve | ShiftedCurve, bp: float = 1.0):
+    #function computing the present value and DV01 of every trade in an expanded chunk, with the same values as pv and DV01 on each trade's future cashflows
+    #trades with no future cashflows are valued at 0, returns a list of (trade id, pv, DV01) rows in chunk order
+    if bp == 0:
+        raise ValueError("Bump sizes must not be 0.")
+    pvs, (DV01s,), _ = _greeks_from_columns(payment_dates, amounts, segment_index, len(trade_ids), curve, (float(bp),), "forward")
+    return list(zip(trade_ids, pvs.tolist(), DV01s.tolist()))
+
+def _put(output_queue: queue.Queue, item, stop: threading.Event):
+    #helper putting an item on a bounded queue, waiting while it is full unless the pipeline is stopped, returns whether the item was put
+    while not stop.is_set():
+        try:
+            output_queue.put(item, timeout=_POLL_SECONDS)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+def _drain(input_queue: queue.Queue, stop: threading.Event):
+    #generator yielding the items of a queue until the end of stream marker, or until the pipeline is stopped
+    while not stop.is_set():
+        try:
+            item = input_queue.get(timeout=_POLL_SECONDS)
+        except queue.Empty:
+            continue
+        if item is _END_OF_STREAM:
+            return
+        yield item
+
+def _run_stage(items: Callable[[], Iterable], output_queue: queue.Queue, stop: threading.Event, errors: list[BaseException]):
+    #helper running one pipeline stage in its thread, putting each produced item on the output queue followed by the end of stream marker
+    #an exception stops the whole pipeline and is re-raised by stream_trade_valuations
+    try:
+        for item in items():
+            if not _put(output_queue, item, stop):
+                return
+        _put(output_queue, _END_OF_STREAM, stop)
+    except BaseException as error:
+        errors.append(error)
+        stop.set()
+
+def stream_trade_valuations(trade_path: str, curve: DiscountCurve | ShiftedCurve, chunk_size: int = 10000, max_pending_chunks: int = 2, bp: float = 1.0) -> Iterator[list[tuple[str, float, float]]]:
+    #generator valuing a trade file chunk by chunk, yielding lists of (trade id, pv, DV01) rows in file order
+    #reading and expanding run in background threads, each stage holds at most max_pending_chunks chunks waiting for the next
+    if max_pending_chunks <= 0:
+        raise ValueError("The number of pending chunks must be greater than 0.")
+    if chunk_size <= 0:
+        raise ValueError("Chunk size must be greater than 0.")
+    if bp == 0:
+        raise ValueError("Bump sizes must not be 0.")
+
+    stop = threading.Event()
+    errors = []
+    read_queue = queue.Queue(maxsize=max_pending_chunks)
+    expand_queue = queue.Queue(maxsize=max_pending_chunks)
+    stages = [
+        threading.Thread(target=_run_stage, args=(lambda: read_trade_chunks(trade_path, chunk_size), read_queue, stop, errors), daemon=True),
+        threading.Thread(target=_run_stage, args=(lambda: map(lambda rows: expand_trade_chunk(rows, curve.valuation_date), _drain(read_queue, stop)), expand_queue, stop, errors), daemon=True),
+    ]
+    for stage in stages:
+        stage.start()
+    try:
+        for expanded_chunk in _drain(expand_queue, stop):
+            yield price_trade_chunk(*expanded_chunk, curve, bp)
+    finally:
+        #stop the background stages in case pricing failed or the consumer stopped early, then wait for them
+        stop.set()
+        for stage in stages:
+            stage.join()
+    if errors:
+        raise errors[0]
+
+def value_trade_file(trade_path: str, result_path: str, curve: DiscountCurve | ShiftedCurve, chunk_size: int = 10000, max_pending_chunks: int = 2, bp: float = 1.0):
+    #function valuing a trade file against a curve, streaming a (trade_id, pv, DV01) row per trade to a CSV results file in file order
+    #memory use depends on the chunk size and the number of pending chunks, not on the size of the file
+    #returns the number of trades valued
+    count = 0
+    with open(result_path, "w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(RESULT_FILE_COLUMNS)
+        for rows in stream_trade_valuations(trade_path, curve, chunk_size, max_pending_chunks, bp):
+            writer.writerows(rows)
+            count += len(rows)
+    return count
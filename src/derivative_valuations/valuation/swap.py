@@ -0,0 +1,265 @@
+from datetime import date
+from typing import NamedTuple
+from collections.abc import Mapping, Sequence
+import numpy as np
+from derivative_valuations.payment_schedule.accrual_period_payment_schedule import cached_schedule, add_months, _validate_schedule_inputs
+from derivative_valuations.cashflows.cash_flow import build_fixed_leg_cashflows, build_float_leg_cashflows
+from derivative_valuations.curve_bootstrapping.financial_instruments import FixedForFloatingSwapQuote
+from derivative_valuations.daycount_conventions.daycount import year_fraction_computation, year_fractions, to_ordinals, _year_month_day, _EPOCH_ORDINAL
+from derivative_valuations.df_curve.discount_factor import DiscountCurve, ShiftedCurve
+from derivative_valuations.valuation.present_value import pv
+
+#valuation of fixed-for-floating swaps against a single curve, which both projects the floating rates and discounts
+#a floating coupon projected from the curve and paid at the end of its accrual period is worth notional*(DF(accrual start) - DF(accrual end)), so the projected coupons of a leg telescope to notional*(DF(first start) - DF(maturity))
+#the fixed leg is fixed_rate times the annuity, notional*sum(year_fraction_t_i * DF(t_i)) over its future payment dates
+
+class Swap:
+#class for holding information about a fixed-for-floating swap, frequencies are given as number of months
+#pay_fixed is True if we pay fixed (and receive floating), False otherwise
+#spread is added to every floating rate, fixings are the rates of floating coupons accruing from before the valuation date (accrual start date -> rate)
+    def __init__(self, effective_date: date, maturity_date: date, fixed_rate: float, fixed_frequency_months: int, fixed_convention: str, float_frequency_months: int, float_convention: str, notional: float = 1.0, pay_fixed: bool = True, spread: float = 0.0, fixings: Mapping[date, float] | None = None):
+        self.effective_date = effective_date
+        self.maturity_date = maturity_date
+        self.fixed_rate = fixed_rate
+        self.fixed_frequency_months = fixed_frequency_months
+        self.fixed_convention = fixed_convention
+        self.float_frequency_months = float_frequency_months
+        self.float_convention = float_convention
+        self.notional = notional
+        self.pay_fixed = pay_fixed
+        self.spread = spread
+        self.fixings = dict(fixings or {})
+
+        #validation checks, as for the schedules and cashflow builders
+        _validate_schedule_inputs(effective_date, maturity_date, fixed_frequency_months)
+        _validate_schedule_inputs(effective_date, maturity_date, float_frequency_months)
+        if notional < 0:
+            raise ValueError("Notional payment must not be less than 0.")
+        if fixed_rate < 0:
+            raise ValueError("Fixed rate must not be less than 0.")
+
+    @classmethod
+    def from_quote(cls, quote: FixedForFloatingSwapQuote, pay_fixed: bool = True):
+        #constructor of the swap a par swap quote describes, e.g. to reprice bootstrap inputs
+        return cls(quote.effective_date, quote.maturity_date, quote.fixed_rate, quote.fixed_frequency_months, quote.fixed_convention, quote.float_frequency_months, quote.float_convention, quote.notional, pay_fixed)
+
+    def fixed_schedule(self):
+        #method to return accrual periods for fixed leg of the swap, as an immutable cached schedule
+        return cached_schedule(self.effective_date, self.maturity_date, self.fixed_frequency_months)
+
+    def floating_schedule(self):
+        #method to return accrual periods for floating leg of the swap, as an immutable cached schedule
+        return cached_schedule(self.effective_date, self.maturity_date, self.float_frequency_months)
+
+    def fixed_cashflows(self):
+        return build_fixed_leg_cashflows(self.fixed_schedule(), self.notional, self.fixed_rate, self.fixed_convention)
+
+    def float_cashflows(self, curve: DiscountCurve | ShiftedCurve):
+        #floating cashflows of the coupons paid after the curve's valuation date, projected from the curve
+        future_schedule = [period for period in self.floating_schedule() if period[2] > curve.valuation_date]
+        if not future_schedule:
+            return []
+        return build_float_leg_cashflows(future_schedule, self.notional, self.float_convention, curve, self.spread, self.fixings)
+
+def _check_valuation_date(curve: DiscountCurve | ShiftedCurve, valuation_date: date):
+    #helper holding the validation check shared by the swap pricing functions
+    if valuation_date != curve.valuation_date:
+        raise ValueError("The curve used to price the swap is for a different valuation date!")
+
+def swap_fixed_leg_pv(swap: Swap, curve: DiscountCurve | ShiftedCurve, valuation_date: date):
+    #function computing the present value of the fixed coupons paid after the valuation date
+    _check_valuation_date(curve, valuation_date)
+    future_cashflows = [(payment_date, amount) for payment_date, amount in swap.fixed_cashflows() if payment_date > valuation_date]
+    if not future_cashflows:
+        return 0.0
+    return pv(future_cashflows, curve)
+
+def swap_float_leg_pv(swap: Swap, curve: DiscountCurve | ShiftedCurve, valuation_date: date):
+    #function computing the present value of the floating coupons paid after the valuation date
+    _check_valuation_date(curve, valuation_date)
+    future_cashflows = swap.float_cashflows(curve)
+    if not future_cashflows:
+        return 0.0
+    return pv(future_cashflows, curve)
+
+def swap_annuity(swap: Swap, curve: DiscountCurve | ShiftedCurve, valuation_date: date):
+    #function computing the fixed leg annuity, notional*sum(year_fraction_t_i * DF(t_i)) over the fixed payment dates after the valuation date
+    _check_valuation_date(curve, valuation_date)
+    annuity = 0.0
+    for accrual_start, accrual_end, payment_date in swap.fixed_schedule():
+        if payment_date > valuation_date:
+            annuity = annuity + swap.notional*year_fraction_computation(accrual_start, accrual_end, swap.fixed_convention)*curve.df(payment_date)
+    return annuity
+
+def swap_price(swap: Swap, curve: DiscountCurve | ShiftedCurve, valuation_date: date):
+    #function pricing a swap as the floating leg less the fixed leg if paying fixed, the reverse otherwise
+    price = swap_float_leg_pv(swap, curve, valuation_date) - swap_fixed_leg_pv(swap, curve, valuation_date)
+    if swap.pay_fixed == False:
+        price = price * -1
+    return price
+
+def par_swap_rate(swap: Swap, curve: DiscountCurve | ShiftedCurve, valuation_date: date):
+    #function computing the fixed rate giving the swap a price of 0, the floating leg present value over the annuity
+    annuity = swap_annuity(swap, curve, valuation_date)
+    if annuity == 0:
+        raise ValueError("The swap has no fixed payments after the valuation date!")
+    return swap_float_leg_pv(swap, curve, valuation_date)/annuity
+
+class _LegTerms(NamedTuple):
+#per leg result of _leg_terms, each a numpy array with one entry per leg
+#annuity is per unit notional, the first unpaid period is the earliest accrual period paid after the valuation date (the final period for legs that have matured)
+    annuity: np.ndarray
+    first_start: np.ndarray
+    first_year_fraction: np.ndarray
+    first_end_df: np.ndarray
+    maturity_df: np.ndarray
+
+def _coupon_grids(effective_dates: np.ndarray, frequencies: np.ndarray, final_maturity_dates: np.ndarray):
+    #helper generating the regular accrual periods of several legs at once, stepping forward from each effective date (date ordinal) every frequency months as in cached_schedule, until a period end passes the final maturity date
+    #returns flat arrays of period start and end ordinals with the periods of each leg contiguous, and the offset of each leg's first period
+    #stepping one period at a time clips the day to the month end and keeps it clipped (31/01, 28/02, 28/03, ...), so the k-th period end has the smallest of the effective day and the month lengths of the first k period ends
+    effective_years, effective_months, effective_days = _year_month_day(effective_dates)
+    final_years, final_months, _ = _year_month_day(final_maturity_dates)
+    month_differences = (final_years - effective_years)*12 + (final_months - effective_months)
+    period_counts = month_differences//frequencies + 1
+    grid_starts = np.concatenate(([0], np.cumsum(period_counts)))
+
+    grid_index = np.repeat(np.arange(len(effective_dates), dtype=np.int64), period_counts)
+    steps = np.arange(grid_starts[-1], dtype=np.int64) - grid_starts[grid_index] + 1
+    month_indices = (effective_years*12 + effective_months - 1 - 1970*12)[grid_index] + steps*frequencies[grid_index]
+    months = month_indices.astype("datetime64[M]")
+    month_lengths = ((months + 1).astype("datetime64[D]") - months.astype("datetime64[D]")).astype(np.int64)
+
+    #running minimum restarting at each leg, by lowering each later leg's values below every earlier leg's (days are between 1 and 31)
+    days = np.minimum(effective_days[grid_index], month_lengths) - 32*grid_index
+    days = np.minimum.accumulate(days) + 32*grid_index
+    period_ends = months.astype("datetime64[D]").astype(np.int64) + days - 1 + _EPOCH_ORDINAL
+    period_starts = np.concatenate(([0], period_ends[:-1]))
+    period_starts[grid_starts[:-1]] = effective_dates
+    return period_starts, period_ends, grid_starts
+
+def _leg_terms(curve: DiscountCurve | ShiftedCurve, effective_dates: Sequence[date], frequencies: Sequence[int], conventions: Sequence[str], maturity_dates: np.ndarray):
+    #helper computing the annuity and first unpaid period of many legs, given by effective date, frequency, convention and maturity date ordinal
+    #legs with the same effective date, frequency and convention share their regular accrual periods (see cached_schedule), so one grid of coupon dates is built per group, long enough for its longest leg
+    #prefix sums of year_fraction * DF along each grid make the annuity of any leg an O(1) difference, plus its final (possibly stub) period ending at the maturity date
+    valuation_ordinal = curve.valuation_date.toordinal()
+    maturity_dates = np.asarray(maturity_dates, dtype=np.int64)
+
+    #group the legs by their regular accrual periods
+    groups = {}
+    group_index = np.empty(len(maturity_dates), dtype=np.int64)
+    for i, key in enumerate(zip(effective_dates, frequencies, conventions)):
+        group_index[i] = groups.setdefault(key, len(groups))
+    final_maturities = np.zeros(len(groups), dtype=np.int64)
+    np.maximum.at(final_maturities, group_index, maturity_dates)
+    group_conventions = np.array([key[2] for key in groups], dtype=object)
+    period_starts, period_ends, grid_starts = _coupon_grids(to_ordinals([key[0] for key in groups]), np.array([key[1] for key in groups], dtype=np.int64), final_maturities)
+    period_counts = np.diff(grid_starts)
+    period_groups = np.repeat(np.arange(len(groups), dtype=np.int64), period_counts)
+
+    #year fractions of every period and discount factors of every period end, each computed once for all groups
+    period_year_fractions = np.empty(len(period_ends))
+    period_conventions = group_conventions[period_groups]
+    for convention in set(group_conventions):
+        in_convention = period_conventions == convention
+        period_year_fractions[in_convention] = year_fractions(period_starts[in_convention], period_ends[in_convention], convention)
+    period_dfs = curve.dfs(period_ends)
+
+    #prefix sums of each group's periods along one row per group, the first column holding the empty sum
+    prefix_sums = np.zeros((len(groups), int(period_counts.max(initial=0)) + 1))
+    prefix_sums[period_groups, np.arange(len(period_ends)) - grid_starts[period_groups] + 1] = period_year_fractions*period_dfs
+    np.cumsum(prefix_sums, axis=1, out=prefix_sums)
+
+    #locate each leg's maturity date and the valuation date on its group's grid, the group index keeps the flat array sorted for a single search
+    grid_keys = (period_groups << 32) + period_ends
+    leg_keys = group_index << 32
+    offsets = grid_starts[group_index]
+    regular_count = np.searchsorted(grid_keys, leg_keys + maturity_dates, side="left") - offsets
+    paid_count = np.minimum(np.searchsorted(grid_keys, leg_keys + valuation_ordinal, side="right") - offsets, regular_count)
+
+    #the final period runs from the last regular period end before the maturity date
+    final_starts = period_starts[offsets + regular_count]
+    final_year_fractions = np.empty(len(maturity_dates))
+    leg_conventions = group_conventions[group_index]
+    for convention in set(group_conventions):
+        in_convention = leg_conventions == convention
+        final_year_fractions[in_convention] = year_fractions(final_starts[in_convention], maturity_dates[in_convention], convention)
+    maturity_dfs = curve.dfs(maturity_dates)
+
+    annuities = prefix_sums[group_index, regular_count] - prefix_sums[group_index, paid_count] + np.where(maturity_dates > valuation_ordinal, final_year_fractions*maturity_dfs, 0.0)
+
+    #first unpaid period, either a regular period or the final one
+    first = offsets + paid_count
+    is_final = paid_count == regular_count
+    first_starts = np.where(is_final, final_starts, period_starts[first])
+    first_year_fractions = np.where(is_final, final_year_fractions, period_year_fractions[first])
+    first_end_dfs = np.where(is_final, maturity_dfs, period_dfs[first])
+    return _LegTerms(annuities, first_starts, first_year_fractions, first_end_dfs, maturity_dfs)
+
+class SwapValuations(NamedTuple):
+#result record of price_swaps, each value a numpy array with one entry per swap
+#prices are from the point of view of each swap's pay_fixed flag, annuities include the notional, par rates are nan for swaps with no fixed payments after the valuation date
+    price: np.ndarray
+    fixed_leg_pv: np.ndarray
+    float_leg_pv: np.ndarray
+    annuity: np.ndarray
+    par_rate: np.ndarray
+
+def price_swaps(swaps: list[Swap], curve: DiscountCurve | ShiftedCurve, valuation_date: date):
+    #function valuing every swap in a list against one curve in a single vectorised pass, giving the same values as swap_price, swap_annuity and par_swap_rate
+    #fixed legs use annuity prefix sums (see _leg_terms), projected floating coupons telescope so only the floating coupon in progress at the valuation date and any spread need its periods
+    _check_valuation_date(curve, valuation_date)
+    if not swaps:
+        empty = np.zeros(0)
+        return SwapValuations(empty, empty, empty, empty, empty)
+
+    effective_dates = [swap.effective_date for swap in swaps]
+    maturity_dates = to_ordinals([swap.maturity_date for swap in swaps])
+    notionals = np.array([swap.notional for swap in swaps], dtype=float)
+    fixed_rates = np.array([swap.fixed_rate for swap in swaps], dtype=float)
+    spreads = np.array([swap.spread for swap in swaps], dtype=float)
+    pay_fixed = np.array([swap.pay_fixed for swap in swaps], dtype=bool)
+
+    fixed_terms = _leg_terms(curve, effective_dates, [swap.fixed_frequency_months for swap in swaps], [swap.fixed_convention for swap in swaps], maturity_dates)
+    float_terms = _leg_terms(curve, effective_dates, [swap.float_frequency_months for swap in swaps], [swap.float_convention for swap in swaps], maturity_dates)
+
+    #floating coupons from the first unpaid one are projected, except one accruing from before the valuation date, which uses its fixing
+    valuation_ordinal = valuation_date.toordinal()
+    live = maturity_dates > valuation_ordinal
+    in_progress = live & (float_terms.first_start < valuation_ordinal)
+    fixings = np.zeros(len(swaps))
+    for i in np.flatnonzero(in_progress):
+        fixing_date = date.fromordinal(int(float_terms.first_start[i]))
+        if fixing_date not in swaps[i].fixings:
+            raise ValueError("A fixing is required for every floating coupon accruing from before the valuation date!")
+        fixings[i] = swaps[i].fixings[fixing_date]
+    projected_float = np.where(in_progress, fixings*float_terms.first_year_fraction*float_terms.first_end_df + float_terms.first_end_df, curve.dfs(float_terms.first_start)) - float_terms.maturity_df
+    float_leg_pvs = notionals*np.where(live, projected_float + spreads*float_terms.annuity, 0.0)
+
+    annuities = notionals*fixed_terms.annuity
+    fixed_leg_pvs = fixed_rates*annuities
+    prices = np.where(pay_fixed, float_leg_pvs - fixed_leg_pvs, fixed_leg_pvs - float_leg_pvs)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        par_rates = np.where(annuities != 0, float_leg_pvs/annuities, np.nan)
+    return SwapValuations(prices, fixed_leg_pvs, float_leg_pvs, annuities, par_rates)
+
+def par_rate_grid(curve: DiscountCurve | ShiftedCurve, effective_dates: Sequence[date], tenors_months: Sequence[int], fixed_frequency_months: int, fixed_convention: str):
+    #function computing the par swap rate of a swap starting at each effective date for each tenor (in months), as an array with one row per effective date and one column per tenor
+    #the floating leg of a par swap is worth DF(effective date) - DF(maturity date) per unit notional whatever its frequency, so only the fixed leg's frequency and convention are needed
+    effective_dates = list(effective_dates)
+    tenors_months = list(tenors_months)
+
+    #validation checks
+    if fixed_frequency_months <= 0:
+        raise ValueError("Payment frequency must be greater than 0.")
+    if any(tenor < fixed_frequency_months for tenor in tenors_months):
+        raise ValueError("The frequency of payments cannot be greater than the number of months between the start date and the end date.")
+    if any(effective_date < curve.valuation_date for effective_date in effective_dates):
+        raise ValueError("Effective dates cannot be before the valuation date!")
+
+    rows, columns = len(effective_dates), len(tenors_months)
+    leg_effective_dates = [effective_date for effective_date in effective_dates for _ in range(columns)]
+    maturity_dates = to_ordinals([add_months(effective_date, tenor) for effective_date in effective_dates for tenor in tenors_months])
+    terms = _leg_terms(curve, leg_effective_dates, [fixed_frequency_months]*len(maturity_dates), [fixed_convention]*len(maturity_dates), maturity_dates)
+    float_leg_pvs = curve.dfs(to_ordinals(leg_effective_dates)) - terms.maturity_df
+    return (float_leg_pvs/terms.annuity).reshape(rows, columns)
@@ -0,0 +1,15 @@
+from datetime import date
+import pytest
+from derivative_valuations.df_curve.discount_factor import DiscountCurve
+from derivative_valuations.valuation.FRA import FRA, FRA_price, FRA_pillar_sensitivities
+
+def _curve():
+    return DiscountCurve(date(2026,1,1), [date(2026,7,1), date(2027,1,1), date(2029,1,1), date(2031,1,1)], [0.985, 0.97, 0.91, 0.85], "ACT/365")
+
+class TestFRAPillarSensitivities:
+    @pytest.mark.parametrize("pay_fixed", [True, False])
+    def test_parallel_sum_matches_bump(self, pay_fixed):
+        fra = FRA(date(2026,10,1), date(2027,4,1), 0.03, 1000000, "ACT/360", pay_fixed)
+        curve = _curve()
+        bumped = (FRA_price(fra, curve.bump_curve(0.01), date(2026,1,1)) - FRA_price(fra, curve, date(2026,1,1)))/0.000001
+        assert sum(FRA_pillar_sensitivities(fra, curve, date(2026,1,1))) == pytest.approx(bumped, rel=1e-5)
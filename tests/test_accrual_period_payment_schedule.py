@@ -1,6 +1,7 @@
 from datetime import date
 import pytest
-from derivative_valuations.payment_schedule.accrual_period_payment_schedule import generate_schedule
+from derivative_valuations.payment_schedule.accrual_period_payment_schedule import generate_schedule, cached_schedule, generate_schedules, add_months
+from derivative_valuations.payment_schedule.calendars import resolve_calendar, FOLLOWING, PRECEDING
 
 class TestGenerateSchedule:
     def test_end_date_before_start_date(self):
@@ -37,4 +38,70 @@ class TestGenerateSchedule:
         (date(2026,5,1), date(2026,9,1), date(2026,9,1)),
         (date(2026,9,1), date(2027,1,1), date(2027,1,1)),
         (date(2027,1,1), date(2027,5,1), date(2027,5,1)),
-        (date(2027,5,1), date(2027,7,1), date(2027,7,1))]
\ No newline at end of file
+        (date(2027,5,1), date(2027,7,1), date(2027,7,1))]
+
+    def test_month_end_schedule(self):
+        #stepping from 31/01 clips to the end of February, and later periods step on from there
+        assert generate_schedule(date(2026, 1, 31),date(2026, 4, 30), 1) == [
+        (date(2026,1,31), date(2026,2,28), date(2026,2,28)),
+        (date(2026,2,28), date(2026,3,28), date(2026,3,28)),
+        (date(2026,3,28), date(2026,4,28), date(2026,4,28)),
+        (date(2026,4,28), date(2026,4,30), date(2026,4,30))]
+
+class TestCachedSchedule:
+    def test_matches_generate_schedule(self):
+        assert list(cached_schedule(date(2026, 1, 1),date(2027, 7, 1), 4)) == generate_schedule(date(2026, 1, 1),date(2027, 7, 1), 4)
+
+    def test_returns_same_immutable_schedule(self):
+        schedule = cached_schedule(date(2026, 1, 1),date(2036, 1, 1), 6)
+        assert isinstance(schedule, tuple)
+        assert cached_schedule(date(2026, 1, 1),date(2036, 1, 1), 6) is schedule
+
+    def test_generate_schedule_returns_new_list(self):
+        schedule = generate_schedule(date(2026, 1, 1),date(2027, 1, 1), 4)
+        schedule.append(None)
+        assert len(generate_schedule(date(2026, 1, 1),date(2027, 1, 1), 4)) == 3
+
+    def test_batch_schedules(self):
+        schedules = generate_schedules([date(2026,1,1), date(2026,1,1), date(2026,1,31)], [date(2027,1,1), date(2027,1,1), date(2026,4,30)], [4, 4, 1])
+        assert schedules[0] is schedules[1]
+        assert list(schedules[2]) == generate_schedule(date(2026,1,31), date(2026,4,30), 1)
+
+class TestAddMonths:
+    def test_clips_to_month_end(self):
+        assert add_months(date(2026,1,31), 1) == date(2026,2,28)
+        assert add_months(date(2028,1,31), 1) == date(2028,2,29)
+        assert add_months(date(2026,8,31), 18) == date(2028,2,29)
+
+    def test_negative_months(self):
+        assert add_months(date(2026,3,31), -1) == date(2026,2,28)
+
+class TestAdjustedSchedule:
+    def test_payment_dates_adjusted(self):
+        #accrual dates are unadjusted, payment dates move off weekends and holidays
+        assert generate_schedule(date(2026,1,3), date(2026,7,3), 3, "London") == [
+        (date(2026,1,3), date(2026,4,3), date(2026,4,7)),
+        (date(2026,4,3), date(2026,7,3), date(2026,7,3))]
+        assert generate_schedule(date(2025,10,31), date(2026,1,31), 3, "London", PRECEDING) == [
+        (date(2025,10,31), date(2026,1,31), date(2026,1,30))]
+
+    def test_unadjusted_by_default(self):
+        assert [payment_date for _, _, payment_date in generate_schedule(date(2026,1,3), date(2026,7,3), 3)] == [date(2026,4,3), date(2026,7,3)]
+
+    def test_calendar_is_part_of_cache_key(self):
+        london = resolve_calendar("London")
+        adjusted = cached_schedule(date(2026,1,3), date(2036,1,3), 3, london, FOLLOWING)
+        assert cached_schedule(date(2026,1,3), date(2036,1,3), 3, london, FOLLOWING) is adjusted
+        assert cached_schedule(date(2026,1,3), date(2036,1,3), 3) != adjusted
+        assert all(london.is_business_day(payment_date) for _, _, payment_date in adjusted)
+
+    def test_batch_matches_single(self):
+        start_dates = [date(2026,1,3), date(2025,5,31), date(2026,1,3)]
+        end_dates = [date(2031,1,3), date(2030,5,31), date(2031,1,3)]
+        schedules = generate_schedules(start_dates, end_dates, [6, 3, 6], "TARGET", FOLLOWING)
+        for schedule, start_date, end_date, frequency in zip(schedules, start_dates, end_dates, [6, 3, 6]):
+            assert list(schedule) == generate_schedule(start_date, end_date, frequency, "TARGET", FOLLOWING)
+
+    def test_outside_calendar_range(self):
+        with pytest.raises(ValueError, match="Date is outside the range of the calendar!"):
+            generate_schedule(date(1998,1,1), date(2000,1,1), 6, "TARGET")
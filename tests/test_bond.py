@@ -0,0 +1,59 @@
+from datetime import date
+import math
+import pytest
+from derivative_valuations.df_curve.discount_factor import DiscountCurve
+from derivative_valuations.valuation.bond import Bond, bond_dirty_price, bond_clean_price, bond_accrued_interest, bond_pillar_sensitivities, price_bond, bond_analytics, price_bonds
+from derivative_valuations.valuation.present_value import DV01, convexity
+
+def _curve():
+    return DiscountCurve(date(2026,1,1), [date(2026,2,1), date(2026,7,1), date(2027,1,1), date(2029,1,1), date(2031,1,1)], [0.997, 0.985, 0.97, 0.91, 0.85], "ACT/365")
+
+def _bond():
+    return Bond(date(2025,3,15), date(2032,3,15), 0.04, 6, 100, "30E/360")
+
+class TestBondPillarSensitivities:
+    def test_parallel_sum_matches_bump(self):
+        curve = _curve()
+        bumped = (bond_dirty_price(_bond(), curve.bump_curve(0.01), date(2026,1,1)) - bond_dirty_price(_bond(), curve, date(2026,1,1)))/0.000001
+        assert sum(bond_pillar_sensitivities(_bond(), curve, date(2026,1,1))) == pytest.approx(bumped, rel=1e-5)
+
+    def test_different_valuation_date(self):
+        with pytest.raises(ValueError, match="The curve used to price the bond is for a different valuation date!"):
+            bond_pillar_sensitivities(_bond(), _curve(), date(2026,1,2))
+
+class TestBondAnalytics:
+    def test_matches_separate_calls(self):
+        curve = _curve()
+        bond = _bond()
+        analytics = bond_analytics(bond, curve, date(2026,1,1), 0.5)
+        clean_price, dirty_price, accrued_interest = price_bond(bond, curve, date(2026,1,1))
+        cashflows = [(payment_date, amount) for payment_date, amount in bond.build_bond_cashflows() if payment_date > date(2026,1,1)]
+        assert analytics.clean_price == pytest.approx(clean_price, rel=1e-14)
+        assert analytics.dirty_price == pytest.approx(dirty_price, rel=1e-14)
+        assert analytics.accrued_interest == accrued_interest
+        assert analytics.DV01 == pytest.approx(DV01(cashflows, curve, 0.5), rel=1e-9)
+        assert analytics.convexity == pytest.approx(convexity(cashflows, curve, 0.5), rel=1e-6)
+
+    def test_batch_matches_single(self):
+        curve = _curve()
+        bonds = [_bond(), Bond(date(2024,6,30), date(2025,12,31), 0.03, 6, 100, "ACT/365"), Bond(date(2026,1,15), date(2036,1,15), 0.045, 12, 1000, "ACT/360")]
+        results = price_bonds(bonds, curve, date(2026,1,1))
+        for bond, result in zip(bonds, results):
+            assert result == pytest.approx(bond_analytics(bond, curve, date(2026,1,1)), rel=1e-14, nan_ok=True)
+        #the matured bond has no future cashflows, so no convexity
+        assert results[1][:4] == (0.0, 0.0, 0.0, 0.0)
+        assert math.isnan(results[1].convexity)
+
+    def test_settled_bond(self):
+        #a bond whose cashflows have all been paid has no convexity in the batch or single bond analytics, as convexity cannot be computed for it
+        curve = _curve()
+        bond = Bond(date(2024,6,30), date(2025,12,31), 0.03, 6, 100, "ACT/365")
+        assert math.isnan(bond_analytics(bond, curve, date(2026,1,1)).convexity)
+        assert math.isnan(price_bonds([_bond(), bond], curve, date(2026,1,1))[1].convexity)
+        assert price_bonds([_bond(), bond], curve, date(2026,1,1))[0].convexity == pytest.approx(bond_analytics(_bond(), curve, date(2026,1,1)).convexity, rel=1e-14)
+        with pytest.raises(ValueError, match="Cash flows are empty!"):
+            convexity([cashflow for cashflow in bond.build_bond_cashflows() if cashflow[0] > date(2026,1,1)], curve, 1)
+
+    def test_price_bond(self):
+        curve = _curve()
+        assert price_bond(_bond(), curve, date(2026,1,1)) == (bond_clean_price(_bond(), curve, date(2026,1,1)), bond_dirty_price(_bond(), curve, date(2026,1,1)), bond_accrued_interest(_bond(), date(2026,1,1)))
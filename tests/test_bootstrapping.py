@@ -0,0 +1,158 @@
+from datetime import date
+import pytest
+from derivative_valuations.curve_bootstrapping.financial_instruments import DepositQuote, FixedForFloatingSwapQuote, SwapAnnuityCarry
+from derivative_valuations.curve_bootstrapping.bootstrapping import bootstrap_discount_curve, IncrementalBootstrapper, bootstrap_many, CurveQuotes
+from derivative_valuations.df_curve.discount_factor import DiscountCurve
+
+def _deposit_quotes():
+    return [DepositQuote(date(2026,1,15), date(2026,4,15), 0.030, "ACT/360"), DepositQuote(date(2026,1,15), date(2026,7,15), 0.031, "ACT/360")]
+
+def _swap_quotes(years):
+    return [FixedForFloatingSwapQuote(date(2026,1,15), date(2026+n,1,15), 0.032+0.0001*n, 12, "30E/360", 6, "ACT/360") for n in years]
+
+class TestBootstrapDiscountCurve:
+    def test_matches_sequential_solve(self):
+        #the annuity carry must give exactly the same curve as solving every swap from its full schedule
+        deposit_quotes = _deposit_quotes()
+        swap_quotes = _swap_quotes([1, 2, 3, 5, 7, 10, 15, 20, 30])
+        curve = DiscountCurve(date(2026,1,15), [q.end_date for q in deposit_quotes], [q.df_implied() for q in deposit_quotes], "ACT/365")
+        for quote in swap_quotes:
+            curve.add_known_dates([quote.maturity_date], [quote.solve_last_df(curve)])
+        bootstrapped_curve = bootstrap_discount_curve(date(2026,1,15), _deposit_quotes(), _swap_quotes([1, 2, 3, 5, 7, 10, 15, 20, 30]), "ACT/365")
+        assert bootstrapped_curve.interpolation_dates == curve.interpolation_dates
+        assert bootstrapped_curve.interpolation_dfs == curve.interpolation_dfs
+
+    def test_swap_pillars_reprice_at_par(self):
+        curve = bootstrap_discount_curve(date(2026,1,15), _deposit_quotes(), _swap_quotes(range(1, 11)), "ACT/365")
+        for quote in _swap_quotes(range(1, 11)):
+            annuity = sum(amount*curve.df(payment_date) for payment_date, amount in quote.fixed_cashflows())
+            assert annuity + curve.df(quote.maturity_date) == pytest.approx(1.0, abs=1e-12)
+
+    def test_linear_discount_factor_evaluations(self):
+        #an annual 50 year curve should discount each coupon once rather than once per later swap
+        calls = []
+        original_df = DiscountCurve.df
+        def counting_df(self, t):
+            calls.append(t)
+            return original_df(self, t)
+        DiscountCurve.df = counting_df
+        try:
+            bootstrap_discount_curve(date(2026,1,15), _deposit_quotes(), _swap_quotes(range(1, 51)), "ACT/365")
+        finally:
+            DiscountCurve.df = original_df
+        assert len(calls) <= 50
+
+    def test_does_not_modify_quote_lists(self):
+        deposit_quotes = _deposit_quotes()[::-1]
+        swap_quotes = _swap_quotes([5, 1, 3])
+        bootstrap_discount_curve(date(2026,1,15), deposit_quotes, swap_quotes, "ACT/365")
+        assert [q.end_date for q in deposit_quotes] == [date(2026,7,15), date(2026,4,15)]
+        assert [q.maturity_date for q in swap_quotes] == [date(2031,1,15), date(2027,1,15), date(2029,1,15)]
+
+def _assert_same_curve(curve, expected):
+    assert curve.interpolation_dates == expected.interpolation_dates
+    assert curve.interpolation_dfs == expected.interpolation_dfs
+    assert curve.interpolation_year_fractions == expected.interpolation_year_fractions
+
+class TestIncrementalBootstrapper:
+    def test_matches_full_bootstrap(self):
+        years = [1, 2, 3, 5, 7, 10, 15, 20, 30]
+        bootstrapper = IncrementalBootstrapper(date(2026,1,15), "ACT/365")
+        _assert_same_curve(bootstrapper.bootstrap(_deposit_quotes(), _swap_quotes(years)), bootstrap_discount_curve(date(2026,1,15), _deposit_quotes(), _swap_quotes(years), "ACT/365"))
+        assert bootstrapper.solved_pillar_count == 9
+
+        #unchanged quotes solve nothing
+        bootstrapper.bootstrap(_deposit_quotes(), _swap_quotes(years))
+        assert bootstrapper.solved_pillar_count == 0
+
+        #a change to the 30y quote solves one pillar, a change to the 7y quote that pillar and the four after it
+        for changed, expected_count in ((8, 1), (4, 5), (0, 9)):
+            swap_quotes = _swap_quotes(years)
+            swap_quotes[changed].fixed_rate += 0.0005
+            curve = bootstrapper.bootstrap(_deposit_quotes(), swap_quotes)
+            assert bootstrapper.solved_pillar_count == expected_count
+            _assert_same_curve(curve, bootstrap_discount_curve(date(2026,1,15), _deposit_quotes(), swap_quotes, "ACT/365"))
+
+    def test_deposit_change_rebuilds(self):
+        bootstrapper = IncrementalBootstrapper(date(2026,1,15), "ACT/365")
+        bootstrapper.bootstrap(_deposit_quotes(), _swap_quotes([1, 2, 3]))
+        deposit_quotes = _deposit_quotes()
+        deposit_quotes[0].rate = 0.0302
+        curve = bootstrapper.bootstrap(deposit_quotes, _swap_quotes([1, 2, 3]))
+        assert bootstrapper.solved_pillar_count == 3
+        _assert_same_curve(curve, bootstrap_discount_curve(date(2026,1,15), deposit_quotes, _swap_quotes([1, 2, 3]), "ACT/365"))
+
+    def test_added_and_removed_swaps(self):
+        bootstrapper = IncrementalBootstrapper(date(2026,1,15), "ACT/365")
+        bootstrapper.bootstrap(_deposit_quotes(), _swap_quotes([1, 2, 5]))
+        for years, expected_count in (([1, 2, 3, 5], 2), ([1, 2, 3, 5, 7], 1), ([1, 3, 5], 2)):
+            curve = bootstrapper.bootstrap(_deposit_quotes(), _swap_quotes(years))
+            assert bootstrapper.solved_pillar_count == expected_count
+            _assert_same_curve(curve, bootstrap_discount_curve(date(2026,1,15), _deposit_quotes(), _swap_quotes(years), "ACT/365"))
+
+    def test_swap_inside_deposits(self):
+        #a swap maturing before the last deposit is inserted inside the curve, later re-solves must start from the curve without it
+        swap_quotes = [FixedForFloatingSwapQuote(date(2026,1,15), date(2026,6,15), 0.0305, 5, "30E/360", 5, "ACT/360")] + _swap_quotes([1, 2])
+        bootstrapper = IncrementalBootstrapper(date(2026,1,15), "ACT/365")
+        bootstrapper.bootstrap(_deposit_quotes(), swap_quotes)
+        swap_quotes[2].fixed_rate += 0.001
+        curve = bootstrapper.bootstrap(_deposit_quotes(), swap_quotes)
+        assert bootstrapper.solved_pillar_count == 1
+        _assert_same_curve(curve, bootstrap_discount_curve(date(2026,1,15), _deposit_quotes(), swap_quotes, "ACT/365"))
+
+    def test_returned_curve_is_independent(self):
+        bootstrapper = IncrementalBootstrapper(date(2026,1,15), "ACT/365")
+        curve = bootstrapper.bootstrap(_deposit_quotes(), _swap_quotes([1, 2, 3]))
+        curve.add_known_dates([date(2026,1,15)], [1.0])
+        swap_quotes = _swap_quotes([1, 2, 3])
+        swap_quotes[2].fixed_rate += 0.001
+        _assert_same_curve(bootstrapper.bootstrap(_deposit_quotes(), swap_quotes), bootstrap_discount_curve(date(2026,1,15), _deposit_quotes(), swap_quotes, "ACT/365"))
+
+class TestSwapAnnuityCarry:
+    def test_rejects_different_fixed_leg(self):
+        curve = DiscountCurve(date(2026,1,15), [date(2026,7,15)], [0.985], "ACT/365")
+        carry = SwapAnnuityCarry(date(2026,1,15), 6, "30E/360")
+        with pytest.raises(ValueError, match="The annuity carry was built for swaps with a different effective date, fixed frequency or fixed convention!"):
+            _swap_quotes([2])[0].solve_last_df(curve, carry)
+
+def _curve_quotes():
+    quotes = {
+        "GBP": CurveQuotes(date(2026,1,15), _deposit_quotes(), _swap_quotes([1, 2, 3, 5, 10]), "ACT/365"),
+        "EUR": CurveQuotes(date(2026,1,15), _deposit_quotes()[::-1], _swap_quotes([10, 2, 5, 1]), "ACT/360"),
+        #the 2 year swap rate is far too high, so its discount factor is not greater than 0
+        "BAD": CurveQuotes(date(2026,1,15), _deposit_quotes(), [FixedForFloatingSwapQuote(date(2026,1,15), date(2028,1,15), 5.0, 12, "30E/360", 6, "ACT/360")], "ACT/365"),
+    }
+    quotes["GBP 2025"] = (date(2025,1,15), [DepositQuote(date(2025,1,15), date(2025,4,15), 0.041, "ACT/360"), DepositQuote(date(2025,1,15), date(2025,7,15), 0.04, "ACT/360")], [FixedForFloatingSwapQuote(date(2025,1,15), date(2030,1,15), 0.035, 12, "30E/360", 6, "ACT/360")], "ACT/365")
+    return quotes
+
+class TestBootstrapMany:
+    @pytest.mark.parametrize("processes", [1, 2])
+    def test_matches_single_bootstraps(self, processes):
+        curve_quotes = _curve_quotes()
+        results = bootstrap_many(curve_quotes, processes=processes)
+        assert list(results.curves) == ["GBP", "EUR", "GBP 2025"]
+        for name, curve in results.curves.items():
+            expected = bootstrap_discount_curve(*curve_quotes[name])
+            assert curve.valuation_date == expected.valuation_date
+            assert curve.convention == expected.convention
+            _assert_same_curve(curve, expected)
+            assert curve.df(date(2033,3,1)) == expected.df(date(2033,3,1))
+
+    @pytest.mark.parametrize("processes", [1, 2])
+    def test_failures_are_isolated(self, processes):
+        results = bootstrap_many(_curve_quotes(), processes=processes)
+        assert list(results.errors) == ["BAD"]
+        assert isinstance(results.errors["BAD"], ValueError)
+        assert "GBP" in results.curves
+
+    def test_does_not_modify_quotes(self):
+        curve_quotes = _curve_quotes()
+        deposit_quotes, swap_quotes = curve_quotes["EUR"].deposit_quotes, curve_quotes["EUR"].swap_quotes
+        deposit_order, swap_order = list(deposit_quotes), list(swap_quotes)
+        bootstrap_many(curve_quotes, processes=1)
+        assert deposit_quotes == deposit_order
+        assert swap_quotes == swap_order
+
+    def test_processes(self):
+        with pytest.raises(ValueError, match="The number of processes must be greater than 0."):
+            bootstrap_many(_curve_quotes(), processes=0)
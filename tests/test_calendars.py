@@ -0,0 +1,67 @@
+from datetime import date, timedelta
+import numpy as np
+import pytest
+from derivative_valuations.payment_schedule.calendars import HolidayCalendar, resolve_calendar, register_calendar, easter_sunday, london_holidays, target_holidays, FOLLOWING, MODIFIED_FOLLOWING, PRECEDING
+
+class TestHolidays:
+    def test_easter_sunday(self):
+        assert [easter_sunday(year) for year in (2000, 2019, 2024, 2025, 2026, 2038)] == [date(2000,4,23), date(2019,4,21), date(2024,3,31), date(2025,4,20), date(2026,4,5), date(2038,4,25)]
+
+    def test_london_holidays(self):
+        assert sorted(london_holidays(2026, 2026)) == [date(2026,1,1), date(2026,4,3), date(2026,4,6), date(2026,5,4), date(2026,5,25), date(2026,8,31), date(2026,12,25), date(2026,12,28)]
+        #New Year's Day and Christmas Day on a Sunday, moved bank holidays and one-off holidays
+        assert sorted(london_holidays(2022, 2022)) == [date(2022,1,3), date(2022,4,15), date(2022,4,18), date(2022,5,2), date(2022,6,2), date(2022,6,3), date(2022,8,29), date(2022,9,19), date(2022,12,26), date(2022,12,27)]
+
+    def test_target_holidays(self):
+        assert sorted(target_holidays(2026, 2026)) == [date(2026,1,1), date(2026,4,3), date(2026,4,6), date(2026,5,1), date(2026,12,25), date(2026,12,26)]
+
+class TestHolidayCalendar:
+    def test_business_days(self):
+        london = resolve_calendar("London")
+        assert london.is_business_day(date(2026,4,2))
+        assert not london.is_business_day(date(2026,4,3))
+        assert not london.is_business_day(date(2026,4,4))
+        assert resolve_calendar("TARGET").is_business_day(date(2026,5,4))
+        assert london.business_days_between(date(2026,3,30), date(2026,4,13)) == 8
+
+    def test_adjust(self):
+        london = resolve_calendar("London")
+        assert london.adjust(date(2026,4,3), FOLLOWING) == date(2026,4,7)
+        assert london.adjust(date(2026,4,3), PRECEDING) == date(2026,4,2)
+        assert london.adjust(date(2026,4,2), FOLLOWING) == date(2026,4,2)
+        #modified following stays within the month
+        assert london.adjust(date(2026,1,31), FOLLOWING) == date(2026,2,2)
+        assert london.adjust(date(2026,1,31), MODIFIED_FOLLOWING) == date(2026,1,30)
+        assert london.adjust(date(2026,2,28)) == date(2026,2,27)
+
+    def test_adjust_ordinals_matches_adjust(self):
+        london = resolve_calendar("London")
+        dates = [date(2025,12,1) + timedelta(days=i) for i in range(500)]
+        for convention in (FOLLOWING, MODIFIED_FOLLOWING, PRECEDING):
+            adjusted = london.adjust_ordinals(dates, convention)
+            assert adjusted.tolist() == [london.adjust(d, convention).toordinal() for d in dates]
+            assert np.all(london.business_days[adjusted - london.first_ordinal])
+
+    def test_user_supplied_holidays(self):
+        calendar = HolidayCalendar("Test", [date(2026,3,2)], 2026, 2027)
+        assert calendar.adjust(date(2026,3,1), FOLLOWING) == date(2026,3,3)
+        assert calendar.with_holidays("Test extended", [date(2026,3,3)]).adjust(date(2026,3,1), FOLLOWING) == date(2026,3,4)
+        #dates at the ends of the range can still be adjusted
+        assert calendar.adjust(date(2027,12,31), FOLLOWING) == date(2027,12,31)
+        assert calendar.adjust(date(2026,1,3), PRECEDING) == date(2026,1,2)
+
+    def test_register_calendar(self):
+        calendar = register_calendar(HolidayCalendar("Registered test calendar", [date(2026,3,2)], 2026, 2027))
+        assert resolve_calendar("Registered test calendar") is calendar
+        with pytest.raises(ValueError, match="A calendar with this name is already registered!"):
+            register_calendar(HolidayCalendar("London", []))
+
+    def test_validation(self):
+        with pytest.raises(ValueError, match="This calendar is either not recognised or has not yet been registered."):
+            resolve_calendar("Atlantis")
+        with pytest.raises(ValueError, match="This business day convention is either not recognised or has not yet been implemented."):
+            resolve_calendar("London").adjust(date(2026,4,3), "nearest")
+        with pytest.raises(ValueError, match="Date is outside the range of the calendar!"):
+            resolve_calendar("TARGET").adjust(date(1998,12,31))
+        with pytest.raises(ValueError, match="Date is outside the range of the calendar!"):
+            resolve_calendar("London").adjust_ordinals([date(2101,1,1)])
@@ -1,6 +1,7 @@
 from datetime import date
 import pytest
-from derivative_valuations.cashflows.cash_flow import build_fixed_leg_cashflows, build_bond_cashflows
+from derivative_valuations.cashflows.cash_flow import build_fixed_leg_cashflows, build_bond_cashflows, build_float_leg_cashflows
+from derivative_valuations.df_curve.discount_factor import DiscountCurve
 
 class TestFixedLegCashflows:
     def test_empty_schedule(self):
@@ -131,4 +132,36 @@ class TestBondCashflows:
     (date(2026,4,30), pytest.approx(100 * 0.05 * (30/360))),
     (date(2026,4,30), 100)
         ]
-    
\ No newline at end of file
+    
+class TestFloatLegCashflows:
+    def _curve(self):
+        return DiscountCurve(date(2026,1,1), [date(2026,4,1), date(2026,7,1), date(2027,1,1)], [0.99, 0.98, 0.96], "ACT/365")
+
+    def test_empty_schedule(self):
+        with pytest.raises(ValueError, match="Payment schedule is empty!"):
+            build_float_leg_cashflows([], 100, "ACT/360", self._curve())
+
+    def test_negative_notional(self):
+        with pytest.raises(ValueError, match="Notional payment must not be less than 0."):
+            build_float_leg_cashflows([(date(2026,1,1), date(2026,4,1), date(2026,4,1))], -100, "ACT/360", self._curve())
+
+    def test_projected_forward_rates(self):
+        curve = self._curve()
+        cashflows = build_float_leg_cashflows([
+        (date(2026,1,1), date(2026,4,1), date(2026,4,1)),
+        (date(2026,4,1), date(2026,7,1), date(2026,7,1))], 100, "ACT/360", curve)
+        assert cashflows == [
+    (date(2026,4,1), pytest.approx(100*(1/0.99 - 1))),
+    (date(2026,7,1), pytest.approx(100*(0.99/0.98 - 1)))]
+        #each projected coupon is worth notional*(DF(accrual start) - DF(accrual end))
+        assert cashflows[1][1]*0.98 == pytest.approx(100*(0.99 - 0.98))
+
+    def test_spread(self):
+        cashflows = build_float_leg_cashflows([(date(2026,4,1), date(2026,7,1), date(2026,7,1))], 100, "ACT/360", self._curve(), spread=0.01)
+        assert cashflows[0][1] == pytest.approx(100*(0.99/0.98 - 1) + 100*0.01*(91/360))
+
+    def test_fixing_before_valuation_date(self):
+        schedule = [(date(2025,11,1), date(2026,2,1), date(2026,2,1))]
+        assert build_float_leg_cashflows(schedule, 100, "ACT/360", self._curve(), fixings={date(2025,11,1): 0.03}) == [(date(2026,2,1), pytest.approx(100*0.03*(92/360)))]
+        with pytest.raises(ValueError, match="A fixing is required for every floating coupon accruing from before the valuation date!"):
+            build_float_leg_cashflows(schedule, 100, "ACT/360", self._curve())
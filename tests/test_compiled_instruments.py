@@ -0,0 +1,69 @@
+from datetime import date
+import pytest
+from derivative_valuations.df_curve.discount_factor import DiscountCurve
+from derivative_valuations.curve_bootstrapping.financial_instruments import FixedForFloatingSwapQuote
+from derivative_valuations.valuation.bond import Bond, bond_accrued_interest, bond_dirty_price, bond_clean_price, bond_pillar_sensitivities
+from derivative_valuations.valuation.FRA import FRA, FRA_price, FRA_pillar_sensitivities
+from derivative_valuations.valuation.compiled_instruments import CompiledBond, CompiledFRA, CompiledSwapQuote, compile_instrument
+
+def _curve():
+    return DiscountCurve(date(2026,1,1), [date(2026,2,1), date(2026,7,1), date(2027,1,1), date(2029,1,1), date(2031,1,1)], [0.997, 0.985, 0.97, 0.91, 0.85], "ACT/365")
+
+def _bond():
+    return Bond(date(2025,3,15), date(2032,3,15), 0.04, 6, 100, "30E/360")
+
+class TestCompiledBond:
+    def test_matches_bond_functions(self):
+        bond = _bond()
+        compiled_bond = CompiledBond(bond)
+        assert compiled_bond.dirty_price(_curve(), date(2026,1,1)) == pytest.approx(bond_dirty_price(bond, _curve(), date(2026,1,1)), rel=1e-14)
+        assert compiled_bond.clean_price(_curve(), date(2026,1,1)) == pytest.approx(bond_clean_price(bond, _curve(), date(2026,1,1)), rel=1e-14)
+        assert list(compiled_bond.pillar_sensitivities(_curve(), date(2026,1,1))) == list(bond_pillar_sensitivities(bond, _curve(), date(2026,1,1)))
+
+    @pytest.mark.parametrize("t", [date(2025,3,15), date(2025,3,16), date(2025,9,15), date(2026,1,1), date(2032,3,14), date(2032,3,15)])
+    def test_accrued_interest(self, t):
+        assert CompiledBond(_bond()).accrued_interest(t) == bond_accrued_interest(_bond(), t)
+
+    @pytest.mark.parametrize("bond", [_bond(), Bond(date(2024,1,31), date(2031,5,17), 0.0375, 3, 1000000, "ACT/365"), Bond(date(2024,1,31), date(2031,5,17), 0.0375, 12, 1000000, "ACT/360", redemption_at_maturity=False)])
+    def test_cashflows_from_accrual_fractions(self, bond):
+        compiled_bond = CompiledBond(bond)
+        assert list(compiled_bond.cashflows) == bond.build_bond_cashflows()
+        assert list(compiled_bond.amounts) == [amount for _, amount in bond.build_bond_cashflows()]
+        assert list(compiled_bond.payment_ordinals) == [payment_date.toordinal() for payment_date, _ in bond.build_bond_cashflows()]
+
+    def test_invalidate_after_editing_terms(self):
+        bond = _bond()
+        compiled_bond = CompiledBond(bond)
+        bond.rate = 0.05
+        compiled_bond.invalidate()
+        assert compiled_bond.dirty_price(_curve(), date(2026,1,1)) == pytest.approx(bond_dirty_price(bond, _curve(), date(2026,1,1)), rel=1e-14)
+
+class TestCompiledFRA:
+    @pytest.mark.parametrize("pay_fixed", [True, False])
+    def test_matches_FRA_functions(self, pay_fixed):
+        fra = FRA(date(2026,10,1), date(2027,4,1), 0.03, 1000000, "ACT/360", pay_fixed)
+        assert CompiledFRA(fra).price(_curve(), date(2026,1,1)) == pytest.approx(FRA_price(fra, _curve(), date(2026,1,1)), rel=1e-12)
+        assert list(CompiledFRA(fra).pillar_sensitivities(_curve(), date(2026,1,1))) == list(FRA_pillar_sensitivities(fra, _curve(), date(2026,1,1)))
+
+class TestCompiledSwapQuote:
+    def test_matches_solve_last_df(self):
+        quote = FixedForFloatingSwapQuote(date(2026,1,1), date(2030,1,1), 0.035, 12, "30E/360", 6, "ACT/360")
+        assert CompiledSwapQuote(quote).solve_last_df(_curve()) == quote.solve_last_df(_curve())
+
+    def test_last_payment_date_must_be_maturity(self):
+        #a fixed schedule ending before the maturity date is rejected on compiling, as by solve_last_df
+        quote = FixedForFloatingSwapQuote(date(2026,1,1), date(2030,1,1), 0.035, 12, "30E/360", 6, "ACT/360")
+        schedule = quote.fixed_schedule()[:-1]
+        quote.fixed_schedule = lambda: schedule
+        with pytest.raises(ValueError, match="Last fixed payment date must equal the swap maturity_date."):
+            quote.solve_last_df(_curve())
+        with pytest.raises(ValueError, match="Last fixed payment date must equal the swap maturity_date."):
+            CompiledSwapQuote(quote)
+
+class TestCompileInstrument:
+    def test_dispatch(self):
+        assert isinstance(compile_instrument(_bond()), CompiledBond)
+
+    def test_unknown_instrument(self):
+        with pytest.raises(ValueError, match="This instrument type cannot be compiled."):
+            compile_instrument(object())
@@ -0,0 +1,60 @@
+from datetime import date
+import pytest
+from derivative_valuations.curve_bootstrapping.financial_instruments import DepositQuote, FixedForFloatingSwapQuote
+from derivative_valuations.curve_bootstrapping.bootstrapping import bootstrap_discount_curve
+from derivative_valuations.storage.curve_store import CurveStore, quotes_hash
+
+def _quotes(shift: float = 0.0):
+    deposit_quotes = [DepositQuote(date(2026,1,1), date(2026,4,1), 0.03 + shift, "ACT/360"), DepositQuote(date(2026,1,1), date(2026,7,1), 0.031 + shift, "ACT/360")]
+    swap_quotes = [FixedForFloatingSwapQuote(date(2026,1,1), date(2027+n,1,1), 0.032 + 0.001*n + shift, 6, "30E/360", 6, "ACT/360") for n in range(5)]
+    return deposit_quotes, swap_quotes
+
+class TestCurveStore:
+    def test_round_trip(self, tmp_path):
+        store = CurveStore(tmp_path)
+        curve = bootstrap_discount_curve(date(2026,1,1), *_quotes(), "ACT/365")
+        key = quotes_hash(*_quotes(), "ACT/365")
+        store.save(curve, key)
+        assert (date(2026,1,1), key) in store
+        assert store.keys() == [(date(2026,1,1), key)]
+
+        loaded = store.load(date(2026,1,1), key)
+        assert loaded.valuation_date == curve.valuation_date
+        assert loaded.convention == curve.convention
+        assert loaded.interpolation_dates == curve.interpolation_dates
+        assert loaded.interpolation_dfs == curve.interpolation_dfs
+        assert loaded.interpolation_year_fractions == curve.interpolation_year_fractions
+        for t in (date(2026,5,1), date(2028,5,17), date(2035,1,1)):
+            assert loaded.df(t) == curve.df(t)
+
+        #the snapshot arrays are read-only views of the file
+        snapshot = store.snapshot(date(2026,1,1), key)
+        assert not snapshot.interpolation_dfs.flags.writeable
+        assert snapshot.quotes_hash == key
+
+    def test_quotes_hash(self):
+        assert quotes_hash(*_quotes(), "ACT/365") == quotes_hash(*_quotes(), "ACT/365")
+        assert quotes_hash(*_quotes(), "ACT/365") != quotes_hash(*_quotes(1e-12), "ACT/365")
+        assert quotes_hash(*_quotes(), "ACT/365") != quotes_hash(*_quotes(), "ACT/360")
+
+    def test_bootstrap_uses_store(self, tmp_path):
+        store = CurveStore(tmp_path)
+        curve = store.bootstrap(date(2026,1,1), *_quotes(), "ACT/365")
+        assert len(store.keys()) == 1
+        again = store.bootstrap(date(2026,1,1), *_quotes(), "ACT/365")
+        assert again is not curve
+        assert again.interpolation_dfs == curve.interpolation_dfs
+        store.bootstrap(date(2026,1,1), *_quotes(0.001), "ACT/365")
+        assert len(store.keys()) == 2
+
+    def test_missing_snapshot(self, tmp_path):
+        with pytest.raises(ValueError, match="No curve snapshot is stored for this valuation date and quotes hash!"):
+            CurveStore(tmp_path).load(date(2026,1,1), "0"*64)
+
+    def test_round_trip_interpolation(self, tmp_path):
+        store = CurveStore(tmp_path)
+        curve = bootstrap_discount_curve(date(2026,1,1), *_quotes(), "ACT/365").with_interpolation("monotone_convex")
+        store.save(curve, "smooth")
+        loaded = store.load(date(2026,1,1), "smooth")
+        assert loaded.interpolation == "monotone_convex"
+        assert loaded.df(date(2028,5,17)) == curve.df(date(2028,5,17))
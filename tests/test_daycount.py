@@ -1,6 +1,6 @@
 from datetime import date
 import pytest
-from derivative_valuations.daycount_conventions.daycount import year_fraction_computation
+from derivative_valuations.daycount_conventions.daycount import year_fraction_computation, year_fractions, resolve_convention, to_ordinals
 
 class TestYearFractionComputation:
     def test_raises_if_end_before_start(self):
@@ -57,4 +57,32 @@ class TestYearFractionComputation:
 
     def test_30E_360_0(self):
         #test that gives 0 for same day
-        assert year_fraction_computation(date(2026,1,1), date(2026,1,1), "30E/360") == 0
\ No newline at end of file
+        assert year_fraction_computation(date(2026,1,1), date(2026,1,1), "30E/360") == 0
+
+class TestYearFractions:
+    @pytest.mark.parametrize("convention", ["ACT/360", "ACT/365", "30E/360"])
+    def test_matches_scalar(self, convention):
+        start_dates = [date(2026,1,31), date(2024,2,29), date(2026,3,31), date(1999,12,31), date(2026,1,1)]
+        end_dates = [date(2026,2,28), date(2025,2,28), date(2026,4,30), date(2030,5,31), date(2026,1,1)]
+        expected = [year_fraction_computation(start_date, end_date, convention) for start_date, end_date in zip(start_dates, end_dates)]
+        assert list(year_fractions(start_dates, end_dates, convention)) == expected
+        assert list(year_fractions(to_ordinals(start_dates), to_ordinals(end_dates), convention)) == expected
+
+    def test_broadcasts_single_start_date(self):
+        assert list(year_fractions(date(2026,1,1), [date(2026,1,31), date(2026,2,28)], "ACT/360")) == [30/360, 58/360]
+
+    def test_raises_if_end_before_start(self):
+        with pytest.raises(ValueError, match="End date must be after start date!"):
+            year_fractions([date(2026,1,1), date(1999,11,23)], [date(2026,2,1), date(1999,11,22)], "ACT/360")
+
+    def test_raises_if_convention_unknown(self):
+        with pytest.raises(ValueError, match="This day count convention is either not recognised or has not yet been implemented."):
+            year_fractions([date(1999,11,23)], [date(1999,12,23)], "ACT/400")
+
+class TestResolveConvention:
+    def test_resolves_to_year_fraction_function(self):
+        assert resolve_convention("30E/360")(date(2026,1,31), date(2026,2,28)) == year_fraction_computation(date(2026,1,31), date(2026,2,28), "30E/360")
+
+    def test_raises_if_convention_unknown(self):
+        with pytest.raises(ValueError, match="This day count convention is either not recognised or has not yet been implemented."):
+            resolve_convention("ACT/400")
@@ -0,0 +1,136 @@
+import math
+from datetime import date, timedelta
+import pytest
+from derivative_valuations.df_curve.discount_factor import DiscountCurve, interpolate_log_df
+
+def _curve():
+    return DiscountCurve(date(2026,1,1), [date(2026,7,1), date(2027,1,1), date(2028,1,1)], [0.98, 0.96, 0.92], "ACT/365")
+
+class TestDiscountCurveLookup:
+    def test_on_or_before_valuation_date(self):
+        assert _curve().df(date(2026,1,1)) == 1.0
+        assert _curve().df(date(2025,12,1)) == 1.0
+
+    def test_known_date(self):
+        assert _curve().df(date(2027,1,1)) == 0.96
+
+    def test_before_first_known_date(self):
+        with pytest.raises(ValueError, match="Target date cannot be before the first known date!"):
+            _curve().df(date(2026,3,1))
+
+    def test_interpolation_matches_interpolate_log_df(self):
+        #01/01/2026 -> 01/07/2026 is 181 days, 01/01/2026 -> 01/01/2027 is 365 days, 01/01/2026 -> 01/10/2026 is 273 days
+        assert _curve().df(date(2026,10,1)) == interpolate_log_df(181/365, 0.98, 273/365, 365/365, 0.96)
+
+    def test_extrapolation_matches_interpolate_log_df(self):
+        #01/01/2026 -> 01/01/2028 is 730 days, 01/01/2026 -> 01/01/2029 is 1096 days
+        assert _curve().df(date(2029,1,1)) == interpolate_log_df(365/365, 0.96, 1096/365, 730/365, 0.92)
+
+    def test_dfs_matches_df(self):
+        curve = _curve()
+        dates = [date(2025,6,1), date(2026,7,1), date(2026,10,1), date(2027,6,15), date(2028,1,1), date(2030,3,1)]
+        assert list(curve.dfs(dates)) == pytest.approx([curve.df(d) for d in dates], rel=1e-14)
+
+    def test_dfs_before_first_known_date(self):
+        with pytest.raises(ValueError, match="Target date cannot be before the first known date!"):
+            _curve().dfs([date(2027,1,1), date(2026,3,1)])
+
+    def test_lookup_after_adding_known_dates(self):
+        curve = _curve()
+        curve.add_known_dates([date(2026,4,1)], [0.99])
+        assert curve.df(date(2026,4,1)) == 0.99
+        assert list(curve.dfs([date(2026,4,1)])) == [0.99]
+
+class TestAddKnownDates:
+    def test_incremental_insertion_matches_new_curve(self):
+        curve = _curve()
+        curve.add_known_dates([date(2030,1,1), date(2026,4,1), date(2029,1,1)], [0.85, 0.99, 0.88])
+        expected = DiscountCurve(date(2026,1,1), [date(2026,4,1), date(2026,7,1), date(2027,1,1), date(2028,1,1), date(2029,1,1), date(2030,1,1)], [0.99, 0.98, 0.96, 0.92, 0.88, 0.85], "ACT/365")
+        assert curve.interpolation_dates == expected.interpolation_dates
+        assert curve.interpolation_dfs == expected.interpolation_dfs
+        assert curve.interpolation_year_fractions == expected.interpolation_year_fractions
+        dates = [date(2026,5,1), date(2028,6,1), date(2031,1,1)]
+        assert [curve.df(d) for d in dates] == [expected.df(d) for d in dates]
+        assert list(curve.dfs(dates)) == list(expected.dfs(dates))
+
+class TestShiftedCurve:
+    def test_matches_bump_curve(self):
+        curve = _curve()
+        dates = [date(2025,12,1), date(2026,7,1), date(2026,10,1), date(2028,1,1), date(2030,3,1)]
+        bumped_curve = curve.bump_curve(25)
+        shifted_curve = curve.shifted(25)
+        assert [shifted_curve.df(d) for d in dates] == pytest.approx([bumped_curve.df(d) for d in dates], rel=1e-13)
+        assert list(shifted_curve.dfs(dates)) == pytest.approx([bumped_curve.df(d) for d in dates], rel=1e-13)
+        assert shifted_curve.interpolation_dfs == pytest.approx(bumped_curve.interpolation_dfs, rel=1e-13)
+
+    def test_shifts_compose(self):
+        curve = _curve()
+        assert curve.shifted(10).shifted(-4).df(date(2029,1,1)) == pytest.approx(curve.shifted(6).df(date(2029,1,1)), rel=1e-14)
+
+    def test_shares_base_curve(self):
+        curve = _curve()
+        shifted_curve = curve.shifted(10)
+        curve.add_known_dates([date(2030,1,1)], [0.85])
+        assert shifted_curve.interpolation_dates[-1] == date(2030,1,1)
+
+    def test_bump_curve_leaves_original_unchanged(self):
+        curve = _curve()
+        curve.bump_curve(10)
+        assert curve.interpolation_dfs == [0.98, 0.96, 0.92]
+
+class TestInterpolationMethods:
+    def _smooth_curve(self, interpolation):
+        return DiscountCurve(date(2026,1,1), [date(2026,7,1), date(2027,1,1), date(2028,1,1), date(2030,1,1), date(2036,1,1)], [0.985, 0.968, 0.935, 0.87, 0.7], "ACT/365", interpolation)
+
+    def test_default_is_log_linear(self):
+        assert _curve().interpolation == "log_linear"
+        assert _curve().with_interpolation("log_linear").df(date(2026,10,1)) == _curve().df(date(2026,10,1))
+
+    @pytest.mark.parametrize("interpolation", ["monotone_convex", "natural_cubic"])
+    def test_lookups(self, interpolation):
+        curve = self._smooth_curve(interpolation)
+        assert curve.df(date(2027,1,1)) == 0.968
+        assert curve.df(date(2025,12,1)) == 1.0
+        dates = [date(2025,6,1), date(2026,7,1), date(2026,10,1), date(2027,6,15), date(2029,3,1), date(2036,1,1), date(2040,3,1)]
+        assert list(curve.dfs(dates)) == pytest.approx([curve.df(d) for d in dates], rel=1e-15)
+        assert curve.dfs([date(2027,1,1)])[0] == 0.968
+        with pytest.raises(ValueError, match="Target date cannot be before the first known date!"):
+            curve.df(date(2026,3,1))
+        with pytest.raises(ValueError, match="Target date cannot be before the first known date!"):
+            curve.dfs([date(2026,3,1)])
+
+    @pytest.mark.parametrize("interpolation", ["monotone_convex", "natural_cubic"])
+    def test_smooth_forward_rates(self, interpolation):
+        #unlike log_linear, the forward rate either side of a known date (and into the extrapolation) is continuous
+        curve = self._smooth_curve(interpolation)
+        def forward_jump(curve, known_date):
+            before = math.log(curve.df(known_date - timedelta(days=1))/curve.df(known_date))*365
+            after = math.log(curve.df(known_date)/curve.df(known_date + timedelta(days=1)))*365
+            return abs(after - before)
+        for known_date in (date(2027,1,1), date(2028,1,1), date(2030,1,1), date(2036,1,1)):
+            assert forward_jump(curve, known_date) < 2e-5
+        assert forward_jump(curve.with_interpolation("log_linear"), date(2028,1,1)) > 1e-3
+
+    @pytest.mark.parametrize("interpolation", ["monotone_convex", "natural_cubic"])
+    def test_add_known_dates_refits(self, interpolation):
+        curve = self._smooth_curve(interpolation)
+        curve.add_known_dates([date(2032,1,1)], [0.81])
+        expected = DiscountCurve(date(2026,1,1), [date(2026,7,1), date(2027,1,1), date(2028,1,1), date(2030,1,1), date(2032,1,1), date(2036,1,1)], [0.985, 0.968, 0.935, 0.87, 0.81, 0.7], "ACT/365", interpolation)
+        dates = [date(2026,10,1), date(2029,2,1), date(2031,5,1), date(2034,1,1), date(2038,1,1)]
+        assert [curve.df(d) for d in dates] == [expected.df(d) for d in dates]
+
+    @pytest.mark.parametrize("interpolation", ["monotone_convex", "natural_cubic"])
+    def test_shifted_curve_matches_bump_curve(self, interpolation):
+        curve = self._smooth_curve(interpolation)
+        dates = [date(2026,10,1), date(2029,2,1), date(2034,1,1), date(2038,1,1)]
+        bumped_curve = curve.bump_curve(25)
+        assert bumped_curve.interpolation == interpolation
+        assert list(curve.shifted(25).dfs(dates)) == pytest.approx([bumped_curve.df(d) for d in dates], rel=1e-13)
+
+    def test_pillar_weights_log_linear_only(self):
+        with pytest.raises(ValueError, match="Pillar weights are only defined for log-linear interpolation."):
+            self._smooth_curve("natural_cubic").pillar_weights([date(2027,6,1)])
+
+    def test_unknown_interpolation(self):
+        with pytest.raises(ValueError, match="This interpolation method is either not recognised or has not yet been implemented."):
+            self._smooth_curve("cubic")
@@ -0,0 +1,84 @@
+import asyncio
+from datetime import date
+import numpy as np
+import pytest
+from derivative_valuations.curve_bootstrapping.financial_instruments import DepositQuote, FixedForFloatingSwapQuote
+from derivative_valuations.curve_bootstrapping.bootstrapping import bootstrap_discount_curve
+from derivative_valuations.valuation.present_value import pv_many, columnar_cashflows
+from derivative_valuations.market_data.sources import HttpPollingSource, LocalQuoteServer
+from derivative_valuations.market_data.quotes import normalise_quote
+from derivative_valuations.market_data.feed import LiveCurveFeed
+
+def _messages(shift: float = 0.0):
+    messages = [{"type": "deposit", "start_date": "2026-01-15", "end_date": end_date, "rate": rate, "convention": "ACT/360"} for end_date, rate in (("2026-04-15", 0.030), ("2026-07-15", 0.031))]
+    messages += [{"type": "swap", "effective_date": "2026-01-15", "maturity_date": f"{2026+n}-01-15", "fixed_rate": 0.032 + 0.0002*n + shift, "fixed_frequency_months": 12, "fixed_convention": "30E/360", "float_frequency_months": 6, "float_convention": "ACT/360"} for n in range(1, 6)]
+    return messages
+
+def _expected_curve(shift: float = 0.0):
+    deposit_quotes = [DepositQuote(date(2026,1,15), end_date, rate, "ACT/360") for end_date, rate in ((date(2026,4,15), 0.030), (date(2026,7,15), 0.031))]
+    swap_quotes = [FixedForFloatingSwapQuote(date(2026,1,15), date(2026+n,1,15), 0.032 + 0.0002*n + shift, 12, "30E/360", 6, "ACT/360") for n in range(1, 6)]
+    return bootstrap_discount_curve(date(2026,1,15), deposit_quotes, swap_quotes, "ACT/365")
+
+def _portfolio():
+    return columnar_cashflows({1: [(date(2027,1,15), 5.0), (date(2029,6,1), 105.0)], 2: [(date(2026,10,1), -50.0), (date(2031,1,15), 60.0)]})
+
+def _quotes_from(messages):
+    quotes = dict(normalise_quote(message) for message in messages)
+    return [quote for quote in quotes.values() if isinstance(quote, DepositQuote)], [quote for quote in quotes.values() if isinstance(quote, FixedForFloatingSwapQuote)]
+
+async def _replay(messages, pause: float = 0.0):
+    #source yielding messages with an optional pause between them
+    for message in messages:
+        yield message
+        await asyncio.sleep(pause)
+
+class TestLiveCurveFeed:
+    def test_burst_is_coalesced(self):
+        feed = LiveCurveFeed(date(2026,1,15), "ACT/365", [_replay(_messages())], portfolio=_portfolio(), coalesce_seconds=0.05)
+        asyncio.run(feed.run())
+        assert feed.rebuilds == 1
+        update = feed.latest_update
+        assert update.quote_count == 7
+        assert update.curve.interpolation_dfs == _expected_curve().interpolation_dfs
+        trade_ids, pvs = pv_many(*_portfolio(), _expected_curve())
+        assert list(update.trade_ids) == list(trade_ids)
+        assert np.allclose(update.pvs, pvs, rtol=1e-14)
+        assert update.latency == pytest.approx(update.published - update.first_arrival)
+        metrics = feed.metrics()
+        assert metrics["quotes_received"] == 7
+        assert metrics["latency_seconds"]["count"] == 1
+        assert metrics["latency_seconds"]["max"] >= 0.05
+
+    def test_rejected_messages(self):
+        feed = LiveCurveFeed(date(2026,1,15), "ACT/365", [_replay([{"type": "bond"}, "garbage"] + _messages())], coalesce_seconds=0)
+        asyncio.run(feed.run())
+        assert feed.quotes_rejected == 2
+        assert feed.latest_update.curve.interpolation_dfs == _expected_curve().interpolation_dfs
+
+    def test_rate_limit(self):
+        #ticks to the 5y quote every 10ms with at most one rebuild every 100ms
+        ticks = [dict(_messages()[-1], fixed_rate=0.033 + 0.00001*i) for i in range(20)]
+        feed = LiveCurveFeed(date(2026,1,15), "ACT/365", [_replay(_messages() + ticks, pause=0.01)], coalesce_seconds=0, min_rebuild_interval=0.1)
+        asyncio.run(feed.run())
+        assert 2 <= feed.rebuilds <= 6
+        assert feed.latest_update.curve.interpolation_dfs[-1] == bootstrap_discount_curve(date(2026,1,15), *_quotes_from(_messages()[:-1] + ticks[-1:]), "ACT/365").interpolation_dfs[-1]
+
+    def test_local_server_end_to_end(self):
+        async def scenario():
+            async with LocalQuoteServer(_messages()) as server:
+                updates = []
+                async def on_update(update):
+                    updates.append(update)
+                    if len(updates) == 1:
+                        #the market moves, the feed publishes the new curve at the next poll
+                        server.set_messages(_messages(0.001))
+                    else:
+                        feed.stop()
+                feed = LiveCurveFeed(date(2026,1,15), "ACT/365", [HttpPollingSource(server.url, interval=0.01)], portfolio=_portfolio(), coalesce_seconds=0.01, on_update=on_update)
+                await asyncio.wait_for(feed.run(), 10)
+                return feed, updates
+        feed, updates = asyncio.run(scenario())
+        assert len(updates) == 2
+        assert updates[0].curve.interpolation_dfs == _expected_curve().interpolation_dfs
+        assert updates[1].curve.interpolation_dfs == _expected_curve(0.001).interpolation_dfs
+        assert updates[1].quote_count == 5
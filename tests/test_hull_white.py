@@ -0,0 +1,98 @@
+from datetime import date
+import numpy as np
+import pytest
+from derivative_valuations.df_curve.discount_factor import DiscountCurve
+from derivative_valuations.cashflows.cash_flow import build_fixed_leg_cashflows
+from derivative_valuations.payment_schedule.accrual_period_payment_schedule import generate_schedule
+from derivative_valuations.valuation.bond import Bond
+from derivative_valuations.valuation.FRA import FRA, FRA_price
+from derivative_valuations.valuation.hull_white import HullWhiteModel, ExposureSimulator, exposure_cashflows, simulate_exposure
+
+def _curve():
+    return DiscountCurve(date(2026,1,1), [date(2026,1,1), date(2026,7,1), date(2027,1,1), date(2029,1,1), date(2031,1,1), date(2036,1,1)], [1.0, 0.985, 0.97, 0.91, 0.85, 0.74], "ACT/365")
+
+def _instruments():
+    return {
+        "bond": Bond(date(2025,3,1), date(2030,3,1), 0.04, 6, 100, "30E/360"),
+        "fra": FRA(date(2026,9,1), date(2027,3,1), 0.03, 1000, "ACT/360", True),
+        "leg": [(payment_date, -amount) for payment_date, amount in build_fixed_leg_cashflows(generate_schedule(date(2026,1,1), date(2029,1,1), 12), 100, 0.035, "30E/360")],
+    }
+
+_EXPOSURE_DATES = [date(2026,4,1), date(2026,9,1), date(2027,1,1), date(2028,6,1), date(2030,6,1)]
+
+class TestHullWhiteModel:
+    def test_fits_curve(self):
+        model = HullWhiteModel(_curve(), 0.05, 0.01)
+        maturities = [date(2026,3,1), date(2028,1,1), date(2035,6,1)]
+        assert np.allclose(model.zero_coupon_bonds(date(2026,1,1), np.zeros(1), maturities)[0], _curve().dfs(maturities), rtol=1e-15)
+
+    def test_simulated_moments(self):
+        model = HullWhiteModel(_curve(), 0.1, 0.01)
+        times = np.array([0.5, 1.0, 3.0])
+        x = model.simulate(times, 200000, np.random.default_rng(0))
+        assert np.allclose(x.mean(axis=0), 0, atol=1e-4)
+        assert np.allclose(x.var(axis=0), model.x_variance(times), rtol=0.01)
+        #E[P(t,T)] = P(0,T)/P(0,t)*exp(0.5*(V(t,T) - V(0,T) + V(0,t)) + 0.5*B(t,T)^2*Var[x(t)])
+        t, T = date(2027,1,1), date(2031,1,1)
+        t_time, T_time = model.times([t, T])
+        expected = _curve().df(T)/_curve().df(t)*np.exp(0.5*(model.V(t_time, T_time) - model.V(0, T_time) + model.V(0, t_time)) + 0.5*model.B(t_time, T_time)**2*model.x_variance(t_time))
+        x_t = model.simulate(np.array([t_time]), 200000, np.random.default_rng(1))[:, 0]
+        assert model.zero_coupon_bonds(t, x_t, [T])[:, 0].mean() == pytest.approx(expected, rel=1e-4)
+
+    def test_validation(self):
+        with pytest.raises(ValueError, match="Mean reversion must be greater than 0."):
+            HullWhiteModel(_curve(), 0.0, 0.01)
+        with pytest.raises(ValueError, match="Volatility must not be less than 0."):
+            HullWhiteModel(_curve(), 0.05, -0.01)
+        with pytest.raises(ValueError, match="strictly increasing"):
+            HullWhiteModel(_curve(), 0.05, 0.01).simulate(np.array([1.0, 1.0]), 10, np.random.default_rng(0))
+
+class TestExposure:
+    def test_zero_volatility_matches_forward_values(self):
+        #without volatility every path is the curve's forward value of the cashflows still to come
+        curve = _curve()
+        model = HullWhiteModel(curve, 0.05, 0.0)
+        simulator = ExposureSimulator(model, *exposure_cashflows(_instruments()), _EXPOSURE_DATES)
+        values = next(simulator.simulate(3, seed=0))
+        for j, exposure_date in enumerate(_EXPOSURE_DATES):
+            expected = 0.0
+            for trade_id, instrument in _instruments().items():
+                if isinstance(instrument, FRA):
+                    expected += FRA_price(instrument, curve, curve.valuation_date)/curve.df(exposure_date) if exposure_date < instrument.start_date else 0.0
+                else:
+                    cashflows = instrument.build_bond_cashflows() if isinstance(instrument, Bond) else instrument
+                    expected += sum(amount*curve.df(payment_date) for payment_date, amount in cashflows if payment_date > exposure_date)/curve.df(exposure_date)
+            assert np.allclose(values[:, j], expected, rtol=1e-12)
+
+    def test_trade_values_sum_to_path_values(self):
+        model = HullWhiteModel(_curve(), 0.05, 0.01)
+        simulator = ExposureSimulator(model, *exposure_cashflows(_instruments()), _EXPOSURE_DATES)
+        x = model.simulate(simulator.times, 500, np.random.default_rng(0))
+        path_values = simulator.path_values(x)
+        for j in range(len(_EXPOSURE_DATES)):
+            trade_values = simulator.trade_values(x, j)
+            assert trade_values.shape == (500, 3)
+            assert np.allclose(trade_values.sum(axis=1), path_values[:, j], rtol=1e-12, atol=1e-10)
+        #the FRA has settled by the final two dates, the bond and leg have paid out by the final date
+        assert list(simulator.trade_ids) == ["bond", "fra", "leg"]
+        assert np.all(simulator.trade_values(x, 3)[:, 1] == 0)
+        assert np.all(simulator.trade_values(x, 4)[:, 2] == 0)
+
+    def test_simulate_exposure(self):
+        model = HullWhiteModel(_curve(), 0.05, 0.01)
+        profile = simulate_exposure(model, _instruments(), _EXPOSURE_DATES, paths=3000, chunk_size=1000, seed=7)
+        chunked = simulate_exposure(model, _instruments(), _EXPOSURE_DATES, paths=3000, chunk_size=250, seed=7)
+        assert np.allclose(profile.expected_exposure, chunked.expected_exposure, rtol=1e-12)
+        assert np.allclose(profile.potential_future_exposure, chunked.potential_future_exposure, rtol=1e-12)
+        assert np.all(profile.potential_future_exposure >= profile.mean_value)
+        assert np.all(profile.expected_exposure >= np.maximum(profile.mean_value, 0) - 1e-9)
+        time_steps = np.diff(np.concatenate(([0.0], profile.times)))
+        assert profile.expected_positive_exposure == pytest.approx((profile.expected_exposure*time_steps).sum()/profile.times[-1])
+        assert profile.paths == 3000
+
+    def test_validation(self):
+        model = HullWhiteModel(_curve(), 0.05, 0.01)
+        with pytest.raises(ValueError, match="Exposure dates must be strictly increasing and after the valuation date!"):
+            simulate_exposure(model, _instruments(), [date(2026,1,1)])
+        with pytest.raises(ValueError, match="Quantile must be between 0 and 1."):
+            simulate_exposure(model, _instruments(), _EXPOSURE_DATES, quantile=1.0)
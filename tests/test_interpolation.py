@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+from derivative_valuations.df_curve.interpolation import fit_natural_cubic, fit_monotone_convex, resolve_interpolation
+
+_YEAR_FRACTIONS = np.array([0.25, 0.5, 1.0, 2.0, 3.0, 5.0, 7.0, 10.0, 20.0, 30.0])
+_ZERO_RATES = np.array([0.030, 0.031, 0.033, 0.036, 0.037, 0.036, 0.038, 0.040, 0.039, 0.041])
+
+def _log_dfs():
+    return -_ZERO_RATES*_YEAR_FRACTIONS
+
+def _value_at_knot_ends(fit):
+    #value of each cubic at the end of its interval
+    widths = np.diff(fit.knots)
+    return fit.c_0 + widths*(fit.c_1 + widths*(fit.c_2 + widths*fit.c_3))
+
+@pytest.mark.parametrize("fit_function", [fit_natural_cubic, fit_monotone_convex])
+class TestPiecewiseCubic:
+    def test_reproduces_known_points(self, fit_function):
+        fit = fit_function(_YEAR_FRACTIONS, _log_dfs())
+        assert np.array_equal(fit.log_dfs(_YEAR_FRACTIONS[:-1]), _log_dfs()[:-1])
+        assert fit.log_dfs(_YEAR_FRACTIONS[-1:])[0] == pytest.approx(_log_dfs()[-1], abs=1e-14)
+
+    def test_continuous(self, fit_function):
+        fit = fit_function(_YEAR_FRACTIONS, _log_dfs())
+        assert np.allclose(_value_at_knot_ends(fit)[:-1], fit.c_0[1:], atol=1e-14)
+        #forward rates are continuous too, the slope at the end of each interval is the next interval's c_1
+        widths = np.diff(fit.knots)
+        end_slopes = fit.c_1 + 2*fit.c_2*widths + 3*fit.c_3*widths**2
+        assert np.allclose(end_slopes[:-1], fit.c_1[1:], atol=1e-12)
+        assert fit.end_forward_rate == pytest.approx(-end_slopes[-1], abs=1e-12)
+
+    def test_linear_data(self, fit_function):
+        #a flat forward curve is reproduced exactly, which is why shifting every zero rate is exact under every method
+        fit = fit_function(_YEAR_FRACTIONS, -0.035*_YEAR_FRACTIONS)
+        t = np.linspace(0.25, 30, 500)
+        assert np.allclose(fit.log_dfs(t), -0.035*t, atol=1e-14)
+        assert fit.end_forward_rate == pytest.approx(0.035)
+
+    def test_two_points(self, fit_function):
+        fit = fit_function(np.array([1.0, 2.0]), np.array([-0.03, -0.07]))
+        assert fit.log_dfs(np.array([1.5]))[0] == pytest.approx(-0.05)
+
+class TestNaturalCubic:
+    def test_second_derivatives(self):
+        fit = fit_natural_cubic(_YEAR_FRACTIONS, _log_dfs())
+        #natural end conditions, zero curvature at the first and final known points
+        assert fit.c_2[0] == 0
+        widths = np.diff(fit.knots)
+        assert 2*fit.c_2[-1] + 6*fit.c_3[-1]*widths[-1] == pytest.approx(0, abs=1e-15)
+
+class TestMonotoneConvex:
+    def test_preserves_monotone_forwards(self):
+        #increasing discrete forward rates give increasing instantaneous forward rates
+        t = np.array([0.5, 1.0, 2.0, 3.0, 5.0, 10.0])
+        discrete_forwards = np.array([0.02, 0.025, 0.03, 0.032, 0.04])
+        log_dfs = np.concatenate(([-0.019*0.5], -0.019*0.5 - np.cumsum(discrete_forwards*np.diff(t))))
+        fit = fit_monotone_convex(t, log_dfs)
+        grid = np.linspace(0.5, 10, 2001)
+        forwards = -np.gradient(fit.log_dfs(grid), grid)
+        assert np.all(np.diff(forwards) >= -1e-9)
+
+    def test_breakpoints_are_knots(self):
+        fit = fit_monotone_convex(_YEAR_FRACTIONS, _log_dfs())
+        assert set(_YEAR_FRACTIONS) <= set(fit.knots)
+        assert len(fit.knots) > len(_YEAR_FRACTIONS)
+        assert np.all(np.diff(fit.knots) > 0)
+
+def test_resolve_interpolation():
+    assert resolve_interpolation("log_linear") is None
+    assert resolve_interpolation("natural_cubic") is fit_natural_cubic
+    with pytest.raises(ValueError, match="This interpolation method is either not recognised or has not yet been implemented."):
+        resolve_interpolation("quadratic")
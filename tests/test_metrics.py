@@ -0,0 +1,103 @@
+from datetime import date
+import os
+import subprocess
+import sys
+import pytest
+from derivative_valuations.instrumentation import metrics
+from derivative_valuations.instrumentation.metrics import instrumentation, snapshot, prometheus_text, write_prometheus
+from derivative_valuations.curve_bootstrapping.financial_instruments import DepositQuote, FixedForFloatingSwapQuote
+from derivative_valuations.curve_bootstrapping import bootstrapping
+from derivative_valuations.df_curve.discount_factor import DiscountCurve
+from derivative_valuations.payment_schedule import accrual_period_payment_schedule
+from derivative_valuations.valuation.bond import Bond, bond_dirty_price
+
+def _quotes():
+    deposit_quotes = [DepositQuote(date(2026,1,1), date(2026,7,1), 0.03, "ACT/360")]
+    swap_quotes = [FixedForFloatingSwapQuote(date(2026,1,1), date(2027+n,1,1), 0.032+0.001*n, 6, "30E/360", 6, "ACT/360") for n in range(3)]
+    return deposit_quotes, swap_quotes
+
+@pytest.fixture(autouse=True)
+def _instrumentation_off():
+    metrics.disable()
+    yield
+    metrics.disable()
+
+class TestInstrumentation:
+    def test_off_by_default(self):
+        #when off the original methods are in place and nothing is counted
+        assert not hasattr(DiscountCurve.df, "__wrapped__")
+        metrics.reset()
+        curve = bootstrapping.bootstrap_discount_curve(date(2026,1,1), *_quotes(), "ACT/365")
+        curve.df(date(2027,3,1))
+        assert all(statistics["count"] == 0 for statistics in snapshot()["calls"].values())
+
+    def test_counts_hot_paths(self):
+        accrual_period_payment_schedule.clear_schedule_cache()
+        with instrumentation():
+            assert hasattr(DiscountCurve.df, "__wrapped__")
+            curve = bootstrapping.bootstrap_discount_curve(date(2026,1,1), *_quotes(), "ACT/365")
+            curve.df(date(2027,3,1))
+            curve.df(date(2028,3,1))
+            curve.bump_curve(1)
+            accrual_period_payment_schedule.generate_schedule(date(2026,1,1), date(2031,1,1), 6)
+        calls = snapshot()["calls"]
+        assert calls["DiscountCurve.df"]["count"] >= 2
+        assert calls["FixedForFloatingSwapQuote.solve_last_df"]["count"] == 3
+        assert calls["DiscountCurve.bump_curve"]["count"] == 1
+        assert calls["generate_schedule"]["count"] == 1
+        assert calls["year_fraction_computation"]["count"] > 0
+        assert calls["DiscountCurve.df"]["total_seconds"] >= calls["DiscountCurve.df"]["max_seconds"] > 0
+
+        #the originals are restored on exit and the counters kept
+        assert not snapshot()["enabled"]
+        assert not hasattr(DiscountCurve.df, "__wrapped__")
+        assert snapshot()["calls"]["DiscountCurve.bump_curve"]["count"] == 1
+
+    def test_schedule_cache_statistics(self):
+        with instrumentation():
+            for _ in range(3):
+                accrual_period_payment_schedule.generate_schedule(date(2019,3,7), date(2024,3,7), 3)
+        cache = snapshot()["caches"]["schedule"]
+        assert cache["hits"] >= 2
+        assert cache["hits"] + cache["misses"] >= 3
+        assert 0 < cache["hit_ratio"] <= 1
+
+    def test_counts_schedules_built_by_pricing(self):
+        #library paths go through cached_schedule, each schedule built is counted once and later calls are cache hits
+        accrual_period_payment_schedule.clear_schedule_cache()
+        curve = DiscountCurve(date(2026,1,1), [date(2026,1,1), date(2031,1,1)], [1.0, 0.85], "ACT/365")
+        bonds = [Bond(date(2026,1,1), date(2028+n,1,1), 0.04, 6, 100, "30E/360") for n in range(4)]
+        with instrumentation():
+            for bond in bonds + bonds:
+                bond_dirty_price(bond, curve, curve.valuation_date)
+        statistics = snapshot()
+        assert statistics["calls"]["generate_schedule"]["count"] == 4
+        assert statistics["calls"]["generate_schedule"]["total_seconds"] > 0
+        assert statistics["caches"]["schedule"]["misses"] == 4
+
+    def test_nested_contexts(self):
+        with instrumentation():
+            with instrumentation(reset_counters=False):
+                pass
+            assert snapshot()["enabled"]
+        assert not snapshot()["enabled"]
+
+    def test_prometheus_text(self, tmp_path):
+        with instrumentation():
+            DiscountCurve(date(2026,1,1), [date(2027,1,1), date(2028,1,1)], [0.97, 0.94], "ACT/365").df(date(2027,6,1))
+        text = prometheus_text()
+        assert '# TYPE derivative_valuations_calls_total counter' in text
+        assert 'derivative_valuations_calls_total{function="DiscountCurve.df"} 1' in text
+        assert 'derivative_valuations_cache_hit_ratio{cache="schedule"}' in text
+
+        path = tmp_path / "derivative_valuations.prom"
+        write_prometheus(path)
+        assert path.read_text() == text
+
+    def test_environment_variable(self, tmp_path):
+        #switched on at import through the environment, with the Prometheus text written on exit
+        path = tmp_path / "metrics.prom"
+        environment = dict(os.environ, DERIVATIVE_VALUATIONS_INSTRUMENTATION="1", DERIVATIVE_VALUATIONS_METRICS_FILE=str(path))
+        code = "from datetime import date; from derivative_valuations.df_curve.discount_factor import DiscountCurve; DiscountCurve(date(2026,1,1), [date(2027,1,1), date(2028,1,1)], [0.97, 0.94], 'ACT/365').df(date(2027,6,1))"
+        subprocess.run([sys.executable, "-c", code], env=environment, check=True)
+        assert 'derivative_valuations_calls_total{function="DiscountCurve.df"} 1' in path.read_text()
@@ -0,0 +1,101 @@
+from datetime import date
+import numpy as np
+import pytest
+from derivative_valuations.df_curve.discount_factor import DiscountCurve
+from derivative_valuations.valuation.bond import Bond, bond_dirty_price
+from derivative_valuations.valuation.FRA import FRA, FRA_price
+from derivative_valuations.valuation.present_value import pv_many
+from derivative_valuations.storage import portfolio_store
+from derivative_valuations.storage.portfolio_store import write_portfolio, PortfolioStore
+
+def _curve():
+    return DiscountCurve(date(2026,1,1), [date(2026,1,1), date(2027,1,1), date(2029,1,1), date(2036,1,1)], [1.0, 0.97, 0.91, 0.75], "ACT/365")
+
+def _portfolio():
+    return {
+        "BOND-1": Bond(date(2026,1,1), date(2031,1,1), 0.045, 6, 100, "30E/360"),
+        "FRA-1": FRA(date(2026,7,1), date(2027,1,1), 0.031, 1000000, "ACT/360", True),
+        "BOND-2": Bond(date(2026,1,1), date(2030,7,1), 0.02, 12, 1000, "ACT/365", redemption_at_maturity=False),
+        "FRA-2": FRA(date(2027,1,1), date(2027,4,1), 0.029, 5000000.5, "ACT/365", False),
+    }
+
+class TestPortfolioStore:
+    def test_round_trip(self, tmp_path):
+        portfolio = _portfolio()
+        write_portfolio(tmp_path / "portfolio.dvp", portfolio)
+        store = PortfolioStore(tmp_path / "portfolio.dvp")
+        assert store.version == 1
+        assert len(store) == 4
+        restored = store.instruments()
+        assert list(restored) == list(portfolio)
+        for trade_id, instrument in portfolio.items():
+            assert type(restored[trade_id]) is type(instrument)
+            assert vars(restored[trade_id]) == vars(instrument)
+        for i, instrument in enumerate(portfolio.values()):
+            if isinstance(instrument, Bond):
+                assert store.cashflows(i) == instrument.build_bond_cashflows()
+
+    def test_zero_copy_arrays(self, tmp_path):
+        write_portfolio(tmp_path / "portfolio.dvp", {1: Bond(date(2026,1,1), date(2031,1,1), 0.045, 6, 100, "30E/360")})
+        store = PortfolioStore(tmp_path / "portfolio.dvp")
+        assert isinstance(store.payment_dates.base, np.memmap) or isinstance(store.payment_dates, np.memmap)
+        assert not store.payment_dates.flags.writeable
+        assert store.trade_id(0) == 1
+        assert store.payment_dates.ctypes.data % 64 == 0
+
+    def test_present_values(self, tmp_path):
+        curve = _curve()
+        portfolio = _portfolio()
+        write_portfolio(tmp_path / "portfolio.dvp", portfolio)
+        pvs = PortfolioStore(tmp_path / "portfolio.dvp").present_values(curve)
+        expected = [bond_dirty_price(instrument, curve, curve.valuation_date) if isinstance(instrument, Bond) else FRA_price(instrument, curve, curve.valuation_date) for instrument in portfolio.values()]
+        assert pvs == pytest.approx(expected, rel=1e-10)
+        assert pvs[0] == pytest.approx(bond_dirty_price(portfolio["BOND-1"], curve, curve.valuation_date), rel=1e-12)
+
+    def test_present_values_seasoned(self, tmp_path):
+        #bond cashflows paid on or before the valuation date are not valued, an FRA starting on the valuation date still is
+        curve = DiscountCurve(date(2026,1,15), [date(2026,1,15), date(2027,1,15), date(2030,1,15)], [1.0, 0.97, 0.88], "ACT/365")
+        portfolio = {
+            "BOND-1": Bond(date(2022,1,15), date(2030,1,15), 0.05, 6, 100, "30E/360"),
+            "BOND-2": Bond(date(2020,1,15), date(2025,1,15), 0.04, 12, 100, "ACT/365"),
+            "FRA-1": FRA(date(2026,1,15), date(2026,7,15), 0.031, 1000000, "ACT/360", True),
+        }
+        write_portfolio(tmp_path / "portfolio.dvp", portfolio)
+        pvs = PortfolioStore(tmp_path / "portfolio.dvp").present_values(curve)
+        assert pvs[0] == pytest.approx(bond_dirty_price(portfolio["BOND-1"], curve, curve.valuation_date), rel=1e-12)
+        assert pvs[1] == 0
+        assert pvs[2] == pytest.approx(FRA_price(portfolio["FRA-1"], curve, curve.valuation_date), rel=1e-10)
+
+    def test_present_values_prices_mapped_columns(self, tmp_path, monkeypatch):
+        #the mapped payment date and trade columns are passed to pv_many without copying, only the amounts are rebuilt
+        write_portfolio(tmp_path / "portfolio.dvp", _portfolio())
+        store = PortfolioStore(tmp_path / "portfolio.dvp")
+        calls = []
+        def recording_pv_many(payment_dates, amounts, trade_ids, curve):
+            calls.append((payment_dates, trade_ids))
+            return pv_many(payment_dates, amounts, trade_ids, curve)
+        monkeypatch.setattr(portfolio_store, "pv_many", recording_pv_many)
+        store.present_values(_curve())
+        assert calls[0][0] is store.payment_dates
+        assert calls[0][1] is store.cashflow_trades
+
+    def test_present_values_started_FRA(self, tmp_path):
+        curve = DiscountCurve(date(2026,1,15), [date(2026,1,15), date(2027,1,15)], [1.0, 0.97], "ACT/365")
+        write_portfolio(tmp_path / "portfolio.dvp", {"FRA-1": FRA(date(2025,12,1), date(2026,6,1), 0.031, 1000000, "ACT/360", True)})
+        with pytest.raises(ValueError, match="Valuation date cannot be before the forward start date."):
+            PortfolioStore(tmp_path / "portfolio.dvp").present_values(curve)
+
+    def test_empty_portfolio(self, tmp_path):
+        write_portfolio(tmp_path / "portfolio.dvp", {})
+        store = PortfolioStore(tmp_path / "portfolio.dvp")
+        assert len(store) == 0
+        assert store.instruments() == {}
+
+    def test_validation(self, tmp_path):
+        with pytest.raises(ValueError, match="Trade ids must be all integers or all strings!"):
+            write_portfolio(tmp_path / "portfolio.dvp", {1: _portfolio()["BOND-1"], "2": _portfolio()["FRA-1"]})
+        with pytest.raises(ValueError, match="Only bonds and FRAs can be stored."):
+            write_portfolio(tmp_path / "portfolio.dvp", {1: object()})
+        (tmp_path / "other.bin").write_bytes(b"not a portfolio store")
+        with pytest.raises(ValueError, match="The file is not in the expected format!"):
+            PortfolioStore(tmp_path / "other.bin")
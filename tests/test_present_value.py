@@ -0,0 +1,90 @@
+from datetime import date
+import math
+import pytest
+from derivative_valuations.df_curve.discount_factor import DiscountCurve
+from derivative_valuations.valuation.present_value import pv, DV01, convexity, pillar_sensitivities, bucketed_DV01, pv_many, columnar_cashflows, greeks, greeks_many
+
+def _curve():
+    return DiscountCurve(date(2026,1,1), [date(2026,7,1), date(2027,1,1), date(2029,1,1), date(2031,1,1)], [0.985, 0.97, 0.91, 0.85], "ACT/365")
+
+def _cashflows():
+    #cashflows on a known date, between known dates and beyond the final known date
+    return [(date(2026,1,1), 3.0), (date(2027,1,1), 5.0), (date(2028,3,1), 5.0), (date(2031,1,1), 5.0), (date(2033,6,1), 105.0)]
+
+def _bump_pillar(curve: DiscountCurve, i: int, bp: float):
+    #helper bumping the zero rate at a single known date of the curve
+    dfs = list(curve.interpolation_dfs)
+    t = curve.interpolation_year_fractions[i]
+    dfs[i] = math.exp(-(-math.log(dfs[i])/t + bp/10000)*t)
+    return DiscountCurve(curve.valuation_date, list(curve.interpolation_dates), dfs, curve.convention)
+
+class TestPillarSensitivities:
+    def test_matches_single_pillar_bumps(self):
+        curve = _curve()
+        base = pv(_cashflows(), curve)
+        bumped = [(pv(_cashflows(), _bump_pillar(curve, i, 0.01)) - base)/0.000001 for i in range(4)]
+        assert list(pillar_sensitivities(_cashflows(), curve)) == pytest.approx(bumped, rel=1e-5)
+
+    def test_bucketed_DV01_sums_to_parallel_DV01(self):
+        assert sum(bucketed_DV01(_cashflows(), _curve(), 0.01)) == pytest.approx(DV01(_cashflows(), _curve(), 0.01), rel=1e-5)
+
+    def test_settled_cashflows_have_no_sensitivity(self):
+        assert list(pillar_sensitivities([(date(2025,12,1), 100.0)], _curve())) == [0.0, 0.0, 0.0, 0.0]
+
+    def test_empty_cashflows(self):
+        with pytest.raises(ValueError, match="Cash flows are empty!"):
+            pillar_sensitivities([], _curve())
+
+class TestShiftedCurveRisk:
+    def test_DV01_matches_bump_curve(self):
+        curve = _curve()
+        assert DV01(_cashflows(), curve, 1) == pytest.approx(pv(_cashflows(), curve.bump_curve(1)) - pv(_cashflows(), curve), rel=1e-9)
+
+    def test_convexity_matches_bump_curve(self):
+        curve = _curve()
+        base = pv(_cashflows(), curve)
+        expected = (pv(_cashflows(), curve.bump_curve(0.5)) - 2*base + pv(_cashflows(), curve.bump_curve(-0.5)))/(base*0.5**2)
+        assert convexity(_cashflows(), curve, 0.5) == pytest.approx(expected, rel=1e-6)
+
+class TestPvMany:
+    def test_matches_pv_per_trade(self):
+        curve = _curve()
+        trades = {"B": _cashflows(), "A": [(date(2027,1,1), -2.0), (date(2030,2,1), 4.0)], "C": [(date(2028,3,1), 7.0)]}
+        trade_ids, pvs = pv_many(*columnar_cashflows(trades), curve)
+        assert list(trade_ids) == ["A", "B", "C"]
+        assert list(pvs) == pytest.approx([pv(trades[trade_id], curve) for trade_id in ["A", "B", "C"]], rel=1e-14)
+
+    def test_mismatched_columns(self):
+        with pytest.raises(ValueError, match="Each cash flow must have a payment date, an amount and a trade id!"):
+            pv_many([date(2027,1,1).toordinal()], [1.0, 2.0], [1], _curve())
+
+class TestGreeks:
+    def test_matches_DV01_and_convexity(self):
+        curve = _curve()
+        forward = greeks(_cashflows(), curve, [1.0, 10.0], "forward")
+        central = greeks(_cashflows(), curve, [1.0, 10.0], "central")
+        assert forward.pv == pytest.approx(pv(_cashflows(), curve), rel=1e-14)
+        assert forward.DV01 == pytest.approx((DV01(_cashflows(), curve, 1.0), DV01(_cashflows(), curve, 10.0)), rel=1e-9)
+        assert central.convexity == pytest.approx((convexity(_cashflows(), curve, 1.0), convexity(_cashflows(), curve, 10.0)), rel=1e-6)
+
+    def test_schemes(self):
+        curve = _curve()
+        base = pv(_cashflows(), curve)
+        up = pv(_cashflows(), curve.shifted(5))
+        down = pv(_cashflows(), curve.shifted(-5))
+        assert greeks(_cashflows(), curve, 5, "backward").DV01[0] == pytest.approx(base - down, rel=1e-9)
+        assert greeks(_cashflows(), curve, 5, "central").DV01[0] == pytest.approx((up - down)/2, rel=1e-9)
+
+    def test_unknown_scheme(self):
+        with pytest.raises(ValueError, match="The finite difference scheme must be one of forward, backward or central."):
+            greeks(_cashflows(), _curve(), 1.0, "sideways")
+
+    def test_portfolio_matches_single(self):
+        curve = _curve()
+        trades = {"A": [(date(2027,1,1), -2.0), (date(2030,2,1), 4.0)], "B": _cashflows()}
+        trade_ids, portfolio_greeks = greeks_many(*columnar_cashflows(trades), curve, [1.0, 25.0])
+        for i, trade_id in enumerate(trade_ids):
+            single = greeks(trades[trade_id], curve, [1.0, 25.0])
+            assert portfolio_greeks.pv[i] == pytest.approx(single.pv, rel=1e-14)
+            assert [DV01[i] for DV01 in portfolio_greeks.DV01] == pytest.approx(single.DV01, rel=1e-12)
+            assert [convexity[i] for convexity in portfolio_greeks.convexity] == pytest.approx(single.convexity, rel=1e-12)
@@ -0,0 +1,28 @@
+from datetime import date
+import pytest
+from derivative_valuations.curve_bootstrapping.financial_instruments import DepositQuote, FixedForFloatingSwapQuote
+from derivative_valuations.market_data.quotes import normalise_quote
+
+class TestNormaliseQuote:
+    def test_deposit(self):
+        quote_id, quote = normalise_quote({"type": "deposit", "start_date": "2026-01-15", "end_date": "2026-04-15", "rate": 0.03, "convention": "ACT/360"})
+        assert quote_id == "deposit:2026-01-15:2026-04-15"
+        assert isinstance(quote, DepositQuote)
+        assert (quote.start_date, quote.end_date, quote.rate, quote.convention) == (date(2026,1,15), date(2026,4,15), 0.03, "ACT/360")
+
+    def test_swap_in_percent_with_id(self):
+        quote_id, quote = normalise_quote({"id": "SONIA-5Y", "type": "swap", "effective_date": "2026-01-15", "maturity_date": "2031-01-15", "fixed_rate": 3.5, "rate_unit": "percent", "fixed_frequency_months": 12, "fixed_convention": "30E/360", "float_frequency_months": 6, "float_convention": "ACT/360"})
+        assert quote_id == "SONIA-5Y"
+        assert isinstance(quote, FixedForFloatingSwapQuote)
+        assert quote.fixed_rate == pytest.approx(0.035)
+        assert quote.maturity_date == date(2031,1,15)
+
+    def test_invalid_messages(self):
+        with pytest.raises(ValueError, match="The market data message is missing required fields!"):
+            normalise_quote({"type": "deposit", "start_date": "2026-01-15"})
+        with pytest.raises(ValueError, match="Quote type must be either deposit or swap."):
+            normalise_quote({"type": "bond"})
+        with pytest.raises(ValueError, match="The market data message is not in the expected format!"):
+            normalise_quote("not a message")
+        with pytest.raises(ValueError, match="Deposit end date cannot be before the deposit start date!"):
+            normalise_quote({"type": "deposit", "start_date": "2026-04-15", "end_date": "2026-01-15", "rate": 0.03, "convention": "ACT/360"})
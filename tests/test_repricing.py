@@ -0,0 +1,81 @@
+from datetime import date
+import numpy as np
+import pytest
+from derivative_valuations.df_curve.discount_factor import DiscountCurve
+from derivative_valuations.valuation.present_value import pv_many, columnar_cashflows
+from derivative_valuations.valuation.repricing import IncrementalRepricer
+
+def _curve(dfs=(0.985, 0.97, 0.91, 0.85)):
+    return DiscountCurve(date(2026,1,1), [date(2026,7,1), date(2027,1,1), date(2029,1,1), date(2031,1,1)], list(dfs), "ACT/365")
+
+def _portfolio():
+    trades = {
+        1: [(date(2025,12,1), 3.0), (date(2027,1,1), 5.0), (date(2028,3,1), 5.0), (date(2033,6,1), 105.0)],
+        2: [(date(2026,10,1), -50.0), (date(2031,1,1), 60.0)],
+        3: [(date(2029,1,1), 10.0)],
+        4: [(date(2026,9,1), 20.0), (date(2026,11,1), 20.0)],
+    }
+    return columnar_cashflows(trades)
+
+class TestIncrementalRepricer:
+    def test_initial_values(self):
+        repricer = IncrementalRepricer(*_portfolio(), _curve())
+        trade_ids, pvs = pv_many(*_portfolio(), _curve())
+        assert list(repricer.trade_ids) == list(trade_ids)
+        assert np.allclose(repricer.pvs, pvs, rtol=1e-14)
+        assert repricer.total_pv == pytest.approx(pvs.sum(), rel=1e-14)
+
+    @pytest.mark.parametrize("pillar", [0, 1, 2, 3])
+    def test_update_pillar_matches_revaluation(self, pillar):
+        repricer = IncrementalRepricer(*_portfolio(), _curve())
+        dfs = [0.985, 0.97, 0.91, 0.85]
+        before = repricer.total_pv
+        dfs[pillar] *= 0.99
+        change = repricer.update_pillar(pillar, dfs[pillar])
+        _, pvs = pv_many(*_portfolio(), _curve(dfs))
+        assert np.allclose(repricer.pvs, pvs, rtol=1e-13)
+        assert change == pytest.approx(pvs.sum() - before, rel=1e-12)
+        assert repricer.curve.interpolation_dfs == dfs
+
+    def test_affected_trades(self):
+        repricer = IncrementalRepricer(*_portfolio(), _curve())
+        #the first known date only bounds the segment up to 2027, the final two also extrapolate
+        assert list(repricer.affected_trades(0)) == [2, 4]
+        assert list(repricer.affected_trades(1)) == [1, 2, 4]
+        assert list(repricer.affected_trades(2)) == [1, 3]
+        assert list(repricer.affected_trades(3)) == [1, 2]
+        assert list(repricer.affected_dates(3)) == [date(2031,1,1).toordinal(), date(2033,6,1).toordinal()]
+
+    def test_unaffected_trades_unchanged(self):
+        repricer = IncrementalRepricer(*_portfolio(), _curve())
+        pvs = repricer.pvs.copy()
+        repricer.update_pillar(0, 0.98)
+        assert repricer.pvs[0] == pvs[0]
+        assert repricer.pvs[2] == pvs[2]
+
+    def test_update_curve(self):
+        repricer = IncrementalRepricer(*_portfolio(), _curve())
+        rng = np.random.default_rng(0)
+        dfs = np.array([0.985, 0.97, 0.91, 0.85])
+        for _ in range(50):
+            curve = _curve(dfs*np.exp(rng.normal(0, 0.001, size=4)))
+            repricer.update_curve(curve)
+        _, pvs = pv_many(*_portfolio(), curve)
+        assert np.allclose(repricer.pvs, pvs, rtol=1e-12)
+        assert repricer.curve is curve
+        assert repricer.revalue() == pytest.approx(pvs.sum(), rel=1e-14)
+
+    def test_update_curve_known_dates(self):
+        repricer = IncrementalRepricer(*_portfolio(), _curve())
+        curve = DiscountCurve(date(2026,1,1), [date(2026,7,1), date(2027,1,1), date(2030,1,1), date(2031,1,1)], [0.985, 0.97, 0.91, 0.85], "ACT/365")
+        with pytest.raises(ValueError, match="same valuation date, convention and known dates"):
+            repricer.update_curve(curve)
+
+    def test_validation(self):
+        repricer = IncrementalRepricer(*_portfolio(), _curve())
+        with pytest.raises(ValueError, match="Known date index is out of range!"):
+            repricer.update_pillar(4, 0.8)
+        with pytest.raises(ValueError, match="Discount factors must be greater than 0."):
+            repricer.update_pillar(1, 0.0)
+        with pytest.raises(ValueError, match="Cash flows are empty!"):
+            IncrementalRepricer(np.array([], dtype=np.int64), np.array([]), np.array([]), _curve())
@@ -0,0 +1,39 @@
+from datetime import date
+import math
+import numpy as np
+import pytest
+from derivative_valuations.df_curve.discount_factor import DiscountCurve
+from derivative_valuations.valuation.present_value import pv_many, columnar_cashflows
+from derivative_valuations.valuation.scenarios import scenario_pnl
+
+def _curve():
+    return DiscountCurve(date(2026,1,1), [date(2026,7,1), date(2027,1,1), date(2029,1,1), date(2031,1,1)], [0.985, 0.97, 0.91, 0.85], "ACT/365")
+
+def _portfolio():
+    trades = {
+        1: [(date(2025,12,1), 3.0), (date(2027,1,1), 5.0), (date(2028,3,1), 5.0), (date(2033,6,1), 105.0)],
+        2: [(date(2026,10,1), -50.0), (date(2031,1,1), 60.0)],
+        3: [(date(2029,1,1), 10.0)],
+    }
+    return columnar_cashflows(trades)
+
+def _shocked_curve(curve: DiscountCurve, shocks: np.ndarray):
+    #helper shocking the zero rate at every known date of the curve
+    dfs = [df*math.exp(-(shock/10000)*t) for df, t, shock in zip(curve.interpolation_dfs, curve.interpolation_year_fractions, shocks)]
+    return DiscountCurve(curve.valuation_date, list(curve.interpolation_dates), dfs, curve.convention)
+
+class TestScenarioPnl:
+    @pytest.mark.parametrize("processes", [1, 2])
+    def test_matches_revaluation(self, processes):
+        curve = _curve()
+        pillar_shocks = np.random.default_rng(0).normal(0, 20, size=(7, 4))
+        trade_ids, pnl = scenario_pnl(curve, pillar_shocks, *_portfolio(), processes=processes, scenarios_per_task=3)
+        _, base_pvs = pv_many(*_portfolio(), curve)
+        expected = np.array([pv_many(*_portfolio(), _shocked_curve(curve, shocks))[1] - base_pvs for shocks in pillar_shocks])
+        assert list(trade_ids) == [1, 2, 3]
+        assert pnl.shape == (7, 3)
+        assert np.allclose(pnl, expected, rtol=1e-10, atol=1e-10)
+
+    def test_shock_shape(self):
+        with pytest.raises(ValueError, match="Each scenario must have a shock for every known date of the curve!"):
+            scenario_pnl(_curve(), np.zeros((2, 3)), *_portfolio(), processes=1)
@@ -0,0 +1,59 @@
+import asyncio
+import json
+from derivative_valuations.market_data.sources import HttpPollingSource, FileTailSource, LocalQuoteServer
+
+async def _take(source, count: int):
+    #helper collecting the next count messages of a source
+    messages = []
+    async for message in source:
+        messages.append(message)
+        if len(messages) == count:
+            break
+    return messages
+
+class TestHttpPollingSource:
+    def test_polls_local_server(self):
+        async def scenario():
+            async with LocalQuoteServer([{"id": "a", "rate": 1}, {"id": "b", "rate": 2}]) as server:
+                source = HttpPollingSource(server.url, interval=0.01)
+                iterator = source.__aiter__()
+                first = [await anext(iterator), await anext(iterator)]
+
+                #only the changed message is passed on at the next poll
+                server.set_messages([{"id": "a", "rate": 1}, {"id": "b", "rate": 3}])
+                changed = await asyncio.wait_for(anext(iterator), 5)
+                await iterator.aclose()
+                return first, changed, server.request_count
+        first, changed, request_count = asyncio.run(scenario())
+        assert first == [{"id": "a", "rate": 1}, {"id": "b", "rate": 2}]
+        assert changed == {"id": "b", "rate": 3}
+        assert request_count >= 2
+
+    def test_failed_requests_are_retried(self):
+        async def scenario():
+            source = HttpPollingSource("http://127.0.0.1:9/quotes", interval=0.01, timeout=0.5)
+            iterator = source.__aiter__()
+            task = asyncio.create_task(anext(iterator))
+            while source.poll_count < 2:
+                await asyncio.sleep(0.01)
+            task.cancel()
+            return source
+        source = asyncio.run(scenario())
+        assert source.error_count >= 2
+
+class TestFileTailSource:
+    def test_follows_appended_lines(self, tmp_path):
+        path = tmp_path / "quotes.jsonl"
+        path.write_text(json.dumps({"n": 1}) + "\n" + json.dumps({"n": 2}) + "\n" + '{"n": ')
+
+        async def scenario():
+            source = FileTailSource(path, poll_interval=0.01)
+            iterator = source.__aiter__()
+            messages = [await anext(iterator), await anext(iterator)]
+            #complete the partial line and add a line that is not JSON
+            with open(path, "a") as file:
+                file.write('3}\nnot json\n')
+            messages += [await asyncio.wait_for(anext(iterator), 5), await asyncio.wait_for(anext(iterator), 5)]
+            await iterator.aclose()
+            return messages
+        assert asyncio.run(scenario()) == [{"n": 1}, {"n": 2}, {"n": 3}, "not json"]
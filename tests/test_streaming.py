@@ -0,0 +1,96 @@
+from datetime import date
+import csv
+import pytest
+from derivative_valuations.df_curve.discount_factor import DiscountCurve
+from derivative_valuations.payment_schedule.accrual_period_payment_schedule import generate_schedule
+from derivative_valuations.cashflows.cash_flow import build_fixed_leg_cashflows, build_bond_cashflows
+from derivative_valuations.valuation.present_value import pv, DV01
+from derivative_valuations.valuation.bond import Bond, bond_dirty_price
+from derivative_valuations.valuation.streaming import value_trade_file, stream_trade_valuations, TRADE_FILE_COLUMNS
+
+def _curve():
+    return DiscountCurve(date(2026,1,1), [date(2026,1,1), date(2027,1,1), date(2029,1,1), date(2036,1,1)], [1.0, 0.97, 0.91, 0.75], "ACT/365")
+
+def _write_trades(path, rows, columns=TRADE_FILE_COLUMNS + ("redemption_at_maturity", "direction")):
+    with open(path, "w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(columns)
+        writer.writerows(rows)
+
+def _trades(count):
+    rows = []
+    for i in range(count):
+        if i % 3 == 0:
+            rows.append((f"T{i}", "fixed_leg", "2026-03-15", f"{2028 + i % 7}-03-15", 6, 1000000 + i, 0.03, "30E/360", "", "pay"))
+        else:
+            rows.append((f"T{i}", "bond", "2025-06-01", f"{2030 + i % 5}-06-01", 12, 100, 0.04, "ACT/365", "false" if i % 3 == 2 else "", ""))
+    return rows
+
+def _expected(row, curve):
+    #value a trade row the non-streaming way
+    schedule = generate_schedule(date.fromisoformat(row[2]), date.fromisoformat(row[3]), row[4])
+    if row[1] == "fixed_leg":
+        cashflows = build_fixed_leg_cashflows(schedule, row[5], row[6], row[7])
+    else:
+        cashflows = build_bond_cashflows(schedule, row[5], row[6], row[7], row[8] != "false")
+    if row[9] == "pay":
+        cashflows = [(payment_date, -amount) for payment_date, amount in cashflows]
+    cashflows = [(payment_date, amount) for payment_date, amount in cashflows if payment_date > curve.valuation_date]
+    return pv(cashflows, curve), DV01(cashflows, curve, 1)
+
+class TestValueTradeFile:
+    @pytest.mark.parametrize("chunk_size", [1, 4, 1000])
+    def test_matches_pv_and_DV01(self, tmp_path, chunk_size):
+        curve = _curve()
+        rows = _trades(25)
+        _write_trades(tmp_path / "trades.csv", rows)
+        assert value_trade_file(tmp_path / "trades.csv", tmp_path / "results.csv", curve, chunk_size=chunk_size, max_pending_chunks=1) == 25
+
+        with open(tmp_path / "results.csv", newline="") as file:
+            results = list(csv.DictReader(file))
+        assert [result["trade_id"] for result in results] == [row[0] for row in rows]
+        for row, result in zip(rows, results):
+            expected_pv, expected_DV01 = _expected(row, curve)
+            assert float(result["pv"]) == pytest.approx(expected_pv, rel=1e-12)
+            assert float(result["DV01"]) == pytest.approx(expected_DV01, rel=1e-9)
+
+    def test_seasoned_trades(self, tmp_path):
+        #cashflows paid on or before the valuation date are not valued, as in bond_dirty_price
+        curve = DiscountCurve(date(2026,1,15), [date(2026,1,15), date(2027,1,15), date(2030,1,15)], [1.0, 0.97, 0.88], "ACT/365")
+        rows = [
+            ("B1", "bond", "2022-01-15", "2030-01-15", 6, 100, 0.05, "30E/360", "", ""),
+            ("L1", "fixed_leg", "2022-01-15", "2030-01-15", 6, 1000000, 0.03, "ACT/365", "", "pay"),
+            ("M1", "bond", "2020-01-15", "2025-01-15", 12, 100, 0.04, "ACT/365", "", ""),
+        ]
+        _write_trades(tmp_path / "trades.csv", rows)
+        value_trade_file(tmp_path / "trades.csv", tmp_path / "results.csv", curve, chunk_size=2)
+        with open(tmp_path / "results.csv", newline="") as file:
+            results = list(csv.DictReader(file))
+        assert float(results[0]["pv"]) == pytest.approx(bond_dirty_price(Bond(date(2022,1,15), date(2030,1,15), 0.05, 6, 100, "30E/360"), curve, curve.valuation_date), rel=1e-12)
+        for row, result in zip(rows, results):
+            expected_pv, expected_DV01 = _expected(row, curve) if row[0] != "M1" else (0.0, 0.0)
+            assert float(result["pv"]) == pytest.approx(expected_pv, rel=1e-12)
+            assert float(result["DV01"]) == pytest.approx(expected_DV01, rel=1e-9)
+
+    def test_empty_file(self, tmp_path):
+        _write_trades(tmp_path / "trades.csv", [])
+        assert value_trade_file(tmp_path / "trades.csv", tmp_path / "results.csv", _curve()) == 0
+        assert (tmp_path / "results.csv").read_text().splitlines() == ["trade_id,pv,DV01"]
+
+    def test_missing_columns(self, tmp_path):
+        _write_trades(tmp_path / "trades.csv", [("T1", "bond")], columns=("trade_id", "instrument"))
+        with pytest.raises(ValueError, match="The trade file is missing required columns!"):
+            value_trade_file(tmp_path / "trades.csv", tmp_path / "results.csv", _curve())
+
+    def test_expansion_error_stops_pipeline(self, tmp_path):
+        rows = _trades(20)
+        rows[13] = ("T13", "swaption") + rows[13][2:]
+        _write_trades(tmp_path / "trades.csv", rows)
+        with pytest.raises(ValueError, match="This instrument type is either not recognised or has not yet been implemented."):
+            value_trade_file(tmp_path / "trades.csv", tmp_path / "results.csv", _curve(), chunk_size=2, max_pending_chunks=1)
+
+    def test_consumer_stopping_early(self, tmp_path):
+        _write_trades(tmp_path / "trades.csv", _trades(50))
+        chunks = stream_trade_valuations(tmp_path / "trades.csv", _curve(), chunk_size=5, max_pending_chunks=1)
+        assert [row[0] for row in next(chunks)] == ["T0", "T1", "T2", "T3", "T4"]
+        chunks.close()
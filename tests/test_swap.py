@@ -0,0 +1,108 @@
+from datetime import date
+import numpy as np
+import pytest
+from derivative_valuations.curve_bootstrapping.financial_instruments import DepositQuote, FixedForFloatingSwapQuote
+from derivative_valuations.curve_bootstrapping.bootstrapping import bootstrap_discount_curve
+from derivative_valuations.df_curve.discount_factor import DiscountCurve
+from derivative_valuations.payment_schedule.accrual_period_payment_schedule import add_months
+from derivative_valuations.valuation.swap import Swap, swap_fixed_leg_pv, swap_float_leg_pv, swap_annuity, swap_price, par_swap_rate, price_swaps, par_rate_grid
+
+def _curve():
+    return DiscountCurve(date(2026,1,15), [date(2026,1,15), date(2026,7,15), date(2027,1,15), date(2029,1,15), date(2031,1,15), date(2036,1,15)], [1.0, 0.985, 0.97, 0.91, 0.85, 0.72], "ACT/365")
+
+def _swaps():
+    return [
+        Swap(date(2026,1,15), date(2031,1,15), 0.032, 12, "30E/360", 6, "ACT/360", 1000000),
+        Swap(date(2026,1,15), date(2028,1,15), 0.031, 12, "30E/360", 3, "ACT/360", 500000, pay_fixed=False),
+        #forward starting, with a stub final period
+        Swap(date(2026,6,15), date(2030,3,15), 0.035, 6, "ACT/365", 3, "ACT/360", 250000, spread=0.001),
+        #seasoned, with a floating coupon in progress and a month end effective date
+        Swap(date(2025,3,31), date(2032,3,31), 0.028, 6, "30E/360", 3, "ACT/360", 2000000, fixings={date(2025,12,30): 0.029}),
+        Swap(date(2024,1,31), date(2034,1,31), 0.03, 12, "ACT/360", 6, "ACT/360", 750000, pay_fixed=False, fixings={date(2025,7,31): 0.031}),
+        #matured
+        Swap(date(2024,1,15), date(2025,1,15), 0.03, 12, "30E/360", 6, "ACT/360", 100000),
+    ]
+
+class TestSwap:
+    def test_validation(self):
+        with pytest.raises(ValueError, match="End date must be after start date!"):
+            Swap(date(2027,1,15), date(2026,1,15), 0.03, 12, "30E/360", 6, "ACT/360")
+        with pytest.raises(ValueError, match="Notional payment must not be less than 0."):
+            Swap(date(2026,1,15), date(2027,1,15), 0.03, 12, "30E/360", 6, "ACT/360", -1)
+
+    def test_float_leg_telescopes(self):
+        curve = _curve()
+        swap = Swap(date(2026,1,15), date(2031,1,15), 0.03, 12, "30E/360", 3, "ACT/360", 100)
+        assert swap_float_leg_pv(swap, curve, date(2026,1,15)) == pytest.approx(100*(1 - curve.df(date(2031,1,15))), rel=1e-13)
+
+    def test_price_and_par_rate(self):
+        curve = _curve()
+        swap = _swaps()[0]
+        rate = par_swap_rate(swap, curve, date(2026,1,15))
+        assert swap_price(swap, curve, date(2026,1,15)) == pytest.approx(swap_annuity(swap, curve, date(2026,1,15))*(rate - 0.032), rel=1e-12)
+        at_par = Swap(swap.effective_date, swap.maturity_date, rate, 12, "30E/360", 6, "ACT/360", 1000000)
+        assert swap_price(at_par, curve, date(2026,1,15)) == pytest.approx(0.0, abs=1e-8)
+        assert swap_fixed_leg_pv(swap, curve, date(2026,1,15)) == pytest.approx(0.032*swap_annuity(swap, curve, date(2026,1,15)), rel=1e-13)
+
+    def test_missing_fixing(self):
+        swap = Swap(date(2025,3,31), date(2032,3,31), 0.028, 6, "30E/360", 3, "ACT/360")
+        with pytest.raises(ValueError, match="A fixing is required for every floating coupon accruing from before the valuation date!"):
+            swap_float_leg_pv(swap, _curve(), date(2026,1,15))
+        with pytest.raises(ValueError, match="A fixing is required for every floating coupon accruing from before the valuation date!"):
+            price_swaps([swap], _curve(), date(2026,1,15))
+
+    def test_different_valuation_date(self):
+        with pytest.raises(ValueError, match="The curve used to price the swap is for a different valuation date!"):
+            swap_price(_swaps()[0], _curve(), date(2026,1,16))
+
+    def test_bootstrapped_quotes_reprice_at_par(self):
+        deposit_quotes = [DepositQuote(date(2026,1,15), date(2026,4,15), 0.030, "ACT/360"), DepositQuote(date(2026,1,15), date(2026,7,15), 0.031, "ACT/360")]
+        swap_quotes = [FixedForFloatingSwapQuote(date(2026,1,15), date(2026+n,1,15), 0.032+0.0001*n, 12, "30E/360", 6, "ACT/360") for n in range(1, 11)]
+        curve = bootstrap_discount_curve(date(2026,1,15), deposit_quotes, swap_quotes, "ACT/365")
+        valuations = price_swaps([Swap.from_quote(quote) for quote in swap_quotes], curve, date(2026,1,15))
+        assert valuations.par_rate == pytest.approx([quote.fixed_rate for quote in swap_quotes], abs=1e-14)
+        assert valuations.price == pytest.approx(np.zeros(len(swap_quotes)), abs=1e-14)
+
+class TestPriceSwaps:
+    def test_matches_single_swap_pricing(self):
+        curve = _curve()
+        swaps = _swaps()
+        valuations = price_swaps(swaps, curve, date(2026,1,15))
+        for i, swap in enumerate(swaps):
+            assert valuations.price[i] == pytest.approx(swap_price(swap, curve, date(2026,1,15)), rel=1e-12, abs=1e-8)
+            assert valuations.fixed_leg_pv[i] == pytest.approx(swap_fixed_leg_pv(swap, curve, date(2026,1,15)), rel=1e-12, abs=1e-8)
+            assert valuations.float_leg_pv[i] == pytest.approx(swap_float_leg_pv(swap, curve, date(2026,1,15)), rel=1e-12, abs=1e-8)
+            assert valuations.annuity[i] == pytest.approx(swap_annuity(swap, curve, date(2026,1,15)), rel=1e-12, abs=1e-8)
+        for i in range(len(swaps) - 1):
+            assert valuations.par_rate[i] == pytest.approx(par_swap_rate(swaps[i], curve, date(2026,1,15)), rel=1e-12)
+        #the matured swap has no value and no par rate
+        assert valuations.price[-1] == 0
+        assert np.isnan(valuations.par_rate[-1])
+
+    def test_shared_grid_with_month_end_clipping(self):
+        #swaps sharing an effective date share one coupon grid, whose month end days stay clipped as in the cached schedule
+        curve = _curve()
+        swaps = [Swap(date(2026,1,31), add_months(date(2026,1,31), months), 0.03, 1, "30E/360", 3, "ACT/360", 100) for months in (3, 7, 12, 13, 36, 60)]
+        valuations = price_swaps(swaps, curve, date(2026,1,15))
+        assert valuations.annuity == pytest.approx([swap_annuity(swap, curve, date(2026,1,15)) for swap in swaps], rel=1e-13)
+
+    def test_empty(self):
+        assert len(price_swaps([], _curve(), date(2026,1,15)).price) == 0
+
+class TestParRateGrid:
+    def test_matches_par_swap_rate(self):
+        curve = _curve()
+        effective_dates = [date(2026,1,15), date(2026,3,31), date(2027,1,15)]
+        tenors = [12, 18, 24, 60, 84]
+        grid = par_rate_grid(curve, effective_dates, tenors, 6, "30E/360")
+        assert grid.shape == (3, 5)
+        for i, effective_date in enumerate(effective_dates):
+            for j, tenor in enumerate(tenors):
+                swap = Swap(effective_date, add_months(effective_date, tenor), 0.0, 6, "30E/360", 3, "ACT/360")
+                assert grid[i, j] == pytest.approx(par_swap_rate(swap, curve, date(2026,1,15)), rel=1e-12)
+
+    def test_validation(self):
+        with pytest.raises(ValueError, match="Effective dates cannot be before the valuation date!"):
+            par_rate_grid(_curve(), [date(2026,1,1)], [12], 6, "30E/360")
+        with pytest.raises(ValueError, match="The frequency of payments cannot be greater than the number of months between the start date and the end date."):
+            par_rate_grid(_curve(), [date(2026,1,15)], [3], 6, "30E/360")